@@ -9,8 +9,16 @@ https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 
 import os
 
+from django.conf import settings
+from django.contrib.staticfiles.handlers import ASGIStaticFilesHandler
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'Sterp_Portal.settings')
+# WhiteNoise is sync-only; see SERVE_STATIC in settings
+os.environ.setdefault('SERVE_STATIC', 'false')
 
 application = get_asgi_application()
+
+if settings.DEBUG and not settings.SERVE_STATIC:
+    # Development servers have no proxy in front to serve static files
+    application = ASGIStaticFilesHandler(application)
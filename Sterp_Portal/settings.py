@@ -46,16 +46,49 @@ INSTALLED_APPS = [
     'widget_tweaks',  # Add this line
 ]
 
+# Every project middleware is async-capable, so under ASGI requests to async
+# views never leave the event loop. WhiteNoise is sync-only and would put each
+# request back on a thread, so Sterp_Portal/asgi.py sets SERVE_STATIC=false:
+# under ASGI, serve STATIC_ROOT from the reverse proxy or CDN instead.
+SERVE_STATIC = os.getenv('SERVE_STATIC', 'true').lower() == 'true'
+
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    *(['whitenoise.middleware.WhiteNoiseMiddleware'] if SERVE_STATIC else []),
+    'users.middleware.MetricsMiddleware',
+    'users.middleware.QueryBudgetMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
+    'users.middleware.PrimaryPinMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# Prometheus metrics (users.metrics) are served on /metrics to superusers and
+# to scrapers sending "Authorization: Bearer <METRICS_TOKEN>". For multi-process
+# servers, set PROMETHEUS_MULTIPROC_DIR to an empty directory before starting.
+METRICS_TOKEN = os.getenv('METRICS_TOKEN')
+
+# Query budgets (users.middleware.QueryBudgetMiddleware), on in development
+# and CI. Budgets are keyed by URL name; QUERY_BUDGET_RAISE=True fails the
+# request instead of logging so CI catches regressions.
+QUERY_BUDGET_ENABLED = os.getenv('QUERY_BUDGET_ENABLED', str(DEBUG)).lower() in ('true', '1', 'yes')
+QUERY_BUDGET_RAISE = os.getenv('QUERY_BUDGET_RAISE', 'False').lower() in ('true', '1', 'yes')
+QUERY_BUDGET_DEFAULT = int(os.getenv('QUERY_BUDGET_DEFAULT', 30))
+# Identical statements from one call site at least this often are reported as N+1
+QUERY_BUDGET_N_PLUS_ONE_THRESHOLD = 5
+QUERY_BUDGETS = {
+    'admin_dashboard': 10,
+    'employee_tasks': 10,
+    'task_list': 10,
+    'team_availability': 10,
+    'team_availability_api': 10,
+    'employee_leave_dashboard': 10,
+    'employee_attendance_dashboard': 15,
+}
+
 ROOT_URLCONF = 'Sterp_Portal.urls'
 
 TEMPLATES = [
@@ -84,15 +117,35 @@ WSGI_APPLICATION = 'Sterp_Portal.wsgi.application'
 # Supabase PostgreSQL Database Configuration
 DATABASE_URL = os.getenv('DATABASE_URL')
 
+# Pool connections per worker process (psycopg 3 pool) instead of holding one
+# persistent connection per thread. Set DB_POOL_ENABLED=False to fall back to
+# persistent connections, e.g. behind an external transaction pooler.
+DB_POOL_ENABLED = os.getenv('DB_POOL_ENABLED', 'True').lower() in ('true', '1', 'yes')
+
 if DATABASE_URL:
     # Using Supabase PostgreSQL
     DATABASES = {
         'default': dj_database_url.config(
             default=DATABASE_URL,
-            conn_max_age=600,
-            conn_health_checks=True,
+            # Pooling replaces persistent connections, which Django rejects alongside it
+            conn_max_age=0 if DB_POOL_ENABLED else 600,
+            # Pooled connections are checked with a round trip before being handed out
+            conn_health_checks=os.getenv('DB_CONN_HEALTH_CHECKS', 'True').lower() in ('true', '1', 'yes'),
         )
     }
+
+    if DB_POOL_ENABLED and DATABASES['default']['ENGINE'] == 'django.db.backends.postgresql':
+        DATABASES['default'].setdefault('OPTIONS', {})['pool'] = {
+            'min_size': int(os.getenv('DB_POOL_MIN_SIZE', 2)),
+            'max_size': int(os.getenv('DB_POOL_MAX_SIZE', 10)),
+            # Seconds a request waits for a free connection before erroring
+            'timeout': float(os.getenv('DB_POOL_TIMEOUT', 10)),
+            # Seconds before idle connections above min_size are closed
+            'max_idle': float(os.getenv('DB_POOL_MAX_IDLE', 300)),
+            # Seconds before any connection is recycled
+            'max_lifetime': float(os.getenv('DB_POOL_MAX_LIFETIME', 1800)),
+            'name': 'sterp-default',
+        }
 else:
     # Fallback to SQLite for local development
     DATABASES = {
@@ -102,6 +155,51 @@ else:
         }
     }
 
+# Optional read replica for reporting and dashboard reads (see users.db_routers)
+DATABASE_REPLICA_URL = os.getenv('DATABASE_REPLICA_URL')
+
+if DATABASE_REPLICA_URL:
+    DATABASES['replica'] = dj_database_url.config(
+        default=DATABASE_REPLICA_URL,
+        conn_max_age=0 if DB_POOL_ENABLED else 600,
+        conn_health_checks=True,
+    )
+    DATABASES['replica']['TEST'] = {'MIRROR': 'default'}
+    if 'pool' in DATABASES['default'].get('OPTIONS', {}):
+        DATABASES['replica'].setdefault('OPTIONS', {})['pool'] = {
+            **DATABASES['default']['OPTIONS']['pool'],
+            'name': 'sterp-replica',
+        }
+
+DATABASE_ROUTERS = ['users.db_routers.ReplicaRouter']
+
+
+# Cache Configuration
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+
+# Local-memory cache per process by default. Set CACHE_URL to share the cache
+# between workers (Redis by default, or any backend named in CACHE_BACKEND,
+# e.g. django.core.cache.backends.memcached.PyMemcacheCache)
+CACHE_URL = os.getenv('CACHE_URL')
+
+if CACHE_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': os.getenv('CACHE_BACKEND', 'django.core.cache.backends.redis.RedisCache'),
+            'LOCATION': CACHE_URL,
+            'KEY_PREFIX': 'sterp',
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'sterp-portal',
+        }
+    }
+
+# Seconds a rendered dashboard fragment may live; entity version bumps invalidate sooner
+FRAGMENT_CACHE_TIMEOUT = int(os.getenv('FRAGMENT_CACHE_TIMEOUT', 300))
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -122,6 +220,13 @@ AUTH_PASSWORD_VALIDATORS = [
 ]
 
 AUTH_USER_MODEL = 'users.Employee'  # Make sure this is here
+
+# Serve the per-request user lookup from the cache instead of the database
+AUTHENTICATION_BACKENDS = ['users.backends.CachedModelBackend']
+
+# Sessions are written through to the database but read from the cache
+SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+
 DEFAULT_EMPLOYEE_PASSWORD = 'default123'
 
 # Internationalization
@@ -141,6 +246,22 @@ USE_TZ = True
 
 STATIC_URL = 'static/'
 
+# Built by `npm run build` (compiled Tailwind CSS, vendored Alpine.js and fonts)
+STATICFILES_DIRS = [BASE_DIR / 'static']
+
+STATIC_ROOT = BASE_DIR / 'staticfiles'
+
+# collectstatic writes content-hashed, pre-compressed copies plus a manifest;
+# WhiteNoise serves hashed files with far-future immutable cache headers
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'whitenoise.storage.CompressedManifestStaticFilesStorage',
+    },
+}
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
@@ -0,0 +1,18 @@
+// Copy third-party browser assets out of node_modules into static/vendor
+const fs = require('fs');
+const path = require('path');
+
+const root = path.resolve(__dirname, '..');
+const vendorDir = path.join(root, 'static', 'vendor');
+
+const files = [
+  ['alpinejs/dist/cdn.min.js', 'alpinejs/cdn.min.js'],
+  ['@fontsource-variable/inter/files/inter-latin-wght-normal.woff2', 'inter/inter-latin-wght-normal.woff2'],
+];
+
+for (const [source, target] of files) {
+  const destination = path.join(vendorDir, target);
+  fs.mkdirSync(path.dirname(destination), { recursive: true });
+  fs.copyFileSync(path.join(root, 'node_modules', source), destination);
+  console.log(`static/vendor/${target}`);
+}
@@ -0,0 +1,75 @@
+// Alpine component behind users.widgets.EmployeeAutocomplete; configured from data-* attributes
+function employeeAutocomplete(el) {
+    const config = el.dataset;
+    let latestRequest = 0;
+
+    return {
+        query: '',
+        results: [],
+        selected: JSON.parse(config.selected || '[]'),
+        multiple: config.multiple === 'true',
+        open: false,
+        loading: false,
+        hasNext: false,
+        offset: 0,
+        active: -1,
+
+        async search(append = false) {
+            const params = new URLSearchParams({ q: this.query, offset: append ? this.offset : 0 });
+            const projectField = config.projectField && document.getElementById(config.projectField);
+            if (projectField && projectField.value) {
+                params.set('project', projectField.value);
+            }
+            // Only the newest response is shown when typing outpaces the server
+            const request = ++latestRequest;
+            this.loading = true;
+            try {
+                const response = await fetch(`${config.url}?${params}`, { headers: { Accept: 'application/json' } });
+                const data = await response.json();
+                if (request !== latestRequest) {
+                    return;
+                }
+                this.results = append ? this.results.concat(data.results) : data.results;
+                this.offset = data.offset + data.results.length;
+                this.hasNext = data.has_next;
+                this.active = append ? this.active : -1;
+                this.open = true;
+            } finally {
+                if (request === latestRequest) {
+                    this.loading = false;
+                }
+            }
+        },
+
+        isSelected(item) {
+            return this.selected.some(selected => selected.id === item.id);
+        },
+
+        choose(item) {
+            if (!this.multiple) {
+                this.selected = [item];
+                this.open = false;
+            } else if (!this.isSelected(item)) {
+                this.selected.push(item);
+            }
+            this.query = '';
+        },
+
+        chooseActive() {
+            if (this.open && this.results[this.active]) {
+                this.choose(this.results[this.active]);
+            }
+        },
+
+        move(step) {
+            if (!this.open || !this.results.length) {
+                return;
+            }
+            this.active = (this.active + step + this.results.length) % this.results.length;
+        },
+
+        remove(item) {
+            this.selected = this.selected.filter(selected => selected.id !== item.id);
+        },
+    };
+}
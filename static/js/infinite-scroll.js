@@ -0,0 +1,54 @@
+// Alpine component appending JSON pages ({html, page, has_next}) to x-ref="items"
+// whenever x-ref="sentinel" scrolls into view; configured from data-* attributes
+function infiniteScroll(el) {
+    const config = el.dataset;
+
+    return {
+        nextPage: config.nextPage ? Number(config.nextPage) : null,
+        loading: false,
+        observer: null,
+
+        init() {
+            if (!this.$refs.sentinel || !('IntersectionObserver' in window)) {
+                return;
+            }
+            this.observer = new IntersectionObserver((entries) => {
+                if (entries.some((entry) => entry.isIntersecting)) {
+                    this.loadMore();
+                }
+            }, { rootMargin: '400px' });
+            this.observer.observe(this.$refs.sentinel);
+        },
+
+        destroy() {
+            if (this.observer) {
+                this.observer.disconnect();
+            }
+        },
+
+        async loadMore() {
+            if (this.loading || !this.nextPage) {
+                return;
+            }
+            this.loading = true;
+            try {
+                const separator = config.url.includes('?') ? '&' : '?';
+                const response = await fetch(`${config.url}${separator}page=${this.nextPage}`, {
+                    headers: { Accept: 'application/json' },
+                });
+                if (!response.ok) {
+                    return;
+                }
+                const data = await response.json();
+                this.$refs.items.insertAdjacentHTML('beforeend', data.html);
+                this.nextPage = data.has_next ? data.page + 1 : null;
+                if (!this.nextPage) {
+                    this.destroy();
+                    this.$refs.sentinel.remove();
+                }
+            } finally {
+                this.loading = false;
+            }
+        },
+    };
+}
@@ -0,0 +1,19 @@
+const defaultTheme = require('tailwindcss/defaultTheme');
+
+/** @type {import('tailwindcss').Config} */
+module.exports = {
+  // Every file that can emit class names: page templates plus form widget attrs
+  content: [
+    './templates/**/*.html',
+    './users/templates/**/*.html',
+    './users/**/*.py',
+  ],
+  theme: {
+    extend: {
+      fontFamily: {
+        sans: ['"Inter Variable"', ...defaultTheme.fontFamily.sans],
+      },
+    },
+  },
+  plugins: [],
+};
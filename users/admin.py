@@ -1,5 +1,6 @@
 from django.contrib import admin
-from .models import Employee, GoogleCalendarCredentials, LeaveType, LeaveBalance, LeaveApplication, Attendance
+from django.utils import timezone
+from .models import Employee, GoogleCalendarCredentials, Holiday, LeaveType, LeaveBalance, LeaveApplication, Attendance, EmailOutbox, EmployeeImport, RecurringTaskTemplate
 from django.contrib.auth.models import User
 
 # Register your models here.
@@ -20,6 +21,14 @@ class GoogleCalendarCredentialsAdmin(admin.ModelAdmin):
             return self.readonly_fields + ('token', 'refresh_token', 'client_secret')
         return self.readonly_fields
     
+@admin.register(Holiday)
+class HolidayAdmin(admin.ModelAdmin):
+    list_display = ('name', 'date', 'created_at')
+    list_filter = ('date',)
+    search_fields = ('name',)
+    date_hierarchy = 'date'
+
+
 @admin.register(LeaveType)
 class LeaveTypeAdmin(admin.ModelAdmin):
     list_display = ('name', 'default_days', 'created_at')
@@ -75,4 +84,49 @@ class AttendanceAdmin(admin.ModelAdmin):
             'fields': ('created_at', 'updated_at'),
             'classes': ('collapse',)
         }),
-    )
\ No newline at end of file
+    )
+
+
+@admin.register(EmailOutbox)
+class EmailOutboxAdmin(admin.ModelAdmin):
+    list_display = ('subject', 'to_email', 'status', 'attempts', 'next_attempt_at', 'sent_at', 'created_at')
+    list_filter = ('status', 'created_at')
+    search_fields = ('to_email', 'subject')
+    # Bodies may contain login credentials
+    exclude = ('body', 'html_body')
+    readonly_fields = ('to_email', 'from_email', 'subject', 'attempts', 'last_error', 'claimed_at', 'sent_at', 'created_at')
+    actions = ['retry_now']
+
+    @admin.action(description='Retry selected messages now')
+    def retry_now(self, request, queryset):
+        updated = queryset.filter(status__in=['PENDING', 'FAILED']).update(status='PENDING', next_attempt_at=timezone.now())
+        self.message_user(request, f'{updated} message(s) queued for retry.')
+
+
+@admin.register(EmployeeImport)
+class EmployeeImportAdmin(admin.ModelAdmin):
+    list_display = ('created_at', 'uploaded_by', 'row_count', 'status', 'imported_count', 'finished_at')
+    list_filter = ('status', 'created_at')
+    # The CSV holds personal data and is cleared once imported
+    exclude = ('csv_text',)
+    readonly_fields = ('row_count', 'uploaded_by', 'imported_count', 'error', 'created_at', 'claimed_at', 'finished_at')
+
+
+@admin.register(RecurringTaskTemplate)
+class RecurringTaskTemplateAdmin(admin.ModelAdmin):
+    list_display = ('name', 'employee', 'frequency', 'rrule', 'starts_on', 'ends_on', 'is_active', 'materialized_through')
+    list_filter = ('frequency', 'is_active', 'priority')
+    search_fields = ('name', 'employee__first_name', 'employee__last_name')
+    raw_id_fields = ('employee', 'created_by', 'project')
+    readonly_fields = ('materialized_through', 'created_at', 'updated_at')
+    fieldsets = (
+        ('Task', {
+            'fields': ('name', 'description', 'employee', 'project', 'priority', 'created_by')
+        }),
+        ('Recurrence', {
+            'fields': ('frequency', 'interval', 'by_weekday', 'by_month_day', 'starts_on', 'ends_on', 'is_active')
+        }),
+        ('Materialization', {
+            'fields': ('materialized_through', 'created_at', 'updated_at'),
+        }),
+    )
@@ -7,3 +7,12 @@ class UsersConfig(AppConfig):
 
     def ready(self):
         import users.signals  # noqa
+        import users.checks  # noqa
+        from django.db.backends.signals import connection_created
+        from django.db.models.signals import post_migrate
+        from .middleware import install_query_dispatch
+        from .employee_search_utils import ensure_search_indexes
+        from .search_utils import ensure_full_text_index
+        post_migrate.connect(ensure_search_indexes, sender=self)
+        post_migrate.connect(ensure_full_text_index, sender=self)
+        connection_created.connect(install_query_dispatch)
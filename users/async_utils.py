@@ -0,0 +1,31 @@
+"""
+Helpers for async views
+
+The Google API client and Django's SMTP backend are blocking libraries. Async
+views hand those calls to ``run_outbound`` so they wait in the shared executor
+thread pool instead of the single thread-sensitive thread that serves
+``sync_to_async`` ORM work, leaving the event loop free for other requests.
+"""
+
+import logging
+from functools import partial
+from asgiref.sync import sync_to_async
+from django.db import close_old_connections
+
+logger = logging.getLogger(__name__)
+
+
+def _call_and_release_connections(func):
+    try:
+        return func()
+    finally:
+        # Executor threads live outside the request cycle, so release any
+        # connection the call opened rather than leaving it to go stale
+        close_old_connections()
+
+
+async def run_outbound(func, *args, **kwargs):
+    """Await a blocking outbound call (Google API, SMTP) in a worker thread"""
+    return await sync_to_async(_call_and_release_connections, thread_sensitive=False)(
+        partial(func, *args, **kwargs)
+    )
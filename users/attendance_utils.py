@@ -0,0 +1,99 @@
+"""
+Attendance check-in and check-out write paths
+
+Both are conditional single-row writes, so concurrent requests from one
+employee (double clicks, client retries during the morning check-in burst)
+can neither hit the (employee, date) unique constraint nor overwrite a
+recorded time. Queryset updates and raw SQL skip post_save, so the cache
+versions bumped by the Attendance signals are bumped here instead.
+"""
+
+import logging
+from django.db import connections, router
+from django.utils import timezone
+
+from .availability_utils import AVAILABILITY_CACHE_NAMESPACE
+from .cache_utils import bump_cache_version, entity_cache_namespace
+from .models import Attendance
+
+logger = logging.getLogger(__name__)
+
+# Columns written by the check-in upsert and the subset refreshed on conflict
+CHECK_IN_INSERT_FIELDS = [
+    'employee', 'date', 'check_in_time', 'status', 'work_hours', 'notes', 'marked_by_admin', 'created_at', 'updated_at',
+]
+CHECK_IN_UPDATE_FIELDS = ['check_in_time', 'status', 'updated_at']
+
+
+def _invalidate_attendance_caches():
+    bump_cache_version(AVAILABILITY_CACHE_NAMESPACE)
+    bump_cache_version(entity_cache_namespace(Attendance))
+
+
+def _check_in_sql(connection):
+    opts = Attendance._meta
+    quote = connection.ops.quote_name
+
+    def column(name):
+        return quote(opts.get_field(name).column)
+
+    table = quote(opts.db_table)
+    updates = ', '.join(f'{column(name)} = EXCLUDED.{column(name)}' for name in CHECK_IN_UPDATE_FIELDS)
+    return (
+        f"INSERT INTO {table} ({', '.join(column(name) for name in CHECK_IN_INSERT_FIELDS)}) "
+        f"VALUES ({', '.join(['%s'] * len(CHECK_IN_INSERT_FIELDS))}) "
+        f"ON CONFLICT ({column('employee')}, {column('date')}) DO UPDATE SET {updates} "
+        f"WHERE {table}.{column('check_in_time')} IS NULL "
+        f"RETURNING {quote(opts.pk.column)}"
+    )
+
+
+def check_in(employee, today, now=None):
+    """
+    Record today's check-in with one INSERT ... ON CONFLICT DO UPDATE.
+    A row created earlier without a check-in (e.g. an admin-marked absence)
+    is filled in. Returns the resulting status, or None if the employee had
+    already checked in.
+    """
+    now = now or timezone.now()
+    attendance = Attendance(employee=employee, date=today, check_in_time=now, created_at=now, updated_at=now)
+    # With a check-in time set this only classifies the time; it runs no queries
+    attendance.determine_status()
+
+    connection = connections[router.db_for_write(Attendance)]
+    fields = [Attendance._meta.get_field(name) for name in CHECK_IN_INSERT_FIELDS]
+    params = [field.get_db_prep_save(getattr(attendance, field.attname), connection) for field in fields]
+    with connection.cursor() as cursor:
+        cursor.execute(_check_in_sql(connection), params)
+        recorded = cursor.fetchone() is not None
+
+    if not recorded:
+        return None
+    _invalidate_attendance_caches()
+    return attendance.status
+
+
+def check_out(employee, today, now=None):
+    """
+    Record today's check-out with a conditional UPDATE that only succeeds
+    while the check-out time is still empty. Returns ``(attendance, recorded)``;
+    ``attendance`` is None when the employee has not checked in today.
+    """
+    attendance = Attendance.objects.filter(employee=employee, date=today, check_in_time__isnull=False).first()
+    if attendance is None:
+        return None, False
+    if attendance.check_out_time:
+        return attendance, False
+
+    attendance.check_out_time = now or timezone.now()
+    # Computes work hours and the final status from the two times, no queries
+    attendance.determine_status()
+    recorded = Attendance.objects.filter(pk=attendance.pk, check_out_time__isnull=True).update(
+        check_out_time=attendance.check_out_time,
+        work_hours=attendance.work_hours,
+        status=attendance.status,
+        updated_at=attendance.check_out_time,
+    )
+    if recorded:
+        _invalidate_attendance_caches()
+    return attendance, bool(recorded)
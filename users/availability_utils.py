@@ -0,0 +1,152 @@
+"""
+Team availability matrix utilities
+
+The matrix covers employees x days for a date window. Each employee row keeps
+one integer bitset per state where bit ``i`` is set when the state applies to
+the ``i``-th day of the window (bit 0 is the start date).
+"""
+
+import logging
+from datetime import date, timedelta
+from django.core.cache import cache
+
+from .metrics import record_cache_lookup
+from .cache_utils import make_cache_key
+from .models import Employee, LeaveApplication, Attendance
+
+logger = logging.getLogger(__name__)
+
+AVAILABILITY_CACHE_NAMESPACE = 'availability'
+AVAILABILITY_CACHE_TIMEOUT = 60 * 15  # 15 minutes
+DEFAULT_WINDOW_DAYS = 7
+MAX_WINDOW_DAYS = 62
+
+# Attendance statuses that count as the employee being at work
+ATTENDED_STATUSES = {'PRESENT', 'LATE', 'HALF_DAY'}
+
+
+def default_window_start(today=None):
+    """Monday of the current week"""
+    today = today or date.today()
+    return today - timedelta(days=today.weekday())
+
+
+def parse_window(start_param, days_param):
+    """Turn raw query parameters into a bounded (start_date, end_date) window"""
+    try:
+        start_date = date.fromisoformat(start_param) if start_param else default_window_start()
+    except ValueError:
+        start_date = default_window_start()
+
+    try:
+        days = int(days_param) if days_param else DEFAULT_WINDOW_DAYS
+    except (ValueError, TypeError):
+        days = DEFAULT_WINDOW_DAYS
+    days = max(1, min(days, MAX_WINDOW_DAYS))
+
+    return start_date, start_date + timedelta(days=days - 1)
+
+
+def _range_mask(window_start, window_end, start_date, end_date):
+    """Bitset with the days of [start_date, end_date] that fall inside the window"""
+    first = max(start_date, window_start)
+    last = min(end_date, window_end)
+    if last < first:
+        return 0
+    offset = (first - window_start).days
+    length = (last - first).days + 1
+    return ((1 << length) - 1) << offset
+
+
+def compute_availability_matrix(start_date, end_date, department=None, project_id=None):
+    """Build the matrix from one range scan over approved leaves and one over attendance"""
+    employees = Employee.objects.filter(is_superuser=False)
+    if department:
+        employees = employees.filter(department=department)
+    if project_id:
+        employees = employees.filter(project_collaborations__project_id=project_id)
+    employees = employees.order_by('first_name', 'last_name')
+
+    rows = {}
+    for employee_pk, employee_id, first_name, last_name, employee_department in employees.values_list(
+        'id', 'employee_id', 'first_name', 'last_name', 'department'
+    ):
+        rows[employee_pk] = {
+            'id': employee_pk,
+            'employee_id': employee_id,
+            'name': f'{first_name} {last_name}'.strip(),
+            'department': employee_department,
+            'on_leave': 0,
+            'present': 0,
+            'absent': 0,
+        }
+
+    if rows:
+        leaves = LeaveApplication.objects.filter(
+            employee__in=employees.values('id'),
+            status='APPROVED',
+            start_date__lte=end_date,
+            end_date__gte=start_date,
+        ).values_list('employee_id', 'start_date', 'end_date')
+
+        for employee_pk, leave_start, leave_end in leaves:
+            rows[employee_pk]['on_leave'] |= _range_mask(start_date, end_date, leave_start, leave_end)
+
+        attendance = Attendance.objects.filter(
+            employee__in=employees.values('id'),
+            date__range=(start_date, end_date),
+        ).values_list('employee_id', 'date', 'status')
+
+        for employee_pk, attendance_date, status in attendance:
+            bit = 1 << (attendance_date - start_date).days
+            if status in ATTENDED_STATUSES:
+                rows[employee_pk]['present'] |= bit
+            elif status == 'ON_LEAVE':
+                rows[employee_pk]['on_leave'] |= bit
+            elif status == 'ABSENT':
+                rows[employee_pk]['absent'] |= bit
+
+    day_count = (end_date - start_date).days + 1
+    return {
+        'start_date': start_date.isoformat(),
+        'end_date': end_date.isoformat(),
+        'days': [(start_date + timedelta(days=i)).isoformat() for i in range(day_count)],
+        'employees': list(rows.values()),
+    }
+
+
+def get_availability_matrix(start_date, end_date, department=None, project_id=None):
+    """Return the availability matrix for a window, served from cache when possible"""
+    cache_key = make_cache_key(
+        AVAILABILITY_CACHE_NAMESPACE,
+        start_date.isoformat(),
+        end_date.isoformat(),
+        department or '-',
+        project_id or '-',
+    )
+    matrix = cache.get(cache_key)
+    record_cache_lookup('availability', matrix is not None)
+    if matrix is None:
+        matrix = compute_availability_matrix(start_date, end_date, department, project_id)
+        cache.set(cache_key, matrix, AVAILABILITY_CACHE_TIMEOUT)
+    return matrix
+
+
+def day_state(row, index):
+    """State of one matrix cell; approved leave wins over attendance records"""
+    bit = 1 << index
+    if row['on_leave'] & bit:
+        return 'ON_LEAVE'
+    if row['present'] & bit:
+        return 'PRESENT'
+    if row['absent'] & bit:
+        return 'ABSENT'
+    return ''
+
+
+def away_counts(matrix):
+    """Number of employees on leave for each day of the window"""
+    return [
+        sum(1 for row in matrix['employees'] if row['on_leave'] >> index & 1)
+        for index in range(len(matrix['days']))
+    ]
@@ -0,0 +1,64 @@
+"""
+Authentication backends
+"""
+
+import logging
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import cache
+
+from .metrics import record_cache_lookup
+
+logger = logging.getLogger(__name__)
+
+USER_CACHE_TIMEOUT = 60 * 15  # 15 minutes
+
+
+def user_cache_key(user_id):
+    """Cache key holding the Employee loaded for an authenticated session"""
+    return f'auth-user:v2:{user_id}'
+
+
+def invalidate_cached_user(user_id):
+    """Drop the cached Employee so the next request reloads it from the database"""
+    cache.delete(user_cache_key(user_id))
+
+
+def _cache_entry(user):
+    # The cache may be shared with other services (CACHE_URL), so it never
+    # holds the password hash; the session check uses the derived HMACs instead
+    field_names = [field.attname for field in user._meta.concrete_fields if field.attname != 'password']
+    return {
+        'db': user._state.db,
+        'fields': field_names,
+        'values': [getattr(user, name) for name in field_names],
+        'session_auth': (user.get_session_auth_hash(), list(user.get_session_auth_fallback_hash())),
+    }
+
+
+def _user_from_entry(entry):
+    # password stays deferred: reading it loads it, and save() leaves it alone
+    user = get_user_model().from_db(entry['db'], entry['fields'], entry['values'])
+    user._cached_session_auth = entry['session_auth']
+    return user
+
+
+class CachedModelBackend(ModelBackend):
+    """
+    ModelBackend that serves the per-request user lookup from the cache.
+    Entries are dropped whenever the Employee is saved or deleted (see signals),
+    so permission, password and activation changes apply on the next request.
+    """
+
+    def get_user(self, user_id):
+        key = user_cache_key(user_id)
+        entry = cache.get(key)
+        record_cache_lookup('auth_user', entry is not None)
+        if entry is None:
+            user = super().get_user(user_id)
+            if user is None:
+                return None
+            cache.set(key, _cache_entry(user), USER_CACHE_TIMEOUT)
+        else:
+            user = _user_from_entry(entry)
+        return user if self.user_can_authenticate(user) else None
@@ -0,0 +1,82 @@
+"""
+Business-day calendar utilities
+
+For every year we precompute a prefix-sum array over a working-day bitmap
+(weekends and ``Holiday`` rows excluded), so counting working days between
+any two dates is a constant-time lookup per calendar year touched. Tables are
+kept in process memory and rebuilt only after the shared holiday cache
+version is bumped by the ``Holiday`` signals.
+"""
+
+import logging
+import threading
+from array import array
+from calendar import isleap, monthrange
+from datetime import date, timedelta
+
+from .cache_utils import get_cache_version
+from .models import Holiday
+
+logger = logging.getLogger(__name__)
+
+HOLIDAY_CACHE_NAMESPACE = 'holidays'
+WEEKEND_DAYS = {5, 6}  # Saturday, Sunday
+
+# year -> (holiday cache version, prefix sums); prefix[i] = working days before day-of-year i
+_year_tables = {}
+_lock = threading.Lock()
+
+
+def _build_year_table(year):
+    holidays = set(Holiday.objects.filter(date__year=year).values_list('date', flat=True))
+    day_count = 366 if isleap(year) else 365
+    first_day = date(year, 1, 1)
+
+    prefix = array('H', [0]) * (day_count + 1)
+    for index in range(day_count):
+        day = first_day + timedelta(days=index)
+        working = day.weekday() not in WEEKEND_DAYS and day not in holidays
+        prefix[index + 1] = prefix[index] + working
+
+    logger.debug(f"Built working-day table for {year} ({prefix[day_count]} working days)")
+    return prefix
+
+
+def _get_year_table(year, version):
+    entry = _year_tables.get(year)
+    if entry is None or entry[0] != version:
+        with _lock:
+            entry = _year_tables.get(year)
+            if entry is None or entry[0] != version:
+                entry = (version, _build_year_table(year))
+                _year_tables[year] = entry
+    return entry[1]
+
+
+def count_working_days(start_date, end_date):
+    """Number of working days in the inclusive range [start_date, end_date]"""
+    if end_date < start_date:
+        return 0
+
+    version = get_cache_version(HOLIDAY_CACHE_NAMESPACE)
+    total = 0
+    for year in range(start_date.year, end_date.year + 1):
+        prefix = _get_year_table(year, version)
+        first = start_date.timetuple().tm_yday - 1 if year == start_date.year else 0
+        last = end_date.timetuple().tm_yday if year == end_date.year else len(prefix) - 1
+        total += prefix[last] - prefix[first]
+    return total
+
+
+def is_working_day(day):
+    """Whether a date is neither a weekend day nor a company holiday"""
+    return count_working_days(day, day) == 1
+
+
+def working_days_in_month(year, month, through=None):
+    """Working days in a month, optionally only counting up to ``through``"""
+    first_day = date(year, month, 1)
+    last_day = date(year, month, monthrange(year, month)[1])
+    if through is not None:
+        last_day = min(last_day, through)
+    return count_working_days(first_day, last_day)
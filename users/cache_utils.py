@@ -0,0 +1,90 @@
+"""
+Versioned cache key utilities
+"""
+
+import time
+import logging
+from datetime import date
+from django.conf import settings
+from django.core.cache import cache
+from django.middleware.csrf import get_token
+
+logger = logging.getLogger(__name__)
+
+VERSION_KEY_PREFIX = 'cache-version'
+
+
+def _version_key(namespace):
+    return f'{VERSION_KEY_PREFIX}:{namespace}'
+
+
+def _fresh_version():
+    # Seed counters from the clock so an evicted counter never restarts at a
+    # value that older cached entries were stored under
+    return time.time_ns() // 1000
+
+
+def get_cache_version(namespace):
+    """Return the current version counter for a cache namespace"""
+    key = _version_key(namespace)
+    version = cache.get(key)
+    if version is None:
+        # add() is a no-op if another worker seeded the counter first
+        cache.add(key, _fresh_version(), timeout=None)
+        version = cache.get(key) or _fresh_version()
+    return version
+
+
+def bump_cache_version(namespace):
+    """Invalidate every key built for a namespace by moving its version forward"""
+    key = _version_key(namespace)
+    try:
+        return cache.incr(key)
+    except ValueError:
+        version = _fresh_version()
+        cache.set(key, version, timeout=None)
+        return version
+
+
+def make_cache_key(namespace, *parts):
+    """Build a cache key that changes whenever the namespace version is bumped"""
+    version = get_cache_version(namespace)
+    suffix = ':'.join(str(part) for part in parts)
+    return f'{namespace}:v{version}:{suffix}'
+
+
+def get_cache_versions(namespaces):
+    """Current versions for several namespaces using a single cache round trip"""
+    keys = {_version_key(namespace): namespace for namespace in namespaces}
+    found = cache.get_many(list(keys))
+    versions = {}
+    for key, namespace in keys.items():
+        versions[namespace] = found[key] if key in found else get_cache_version(namespace)
+    return versions
+
+
+def entity_cache_namespace(model):
+    """Version namespace bumped whenever any row of ``model`` changes"""
+    return f'entity:{model._meta.model_name}'
+
+
+def fragment_cache_context(request, *models):
+    """
+    Template context for ``{% cache fragment_timeout <name> fragment_key %}`` blocks.
+    The key varies on the user, the current version of every entity the fragment
+    renders, today's date (for due-date badges) and the user's CSRF secret, so
+    forms inside a cached fragment keep a valid token after login rotates it.
+    """
+    get_token(request)
+    namespaces = [entity_cache_namespace(model) for model in models]
+    versions = get_cache_versions(namespaces)
+    version_part = '.'.join(str(versions[namespace]) for namespace in namespaces)
+    return {
+        'fragment_key': ':'.join([
+            str(request.user.pk),
+            version_part,
+            date.today().isoformat(),
+            request.META.get('CSRF_COOKIE', ''),
+        ]),
+        'fragment_timeout': settings.FRAGMENT_CACHE_TIMEOUT,
+    }
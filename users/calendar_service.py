@@ -0,0 +1,16 @@
+"""
+Lazy entry point for the Google Calendar integration
+
+google_calendar_utils pulls in the Google auth, OAuth flow and API discovery
+clients, which cost more to import than the rest of the app put together.
+Import GoogleCalendarService from here instead: the integration is loaded on
+first attribute access, so worker boot and management commands that never
+touch the calendar skip it entirely.
+"""
+
+from django.utils.functional import SimpleLazyObject
+from django.utils.module_loading import import_string
+
+GoogleCalendarService = SimpleLazyObject(
+    lambda: import_string('users.google_calendar_utils.GoogleCalendarService')
+)
@@ -0,0 +1,26 @@
+"""
+System checks for the static asset build
+"""
+
+from django.conf import settings
+from django.core.checks import Warning, register
+
+# Outputs of `npm run build` that templates/base.html loads
+BUILT_ASSETS = [
+    'css/app.css',
+    'vendor/alpinejs/cdn.min.js',
+    'vendor/inter/inter-latin-wght-normal.woff2',
+]
+
+
+@register('staticfiles')
+def check_built_assets(app_configs, **kwargs):
+    static_dir = settings.STATICFILES_DIRS[0]
+    missing = [path for path in BUILT_ASSETS if not (static_dir / path).exists()]
+    if not missing:
+        return []
+    return [Warning(
+        f"Built static assets are missing: {', '.join(missing)}",
+        hint='Run "npm install && npm run build" before runserver or collectstatic (see README.md).',
+        id='users.W001',
+    )]
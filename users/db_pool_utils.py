@@ -0,0 +1,35 @@
+"""
+Database connection pool statistics
+
+Pools live per worker process, so the figures describe the process serving the
+request. Counters such as ``requests_num`` and ``requests_wait_ms`` are
+cumulative since the pool was opened.
+"""
+
+import logging
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+
+def _pool_summary(raw):
+    in_use = raw.get('pool_size', 0) - raw.get('pool_available', 0)
+    pool_max = raw.get('pool_max', 0)
+    queued = raw.get('requests_queued', 0)
+    return {
+        **raw,
+        'connections_in_use': in_use,
+        'utilization': round(in_use / pool_max, 3) if pool_max else 0.0,
+        'avg_wait_ms': round(raw.get('requests_wait_ms', 0) / queued, 1) if queued else 0.0,
+    }
+
+
+def get_pool_stats():
+    """Statistics for every pooled database alias, keyed by alias"""
+    stats = {}
+    for alias in connections:
+        pool = getattr(connections[alias], 'pool', None)
+        if pool is None:
+            continue
+        stats[alias] = _pool_summary(pool.get_stats())
+    return stats
@@ -0,0 +1,100 @@
+"""
+Read-replica database routing
+
+Reads are sent to the ``replica`` alias only inside views decorated with
+``read_from_replica`` (or code wrapped in ``replica_reads()``). Everything
+else, and every write, goes to ``default``. A user who has just written is
+pinned to the primary for ``REPLICA_PIN_SECONDS`` so they read their own
+writes despite replication lag. Without a configured replica all routing
+falls through to ``default``.
+"""
+
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+REPLICA_DB_ALIAS = 'replica'
+PRIMARY_DB_ALIAS = 'default'
+REPLICA_PIN_SECONDS = 15
+
+_replica_reads = ContextVar('replica_reads', default=False)
+
+
+def replica_available():
+    """Whether a read replica is configured"""
+    return REPLICA_DB_ALIAS in settings.DATABASES
+
+
+def _pin_key(user_id):
+    return f'replica-pin:{user_id}'
+
+
+def pin_to_primary(user):
+    """Keep the user's reads on the primary until their recent writes have replicated"""
+    if user.is_authenticated:
+        cache.set(_pin_key(user.pk), True, REPLICA_PIN_SECONDS)
+
+
+def is_pinned_to_primary(user):
+    return user.is_authenticated and cache.get(_pin_key(user.pk)) is not None
+
+
+@contextmanager
+def replica_reads():
+    """Route ORM reads in this block to the replica when one is configured"""
+    token = _replica_reads.set(replica_available())
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+@contextmanager
+def primary_reads():
+    """
+    Route ORM reads in this block to the primary even inside a replica-routed
+    view, for results that are cached and must not capture replication lag
+    """
+    token = _replica_reads.set(False)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+def read_from_replica(view_func):
+    """
+    Serve a read-only view from the replica. Unsafe methods and users pinned
+    after a recent write keep using the primary.
+    """
+    @wraps(view_func)
+    def _wrapped_view(request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD') or is_pinned_to_primary(request.user):
+            return view_func(request, *args, **kwargs)
+        with replica_reads():
+            return view_func(request, *args, **kwargs)
+    return _wrapped_view
+
+
+class ReplicaRouter:
+    """Database router used together with ``read_from_replica``"""
+
+    def db_for_read(self, model, **hints):
+        if _replica_reads.get():
+            return REPLICA_DB_ALIAS
+        return PRIMARY_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        return PRIMARY_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Both aliases hold the same data
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db != REPLICA_DB_ALIAS
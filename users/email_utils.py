@@ -0,0 +1,152 @@
+"""
+Email outbox: queue rendered messages and deliver them in batches
+
+Requests only insert an EmailOutbox row; the send_outbox worker claims due
+messages, sends a batch over one SMTP connection and records the outcome of
+each message. Failed messages are retried with exponential backoff.
+"""
+
+import logging
+import smtplib
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import transaction
+from django.utils import timezone
+
+from .metrics import EMAILS_SENT
+from .models import EmailOutbox
+
+logger = logging.getLogger(__name__)
+
+OUTBOX_BATCH_SIZE = 50
+OUTBOX_MAX_ATTEMPTS = 6
+# Retry delays grow 1, 2, 4, 8 ... minutes up to the cap
+OUTBOX_RETRY_BASE_SECONDS = 60
+OUTBOX_RETRY_MAX_SECONDS = 60 * 60
+# A message claimed this long ago by a worker that never reported back is retried
+OUTBOX_CLAIM_TIMEOUT_SECONDS = 10 * 60
+
+
+def build_email(to_email, subject, body, html_body='', from_email=None):
+    """Unsaved outbox message, for callers that queue many messages with bulk_create"""
+    return EmailOutbox(
+        to_email=to_email,
+        from_email=from_email or settings.DEFAULT_FROM_EMAIL,
+        subject=subject,
+        body=body,
+        html_body=html_body or '',
+    )
+
+
+def queue_email(to_email, subject, body, html_body='', from_email=None):
+    """Queue a message for the send_outbox worker"""
+    message = build_email(to_email, subject, body, html_body, from_email)
+    message.save()
+    return message
+
+
+def retry_delay(attempts):
+    return timedelta(seconds=min(OUTBOX_RETRY_BASE_SECONDS * 2 ** (attempts - 1), OUTBOX_RETRY_MAX_SECONDS))
+
+
+def claim_due_messages(batch_size=OUTBOX_BATCH_SIZE):
+    """
+    Mark up to ``batch_size`` due messages as SENDING and return them.
+    Rows locked by another worker are skipped, so several workers can run.
+    """
+    now = timezone.now()
+    # Give up on claims from workers that died mid-batch
+    EmailOutbox.objects.filter(
+        status='SENDING', claimed_at__lt=now - timedelta(seconds=OUTBOX_CLAIM_TIMEOUT_SECONDS)
+    ).update(status='PENDING')
+
+    with transaction.atomic():
+        ids = list(
+            EmailOutbox.objects.select_for_update(skip_locked=True)
+            .filter(status='PENDING', next_attempt_at__lte=now)
+            .order_by('next_attempt_at')
+            .values_list('id', flat=True)[:batch_size]
+        )
+        EmailOutbox.objects.filter(id__in=ids).update(status='SENDING', claimed_at=now)
+    return list(EmailOutbox.objects.filter(id__in=ids).order_by('next_attempt_at'))
+
+
+def _deliver(message, connection):
+    email = EmailMultiAlternatives(
+        subject=message.subject,
+        body=message.body,
+        from_email=message.from_email,
+        to=[message.to_email],
+        connection=connection,
+    )
+    if message.html_body:
+        email.attach_alternative(message.html_body, 'text/html')
+    email.send()
+
+
+def _record_failure(message, error):
+    message.attempts += 1
+    message.last_error = f'{type(error).__name__}: {error}'
+    if message.attempts >= OUTBOX_MAX_ATTEMPTS:
+        message.status = 'FAILED'
+        EMAILS_SENT.labels(outcome='failed').inc()
+        logger.error(f"Giving up on email {message.pk} to {message.to_email}: {message.last_error}")
+    else:
+        message.status = 'PENDING'
+        message.next_attempt_at = timezone.now() + retry_delay(message.attempts)
+        EMAILS_SENT.labels(outcome='retry').inc()
+        logger.warning(f"Email {message.pk} to {message.to_email} failed, retrying at {message.next_attempt_at}")
+    message.save(update_fields=['attempts', 'last_error', 'status', 'next_attempt_at'])
+
+
+def send_outbox_batch(batch_size=OUTBOX_BATCH_SIZE):
+    """
+    Claim and send one batch over a single SMTP connection.
+    Returns ``(sent, failed)`` counts for the batch.
+    """
+    messages = claim_due_messages(batch_size)
+    if not messages:
+        return 0, 0
+
+    connection = get_connection(fail_silently=False)
+    try:
+        connection.open()
+    except Exception as error:
+        logger.error(f"Could not connect to the mail server: {error}")
+        for message in messages:
+            _record_failure(message, error)
+        return 0, len(messages)
+
+    sent = failed = 0
+    try:
+        for message in messages:
+            try:
+                _deliver(message, connection)
+            except smtplib.SMTPServerDisconnected as error:
+                _record_failure(message, error)
+                failed += 1
+                # Reconnect for the rest of the batch
+                connection.close()
+                connection.open()
+            except Exception as error:
+                _record_failure(message, error)
+                failed += 1
+            else:
+                message.status = 'SENT'
+                message.sent_at = timezone.now()
+                message.attempts += 1
+                message.last_error = ''
+                # Bodies can carry credentials and are not needed once delivered
+                message.body = message.html_body = ''
+                message.save(update_fields=['status', 'sent_at', 'attempts', 'last_error', 'body', 'html_body'])
+                EMAILS_SENT.labels(outcome='sent').inc()
+                sent += 1
+    finally:
+        try:
+            connection.close()
+        except Exception:
+            pass
+    logger.info(f"Outbox batch: {sent} sent, {failed} failed")
+    return sent, failed
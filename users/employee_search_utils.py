@@ -0,0 +1,117 @@
+"""
+Indexed employee search for autocomplete widgets and filters
+
+On PostgreSQL every word of the query is matched as a substring of one
+upper-cased name/ID/email string, served by a pg_trgm GIN index. Other
+databases match word prefixes with range comparisons on the upper-cased
+expression indexes declared on Employee, which any B-tree can serve.
+Departments are matched against their codes and labels in Python.
+"""
+
+import logging
+from django.db import connections, router
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Upper
+
+from .models import Employee, ProjectCollaborator
+
+logger = logging.getLogger(__name__)
+
+EMPLOYEE_SEARCH_PAGE_SIZE = 10
+EMPLOYEE_SEARCH_MAX_PAGE_SIZE = 25
+# Longer queries are truncated; nobody types this much into an autocomplete
+EMPLOYEE_SEARCH_MAX_WORDS = 4
+
+TRIGRAM_INDEX_NAME = 'users_employee_search_trgm'
+# Must stay identical to the indexed expression for PostgreSQL to use the index
+POSTGRES_SEARCH_EXPRESSION = (
+    "UPPER(first_name || ' ' || last_name || ' ' || COALESCE(employee_id, '') || ' ' || email)"
+)
+# Sorts after every character, so [word, word + PREFIX_UPPER_BOUND) is "starts with word"
+PREFIX_UPPER_BOUND = '\U0010ffff'
+
+
+def ensure_search_indexes(using='default', **kwargs):
+    """
+    post_migrate hook: create the trigram index on PostgreSQL. Needs the
+    pg_trgm extension, which the migrating role must be allowed to create.
+    """
+    connection = connections[using]
+    if connection.vendor != 'postgresql':
+        return
+    table = connection.ops.quote_name(Employee._meta.db_table)
+    with connection.cursor() as cursor:
+        cursor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+        cursor.execute(
+            f'CREATE INDEX IF NOT EXISTS {TRIGRAM_INDEX_NAME} ON {table} '
+            f'USING gin (({POSTGRES_SEARCH_EXPRESSION}) gin_trgm_ops)'
+        )
+
+
+def _department_codes(word):
+    word = word.lower()
+    return [code for code, label in Employee.DEPARTMENT_CHOICES if word in code.lower() or word in label.lower()]
+
+
+def _prefix(expression, word):
+    return Q(**{f'{expression}__gte': word, f'{expression}__lt': word + PREFIX_UPPER_BOUND})
+
+
+def search_employees(query, department=None, project_id=None, offset=0, limit=EMPLOYEE_SEARCH_PAGE_SIZE):
+    """
+    Return ``(employees, has_next)`` for one page of non-admin employees
+    matching every word of ``query``. An empty query lists everyone.
+    """
+    employees = Employee.objects.filter(is_superuser=False)
+    if department:
+        employees = employees.filter(department=department)
+    if project_id:
+        employees = employees.filter(
+            pk__in=ProjectCollaborator.objects.filter(project_id=project_id).values('employee_id')
+        )
+
+    words = query.upper().split()[:EMPLOYEE_SEARCH_MAX_WORDS]
+    if words:
+        vendor = connections[router.db_for_read(Employee)].vendor
+        if vendor == 'postgresql':
+            employees = employees.annotate(search_key=RawSQL(POSTGRES_SEARCH_EXPRESSION, ()))
+        else:
+            employees = employees.annotate(
+                first_key=Upper('first_name'), last_key=Upper('last_name'), email_key=Upper('email'),
+            )
+        for word in words:
+            if vendor == 'postgresql':
+                match = Q(search_key__contains=word)
+            else:
+                match = (
+                    _prefix('first_key', word) | _prefix('last_key', word)
+                    | _prefix('email_key', word) | _prefix('employee_id', word)
+                )
+                if word.isdigit():
+                    # "042" finds STERPEMP042
+                    match |= _prefix('employee_id', Employee.EMPLOYEE_ID_PREFIX + word)
+            codes = _department_codes(word)
+            if codes:
+                match |= Q(department__in=codes)
+            employees = employees.filter(match)
+
+    # One extra row tells us whether there is another page without a COUNT
+    page = list(
+        employees.order_by('first_name', 'last_name', 'pk')
+        .only('pk', 'username', 'employee_id', 'first_name', 'last_name', 'email', 'department', 'position')
+        [offset:offset + limit + 1]
+    )
+    return page[:limit], len(page) > limit
+
+
+def employee_search_result(employee):
+    """JSON shape shared by the search endpoint and autocomplete widgets"""
+    return {
+        'id': employee.pk,
+        'employee_id': employee.employee_id,
+        'name': employee.get_full_name() or employee.username,
+        'email': employee.email,
+        'department': employee.get_department_display(),
+        'position': employee.position,
+    }
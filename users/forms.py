@@ -1,11 +1,16 @@
 from django import forms
 from django.contrib.auth.forms import UserCreationForm, PasswordChangeForm
-from django.core.mail import send_mail
-from django.conf import settings
 from django.template.loader import render_to_string
+import logging
 import random
 import string
 from .models import Employee, Project, ProjectCollaborator, Task, LeaveType, LeaveBalance, LeaveApplication
+from .business_day_utils import count_working_days
+from .email_utils import build_email
+from .task_utils import assign_task
+from .widgets import EmployeeAutocomplete
+
+logger = logging.getLogger(__name__)
 
 class EmployeeCreationForm(UserCreationForm):
     password1 = forms.CharField(widget=forms.HiddenInput(), required=False)
@@ -27,13 +32,15 @@ class EmployeeCreationForm(UserCreationForm):
             'monthly_salary': forms.NumberInput(attrs={'class': 'mt-1 block w-full rounded-md border-gray-300 shadow-sm focus:border-blue-500 focus:ring-blue-500 sm:text-sm p-2', 'step': '0.01'})
         }
     
-    def generate_random_password(self):
+    @staticmethod
+    def generate_random_password():
         """Generate a random 8-character password"""
         characters = string.ascii_letters + string.digits
         return ''.join(random.choice(characters) for _ in range(8))
     
-    def send_password_email(self, employee, password):
-        """Send password email to the new employee"""
+    @staticmethod
+    def build_password_email(employee, password):
+        """Render the welcome email with login details as an unsaved outbox message"""
         subject = 'Welcome to STERP Softwares - Your Account Details'
         
         # Render email template
@@ -44,8 +51,8 @@ class EmployeeCreationForm(UserCreationForm):
                 'company_name': 'STERP Softwares'
             })
         except Exception as template_error:
-            print(f"Template error: {template_error}")
-            html_message = None
+            logger.error(f"Template error: {template_error}")
+            html_message = ''
         
         plain_message = f"""
 Welcome to STERP Softwares!
@@ -64,42 +71,14 @@ Best regards,
 STERP Softwares Team
         """
         
-        try:
-            print(f"Attempting to send email to: {employee.email}")
-            print(f"From email: {settings.DEFAULT_FROM_EMAIL}")
-            
-            send_mail(
-                subject=subject,
-                message=plain_message,
-                html_message=html_message,
-                from_email=settings.DEFAULT_FROM_EMAIL,
-                recipient_list=[employee.email],
-                fail_silently=False,
-            )
-            print("Email sent successfully!")
-            return True
-            
-        except Exception as e:
-            print(f"Error type: {type(e)}")
-            
-            # Try with basic authentication
-            try:
-                print("Retrying with simpler configuration...")
-                send_mail(
-                    subject=subject,
-                    message=plain_message,
-                    from_email=settings.EMAIL_HOST_USER,
-                    recipient_list=[employee.email],
-                    fail_silently=False,
-                    auth_user=settings.EMAIL_HOST_USER,
-                    auth_password=settings.EMAIL_HOST_PASSWORD,
-                )
-                print("Email sent on retry!")
-                return True
-            except Exception as retry_error:
-                print(f"Retry failed: {retry_error}")
-                return False
+        return build_email(employee.email, subject, plain_message, html_message)
     
+    def queue_password_email(self, employee, password):
+        """Queue the welcome email; the send_outbox worker delivers it"""
+        message = self.build_password_email(employee, password)
+        message.save()
+        return message
+
     def save(self, commit=True):
         employee = super().save(commit=False)
         
@@ -115,18 +94,17 @@ STERP Softwares Team
         
         if commit:
             employee.save()
-            # Send welcome email with password
-            if self.send_password_email(employee, random_password):
-                print("Email sent")
-            else:
-                print("Email not sent")
+            # Welcome email with password, sent by the outbox worker
+            self.queue_password_email(employee, random_password)
         
         return employee
 
 class ProjectCreationForm(forms.ModelForm):
     collaborators = forms.ModelMultipleChoiceField(
         queryset=Employee.objects.filter(is_superuser=False),
-        widget=forms.CheckboxSelectMultiple,
+        widget=EmployeeAutocomplete(multiple=True, attrs={
+            'class': 'w-full px-4 py-3 bg-slate-700/50 border border-slate-600 rounded-xl text-white placeholder-gray-400 focus:outline-none focus:ring-2 focus:ring-green-500 focus:border-transparent',
+        }),
         required=False,
         help_text="Select employees to collaborate on this project"
     )
@@ -163,7 +141,9 @@ class ProjectCreationForm(forms.ModelForm):
 class ProjectUpdateForm(forms.ModelForm):
     collaborators = forms.ModelMultipleChoiceField(
         queryset=Employee.objects.filter(is_superuser=False),
-        widget=forms.CheckboxSelectMultiple,
+        widget=EmployeeAutocomplete(multiple=True, attrs={
+            'class': 'w-full px-4 py-3 bg-slate-700/50 border border-slate-600 rounded-xl text-white placeholder-gray-400 focus:outline-none focus:ring-2 focus:ring-green-500 focus:border-transparent',
+        }),
         required=False,
         help_text="Select employees to collaborate on this project"
     )
@@ -221,10 +201,9 @@ class TaskCreationForm(forms.ModelForm):
             }),
             'project': forms.Select(attrs={
                 'class': 'block w-full rounded-xl bg-slate-700/50 border-slate-600/50 text-white shadow-sm focus:border-blue-500 focus:ring-blue-500 sm:text-sm px-4 py-3',
-                'onchange': 'updateEmployeeOptions()'
             }),
-            'employee': forms.Select(attrs={
-                'class': 'block w-full rounded-xl bg-slate-700/50 border-slate-600/50 text-white shadow-sm focus:border-blue-500 focus:ring-blue-500 sm:text-sm px-4 py-3',
+            'employee': EmployeeAutocomplete(project_field='id_project', attrs={
+                'class': 'block w-full rounded-xl bg-slate-700/50 border-slate-600/50 text-white placeholder-gray-400 shadow-sm focus:border-blue-500 focus:ring-blue-500 sm:text-sm px-4 py-3',
                 'id': 'id_employee'
             }),
             'date': forms.DateInput(attrs={
@@ -243,9 +222,8 @@ class TaskCreationForm(forms.ModelForm):
         self.fields['project'].required = False
         self.fields['project'].empty_label = "Not linked to any project"
         
-        # Only show non-admin employees in the dropdown
+        # Only non-admin employees can be assigned
         self.fields['employee'].queryset = Employee.objects.filter(is_superuser=False)
-        self.fields['employee'].empty_label = "Select an employee"
     
     def clean(self):
         cleaned_data = super().clean()
@@ -278,6 +256,65 @@ class TaskCreationForm(forms.ModelForm):
         return task
 
 
+class BulkTaskCreationForm(forms.ModelForm):
+    """Form for assigning one task to several employees or a whole project team"""
+    employees = forms.ModelMultipleChoiceField(
+        queryset=Employee.objects.filter(is_superuser=False),
+        required=False,
+        widget=EmployeeAutocomplete(multiple=True, project_field='id_project', attrs={
+            'class': 'block w-full rounded-xl bg-slate-700/50 border-slate-600/50 text-white placeholder-gray-400 shadow-sm focus:border-blue-500 focus:ring-blue-500 sm:text-sm px-4 py-3',
+        }),
+    )
+    all_collaborators = forms.BooleanField(
+        required=False,
+        widget=forms.CheckboxInput(attrs={
+            'class': 'rounded bg-slate-700/50 border-slate-600 text-blue-600 focus:ring-blue-500',
+        }),
+    )
+
+    class Meta(TaskCreationForm.Meta):
+        fields = ['name', 'description', 'project', 'date', 'priority']
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fields['project'].queryset = Project.objects.all()
+        self.fields['project'].required = False
+        self.fields['project'].empty_label = "Not linked to any project"
+
+    def clean(self):
+        cleaned_data = super().clean()
+        project = cleaned_data.get('project')
+        assignees = list(cleaned_data.get('employees') or [])
+
+        if cleaned_data.get('all_collaborators') and not project:
+            self.add_error('all_collaborators', "Select a project to assign the task to its whole team.")
+            return cleaned_data
+
+        if project:
+            collaborator_ids = set(
+                ProjectCollaborator.objects.filter(project=project).values_list('employee_id', flat=True)
+            )
+            outsiders = [employee.get_full_name() for employee in assignees if employee.pk not in collaborator_ids]
+            if outsiders:
+                raise forms.ValidationError(
+                    f"{', '.join(outsiders)} {'is' if len(outsiders) == 1 else 'are'} not a collaborator on the selected project."
+                )
+            if cleaned_data.get('all_collaborators'):
+                collaborator_ids -= {employee.pk for employee in assignees}
+                assignees += Employee.objects.filter(pk__in=collaborator_ids, is_superuser=False)
+
+        if not assignees and not self.errors:
+            raise forms.ValidationError("Select at least one employee or assign the task to the whole project team.")
+        cleaned_data['assignees'] = sorted(assignees, key=lambda employee: employee.get_full_name())
+        return cleaned_data
+
+    def save(self, created_by):
+        """Create one task per assignee and return them"""
+        task = super().save(commit=False)
+        task.created_by = created_by
+        return assign_task(task, self.cleaned_data['assignees'])
+
+
 class TaskUpdateForm(forms.ModelForm):
     """Form for updating existing tasks"""
     
@@ -294,10 +331,9 @@ class TaskUpdateForm(forms.ModelForm):
             }),
             'project': forms.Select(attrs={
                 'class': 'block w-full rounded-xl bg-slate-700/50 border-slate-600/50 text-white shadow-sm focus:border-blue-500 focus:ring-blue-500 sm:text-sm px-4 py-3',
-                'onchange': 'updateEmployeeOptions()'
             }),
-            'employee': forms.Select(attrs={
-                'class': 'block w-full rounded-xl bg-slate-700/50 border-slate-600/50 text-white shadow-sm focus:border-blue-500 focus:ring-blue-500 sm:text-sm px-4 py-3',
+            'employee': EmployeeAutocomplete(project_field='id_project', attrs={
+                'class': 'block w-full rounded-xl bg-slate-700/50 border-slate-600/50 text-white placeholder-gray-400 shadow-sm focus:border-blue-500 focus:ring-blue-500 sm:text-sm px-4 py-3',
                 'id': 'id_employee'
             }),
             'date': forms.DateInput(attrs={
@@ -422,9 +458,10 @@ class LeaveApplicationForm(forms.ModelForm):
             if end_date < start_date:
                 raise forms.ValidationError("End date cannot be before start date")
             
-            # Calculate days
-            delta = end_date - start_date
-            total_days = delta.days + 1
+            # Calculate working days (weekends and holidays excluded)
+            total_days = count_working_days(start_date, end_date)
+            if total_days == 0:
+                raise forms.ValidationError("The selected dates do not include any working days.")
             
             # Check leave balance
             if self.employee and leave_type:
@@ -459,3 +496,12 @@ class LeaveApplicationForm(forms.ModelForm):
             leave_app.save()
         
         return leave_app
+
+
+class EmployeeFilterForm(forms.Form):
+    """Employee filter for admin list pages, searched instead of listing every employee"""
+    employee = forms.ModelChoiceField(
+        queryset=Employee.objects.filter(is_superuser=False),
+        required=False,
+        widget=EmployeeAutocomplete(attrs={'id': 'employee'}, placeholder='All Employees'),
+    )
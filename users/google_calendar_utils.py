@@ -15,6 +15,7 @@ from google_auth_oauthlib.flow import Flow
 from googleapiclient.discovery import build
 
 from .models import GoogleCalendarCredentials
+from .metrics import observe_google_call
 
 
 class GoogleCalendarService:
@@ -66,6 +67,7 @@ class GoogleCalendarService:
         return authorization_url
     
     @classmethod
+    @observe_google_call('handle_callback')
     def handle_callback(cls, request):
         """Handle OAuth2 callback and store credentials"""
         available, error = cls._check_availability()
@@ -172,6 +174,7 @@ class GoogleCalendarService:
             return None
     
     @classmethod
+    @observe_google_call('revoke_credentials')
     def revoke_credentials(cls, employee):
         """Revoke and delete Google Calendar credentials for an employee"""
         try:
@@ -204,6 +207,7 @@ class GoogleCalendarService:
             return False, f"Error disconnecting Google Calendar: {str(e)}"
     
     @classmethod
+    @observe_google_call('create_event')
     def create_event(cls, employee, event_data):
         """Create an event in employee's Google Calendar"""
         service = cls.get_calendar_service(employee)
@@ -323,6 +327,7 @@ class GoogleCalendarService:
         return cls.create_event(employee, event_data)
     
     @classmethod
+    @observe_google_call('delete_project_events')
     def delete_project_events(cls, employee, project):
         """Delete project-related events from employee's calendar"""
         available, error = cls._check_availability()
@@ -419,6 +424,7 @@ class GoogleCalendarService:
         return cls.create_event(employee, event_data)
     
     @classmethod
+    @observe_google_call('delete_leave_event')
     def delete_leave_event(cls, employee, leave_application):
         """Delete leave event from employee's calendar (for cancelled/rejected leaves)"""
         available, error = cls._check_availability()
@@ -0,0 +1,83 @@
+"""
+Per-employee leave snapshot utilities
+
+The snapshot bundles everything the leave dashboards aggregate on each visit
+(balances, balance totals, application status counts and the most recent
+applications). It is cached under a per-employee versioned key that the
+LeaveApplication and LeaveBalance signals bump, so repeat visits skip every
+aggregate query. Snapshots are always built from the primary: the version
+was bumped by a write the replica may not have received yet, and a stale
+snapshot cached under the new version would outlive the lag by the full TTL.
+"""
+
+import logging
+from decimal import Decimal
+from django.core.cache import cache
+from django.db.models import Count, Q, Sum
+
+from .metrics import record_cache_lookup
+from .cache_utils import get_cache_version, make_cache_key
+from .db_routers import primary_reads
+from .models import LeaveBalance, LeaveApplication
+
+logger = logging.getLogger(__name__)
+
+LEAVE_CACHE_NAMESPACE = 'leave'
+LEAVE_TYPE_CACHE_NAMESPACE = 'leave-types'
+LEAVE_SNAPSHOT_TIMEOUT = 60 * 60  # 1 hour
+RECENT_APPLICATIONS_LIMIT = 10
+
+
+def leave_cache_namespace(employee_id):
+    """Cache namespace holding one employee's leave data"""
+    return f'{LEAVE_CACHE_NAMESPACE}:{employee_id}'
+
+
+def compute_leave_snapshot(employee_id, year):
+    """Load balances, totals and status counts for one employee"""
+    leave_balances = list(
+        LeaveBalance.objects.filter(employee_id=employee_id, year=year).select_related('leave_type')
+    )
+
+    recent_applications = list(
+        LeaveApplication.objects.filter(employee_id=employee_id)
+        .select_related('leave_type', 'reviewed_by')
+        .order_by('-applied_at')[:RECENT_APPLICATIONS_LIMIT]
+    )
+
+    status_counts = LeaveApplication.objects.filter(employee_id=employee_id).aggregate(
+        total=Count('id'),
+        pending=Count('id', filter=Q(status='PENDING')),
+        approved=Count('id', filter=Q(status='APPROVED')),
+        rejected=Count('id', filter=Q(status='REJECTED')),
+        approved_this_year=Sum('total_days', filter=Q(status='APPROVED', start_date__year=year)),
+    )
+    status_counts['approved_this_year'] = status_counts['approved_this_year'] or 0
+
+    return {
+        'year': year,
+        'leave_balances': leave_balances,
+        'total_leaves': {
+            'total': sum((balance.total_days for balance in leave_balances), Decimal('0')),
+            'used': sum((balance.used_days for balance in leave_balances), Decimal('0')),
+            'remaining': sum((balance.remaining_days for balance in leave_balances), Decimal('0')),
+        },
+        'status_counts': status_counts,
+        'recent_applications': recent_applications,
+    }
+
+
+def get_leave_snapshot(employee_id, year):
+    """Return the cached leave snapshot for an employee, rebuilding it on a miss"""
+    cache_key = make_cache_key(
+        leave_cache_namespace(employee_id),
+        year,
+        get_cache_version(LEAVE_TYPE_CACHE_NAMESPACE),
+    )
+    snapshot = cache.get(cache_key)
+    record_cache_lookup('leave_snapshot', snapshot is not None)
+    if snapshot is None:
+        with primary_reads():
+            snapshot = compute_leave_snapshot(employee_id, year)
+        cache.set(cache_key, snapshot, LEAVE_SNAPSHOT_TIMEOUT)
+    return snapshot
@@ -0,0 +1,75 @@
+"""
+Onboard employees in bulk from a CSV file, or from the uploads queued by the admin import page
+"""
+
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from users.onboarding_utils import (
+    IMPORT_COLUMNS, REQUIRED_COLUMNS, claim_next_import, read_employee_csv, import_employees, run_queued_import,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        f"Create employees from a CSV with the columns {', '.join(IMPORT_COLUMNS)} "
+        f"({', '.join(REQUIRED_COLUMNS)} required). The whole file is validated first and "
+        'nothing is imported if any row is invalid. With --queued, import the files uploaded from the '
+        'admin import page instead; run it every few minutes (e.g. from cron).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('csv_path', nargs='?', help='CSV file with a header row')
+        parser.add_argument('--queued', action='store_true', help='Import the pending web uploads and exit')
+        parser.add_argument('--dry-run', action='store_true', help='Validate the file without importing it')
+        parser.add_argument('--workers', type=int, help='Password hashing processes (default: CPU count)')
+        parser.add_argument('--batch-size', type=int, default=500, help='Rows per bulk insert')
+        parser.add_argument('--no-email', action='store_true', help='Do not send welcome emails')
+
+    def handle(self, *args, **options):
+        if options['queued']:
+            return self.import_queued(options)
+        if not options['csv_path']:
+            raise CommandError('Give a CSV file to import, or --queued.')
+
+        start = time.perf_counter()
+        try:
+            with open(options['csv_path'], encoding='utf-8-sig', newline='') as csv_file:
+                employees, errors = read_employee_csv(csv_file)
+        except OSError as error:
+            raise CommandError(f"Cannot read {options['csv_path']}: {error}")
+
+        for line, message in errors:
+            self.stderr.write(f'line {line}: {message}')
+        if errors:
+            raise CommandError(f'{len(errors)} error(s) found; nothing was imported.')
+        self.stdout.write(f'Validated {len(employees)} employees in {time.perf_counter() - start:.2f}s')
+        if options['dry_run'] or not employees:
+            return
+
+        start = time.perf_counter()
+        created = import_employees(
+            employees,
+            workers=options['workers'],
+            batch_size=options['batch_size'],
+            send_emails=not options['no_email'],
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f'Imported {len(created)} employees ({created[0].employee_id} to {created[-1].employee_id}) '
+            f'in {time.perf_counter() - start:.2f}s'
+        ))
+        if not options['no_email']:
+            self.stdout.write('Welcome emails are queued for the send_outbox worker.')
+
+    def import_queued(self, options):
+        imported = 0
+        while (job := claim_next_import()) is not None:
+            start = time.perf_counter()
+            created = run_queued_import(job, workers=options['workers'], batch_size=options['batch_size'])
+            imported += len(created)
+            if job.status == 'FAILED':
+                self.stderr.write(f'Upload {job.pk} failed validation:\n{job.error}')
+            else:
+                self.stdout.write(f'Upload {job.pk}: imported {len(created)} employees in {time.perf_counter() - start:.2f}s')
+        self.stdout.write(self.style.SUCCESS(f'Imported {imported} employees from queued uploads.'))
@@ -0,0 +1,131 @@
+"""
+Replay a morning check-in storm against a running server
+"""
+
+import json
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+import requests
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.middleware.csrf import CSRF_SECRET_LENGTH
+from django.test import Client
+from django.urls import reverse
+from django.utils.crypto import get_random_string
+
+from users.models import Employee, Attendance
+from .run_benchmarks import percentile
+from .seed_benchmark_data import BENCH_ID_PREFIX
+
+
+class Command(BaseCommand):
+    help = (
+        'Log in benchmark employees and fire their mark_attendance (and optionally checkout) POSTs '
+        'concurrently at a running server, then report throughput, latency percentiles and errors.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', default='http://127.0.0.1:8000', help='Base URL of the running server')
+        parser.add_argument('--employees', type=int, default=200, help='Number of employees checking in')
+        parser.add_argument('--repeat', type=int, default=2,
+                            help='Concurrent POSTs per employee (double clicks, client retries)')
+        parser.add_argument('--concurrency', type=int, default=50, help='Client threads')
+        parser.add_argument('--checkout', action='store_true', help='Also replay the checkout storm afterwards')
+        parser.add_argument('--keep', action='store_true',
+                            help="Keep today's attendance rows instead of deleting them before the run")
+        parser.add_argument('--output', help='Write the report as JSON to this file')
+
+    def handle(self, *args, **options):
+        employees = list(
+            Employee.objects.filter(employee_id__startswith=BENCH_ID_PREFIX, is_superuser=False)
+            .order_by('employee_id')[:options['employees']]
+        )
+        if not employees:
+            raise CommandError('No benchmark employees found; run seed_benchmark_data first.')
+
+        today = date.today()
+        if not options['keep']:
+            Attendance.objects.filter(employee__in=employees, date=today).delete()
+
+        sessions = [self.login(employee) for employee in employees]
+        report = {'employees': len(employees), 'repeat': options['repeat'], 'concurrency': options['concurrency']}
+
+        report['check_in'] = self.storm(options, sessions, reverse('mark_attendance'))
+        checked_in = Attendance.objects.filter(
+            employee__in=employees, date=today, check_in_time__isnull=False
+        ).count()
+        report['check_in']['rows_checked_in'] = checked_in
+        self.print_phase('check-in', report['check_in'])
+
+        if options['checkout']:
+            report['checkout'] = self.storm(options, sessions, reverse('checkout_attendance'))
+            report['checkout']['rows_checked_out'] = Attendance.objects.filter(
+                employee__in=employees, date=today, check_out_time__isnull=False
+            ).count()
+            self.print_phase('checkout', report['checkout'])
+
+        if options['output']:
+            with open(options['output'], 'w') as output:
+                json.dump(report, output, indent=2)
+
+    def login(self, employee):
+        """Session and CSRF cookies for an employee, created without going through the login form"""
+        client = Client()
+        client.force_login(employee)
+        csrf_secret = get_random_string(CSRF_SECRET_LENGTH)
+        return {
+            'cookies': {
+                settings.SESSION_COOKIE_NAME: client.cookies[settings.SESSION_COOKIE_NAME].value,
+                settings.CSRF_COOKIE_NAME: csrf_secret,
+            },
+            'headers': {'X-CSRFToken': csrf_secret},
+        }
+
+    def storm(self, options, sessions, path):
+        url = options['url'].rstrip('/') + path
+        jobs = [session for session in sessions for _ in range(options['repeat'])]
+
+        def post(session):
+            start = time.perf_counter()
+            try:
+                response = requests.post(
+                    url, cookies=session['cookies'], headers=session['headers'], allow_redirects=False, timeout=60,
+                )
+                status = response.status_code
+            except requests.RequestException:
+                status = 0
+            return status, (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options['concurrency']) as executor:
+            outcomes = list(executor.map(post, jobs))
+        elapsed = time.perf_counter() - start
+
+        latencies = [latency for _, latency in outcomes]
+        statuses = {}
+        errors = 0
+        for status, _ in outcomes:
+            statuses[str(status)] = statuses.get(str(status), 0) + 1
+            # 0 means the request never got a response
+            errors += status == 0 or status >= 500
+        return {
+            'requests': len(jobs),
+            'seconds': round(elapsed, 3),
+            'throughput_rps': round(len(jobs) / elapsed, 1),
+            'p50_ms': round(percentile(latencies, 50), 1),
+            'p99_ms': round(percentile(latencies, 99), 1),
+            'mean_ms': round(statistics.fmean(latencies), 1),
+            'statuses': statuses,
+            'errors': errors,
+        }
+
+    def print_phase(self, name, result):
+        line = (
+            f"{name:9} {result['requests']} requests in {result['seconds']}s "
+            f"({result['throughput_rps']} req/s)  p50 {result['p50_ms']}ms  p99 {result['p99_ms']}ms  "
+            f"statuses {result['statuses']}"
+        )
+        self.stdout.write(self.style.ERROR(line) if result['errors'] else line)
@@ -0,0 +1,71 @@
+"""
+Report per-module import time for a cold django.setup()
+"""
+
+import os
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Boot sequence timed in a fresh interpreter; the URLconf import is what a
+# worker does before it can answer its first request
+SETUP_SCRIPT = 'import django; django.setup()'
+URLCONF_SCRIPT = 'from django.urls import get_resolver; get_resolver().url_patterns'
+
+
+def parse_importtime(output):
+    """Parse ``python -X importtime`` output into (module, self µs, cumulative µs, depth) rows"""
+    rows = []
+    for line in output.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|', 2)
+        if not self_us.strip().isdigit():
+            # Column header
+            continue
+        # Nested imports are indented by two spaces per level under the importer
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        rows.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return rows
+
+
+class Command(BaseCommand):
+    help = (
+        'Boot Django in a fresh interpreter under "python -X importtime" and report the slowest '
+        'module imports, so cold-start regressions show up before they reach the workers.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=25, help='Number of modules to list')
+        parser.add_argument('--sort', choices=['cumulative', 'self'], default='cumulative',
+                            help='Rank by time including (cumulative) or excluding (self) sub-imports')
+        parser.add_argument('--prefix', action='append', default=[],
+                            help='Only list modules starting with this prefix; may be repeated')
+        parser.add_argument('--setup-only', action='store_true',
+                            help='Time django.setup() alone, without importing the URLconf and views')
+
+    def handle(self, *args, **options):
+        script = SETUP_SCRIPT if options['setup_only'] else f'{SETUP_SCRIPT}; {URLCONF_SCRIPT}'
+        env = {**os.environ, 'DJANGO_SETTINGS_MODULE': os.environ.get('DJANGO_SETTINGS_MODULE', 'Sterp_Portal.settings')}
+        completed = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', script],
+            cwd=settings.BASE_DIR, env=env, capture_output=True, text=True,
+        )
+        if completed.returncode:
+            raise CommandError(f'Django failed to start:\n{completed.stderr[-2000:]}')
+
+        rows = parse_importtime(completed.stderr)
+        total_us = sum(cumulative for _, _, cumulative, depth in rows if depth == 0)
+        listed = [row for row in rows if not options['prefix'] or row[0].startswith(tuple(options['prefix']))]
+        key = 2 if options['sort'] == 'cumulative' else 1
+        listed.sort(key=lambda row: row[key], reverse=True)
+
+        self.stdout.write(f"{'module':60} {'self ms':>9} {'cumul. ms':>10}")
+        for name, self_us, cumulative_us, _ in listed[:options['limit']]:
+            self.stdout.write(f'{name:60} {self_us / 1000:9.1f} {cumulative_us / 1000:10.1f}')
+        self.stdout.write(self.style.SUCCESS(
+            f'\n{len(rows)} modules imported in {total_us / 1000:.1f}ms '
+            f"({'django.setup()' if options['setup_only'] else 'django.setup() and URLconf'})"
+        ))
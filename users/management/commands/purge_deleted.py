@@ -0,0 +1,41 @@
+"""
+Purge soft-deleted employees and projects
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from users.purge_utils import PURGE_BATCH_SIZE, purge_deleted
+
+
+class Command(BaseCommand):
+    help = (
+        'Remove soft-deleted employees and projects: clean up their Google Calendar events, '
+        'then delete their data in batches. Runs until interrupted, or exits after one pass '
+        'with --once (e.g. from cron). Run a single worker.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=PURGE_BATCH_SIZE, help='Rows per DELETE')
+        parser.add_argument('--interval', type=float, default=30.0,
+                            help='Seconds to wait between passes')
+        parser.add_argument('--once', action='store_true', help='Exit after one pass')
+
+    def handle(self, *args, **options):
+        total_purged = total_failed = 0
+        try:
+            while True:
+                close_old_connections()
+                purged, failed = purge_deleted(options['batch_size'])
+                total_purged += purged
+                total_failed += failed
+                if purged or failed:
+                    self.stdout.write(f'Pass: {purged} purged, {failed} failed')
+                if options['once']:
+                    break
+                time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            pass
+        self.stdout.write(self.style.SUCCESS(f'Purge worker finished: {total_purged} purged, {total_failed} failed'))
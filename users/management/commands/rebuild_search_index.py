@@ -0,0 +1,44 @@
+"""
+Rebuild the full-text search index from scratch
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from users.models import LeaveApplication, Project, SearchEntry, Task
+from users.search_utils import index_objects
+
+
+class Command(BaseCommand):
+    help = (
+        'Recreate the SearchEntry for every task, project and leave application. '
+        'Saves keep the index current; run this after deploying search or restoring data.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help='Rows indexed per transaction')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        start = time.perf_counter()
+        SearchEntry.objects.all().delete()
+        sources = [
+            Task.objects.all(),
+            Project.objects.all(),
+            LeaveApplication.objects.select_related('leave_type'),
+        ]
+        total = 0
+        for queryset in sources:
+            batch = []
+            for instance in queryset.order_by('pk').iterator(chunk_size=batch_size):
+                batch.append(instance)
+                if len(batch) == batch_size:
+                    with transaction.atomic():
+                        total += index_objects(batch)
+                    batch = []
+            if batch:
+                with transaction.atomic():
+                    total += index_objects(batch)
+        self.stdout.write(self.style.SUCCESS(f'Indexed {total} entries in {time.perf_counter() - start:.2f}s'))
@@ -0,0 +1,216 @@
+"""
+Benchmark every named route in users/urls.py as admin and as employee
+"""
+
+import json
+import statistics
+import subprocess
+import time
+from datetime import date, datetime
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from users.availability_utils import AVAILABILITY_CACHE_NAMESPACE
+from users.business_day_utils import is_working_day
+from users.cache_utils import bump_cache_version, entity_cache_namespace
+from users.models import Employee, Project, ProjectCollaborator, Task, LeaveApplication, Attendance
+from users.urls import urlpatterns
+from .seed_benchmark_data import BENCH_ADMIN_USERNAME, BENCH_ID_PREFIX
+
+# Routes that change data, log out or call external services when requested
+SKIPPED_ROUTE_WORDS = ('delete', 'approve', 'reject', 'cancel', 'complete', 'mark', 'checkout', 'logout',
+                       'google_calendar')
+# GET routes that create today's missing attendance rows on their first request
+ATTENDANCE_WRITING_ROUTES = ('employee_attendance_dashboard', 'admin_attendance_today')
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+class Command(BaseCommand):
+    help = (
+        'Request every read-only named route as admin and as employee and record latency percentiles, '
+        'query counts and response sizes to JSON. Run after seed_benchmark_data.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=20, help='Measured requests per route and role')
+        parser.add_argument('--warmup', type=int, default=2, help='Unmeasured requests per route and role')
+        parser.add_argument('--output', default='benchmark-results.json', help='Where to write the JSON results')
+        parser.add_argument('--compare', help='Earlier results file to print a comparison against')
+        parser.add_argument('--cold-cache', action='store_true', help='Clear the cache before every request')
+        parser.add_argument('--host', default='localhost', help='Host header sent with every request')
+        parser.add_argument('--routes', nargs='*', help='Only benchmark these URL names')
+
+    def handle(self, *args, **options):
+        admin = Employee.objects.filter(username=BENCH_ADMIN_USERNAME).first()
+        employee = (
+            Employee.objects.filter(employee_id__startswith=BENCH_ID_PREFIX, is_superuser=False)
+            .order_by('employee_id').first()
+        )
+        if admin is None or employee is None:
+            raise CommandError('No benchmark users found; run seed_benchmark_data first.')
+
+        roles = {'admin': admin, 'employee': employee}
+        self.seed_todays_attendance()
+        samples = self.sample_arguments(employee)
+        results = []
+
+        for pattern in urlpatterns:
+            name = pattern.name
+            if not name or any(word in name for word in SKIPPED_ROUTE_WORDS):
+                continue
+            if options['routes'] and name not in options['routes']:
+                continue
+            kwargs = {key: samples(name, key) for key in pattern.pattern.converters}
+            if None in kwargs.values():
+                self.stdout.write(self.style.WARNING(f'Skipping {name}: no sample object'))
+                continue
+            url = reverse(name, kwargs=kwargs)
+
+            for role, user in roles.items():
+                client = Client(HTTP_HOST=options['host'])
+                client.force_login(user)
+                results.append(self.measure(client, name, role, url, options))
+
+        report = {
+            'commit': self.current_commit(),
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'database': settings.DATABASES['default']['ENGINE'],
+            'iterations': options['iterations'],
+            'cold_cache': options['cold_cache'],
+            'rows': {
+                'employees': Employee.objects.count(),
+                'tasks': Task.objects.count(),
+                'leave_applications': LeaveApplication.objects.count(),
+                'attendance': Attendance.objects.count(),
+            },
+            'results': results,
+        }
+        with open(options['output'], 'w') as output:
+            json.dump(report, output, indent=2)
+        self.stdout.write(self.style.SUCCESS(f"Wrote {len(results)} results to {options['output']}"))
+
+        if options['compare']:
+            self.compare(options['compare'], results)
+
+    def seed_todays_attendance(self):
+        """
+        Create the ABSENT rows the attendance dashboards would insert on their
+        first request today, so every measured request takes the same read path.
+        Only benchmark employees are touched, and only on working days.
+        """
+        today = date.today()
+        if not is_working_day(today):
+            return
+        existing = Attendance.objects.filter(date=today).values_list('employee_id', flat=True)
+        missing = (
+            Employee.objects.filter(employee_id__startswith=BENCH_ID_PREFIX, is_superuser=False)
+            .exclude(pk__in=existing)
+            .values_list('pk', flat=True)
+        )
+        created = Attendance.objects.bulk_create(
+            [Attendance(employee_id=pk, date=today, status='ABSENT') for pk in missing],
+            ignore_conflicts=True,
+        )
+        if created:
+            # bulk_create sends no post_save, which is what normally does this
+            bump_cache_version(entity_cache_namespace(Attendance))
+            bump_cache_version(AVAILABILITY_CACHE_NAMESPACE)
+            self.stdout.write(
+                f"Seeded {len(created)} attendance rows for {today} read by {', '.join(ATTENDANCE_WRITING_ROUTES)}"
+            )
+
+    def sample_arguments(self, employee):
+        """Resolve URL kwargs to benchmark objects, preferring ones the employee can see"""
+        own_project = (
+            ProjectCollaborator.objects.filter(employee=employee).values_list('project_id', flat=True).first()
+        )
+        samples = {
+            'project': own_project or Project.objects.values_list('pk', flat=True).first(),
+            'task': Task.objects.filter(employee=employee).values_list('pk', flat=True).first(),
+            'leave': LeaveApplication.objects.filter(employee=employee).values_list('pk', flat=True).first(),
+            'employee': employee.pk,
+        }
+
+        def resolve(name, key):
+            if key in ('employee_id', 'project_id'):
+                return samples[key[:-3]]
+            for kind in ('project', 'task', 'leave'):
+                if kind in name:
+                    return samples[kind]
+            return samples['employee']
+        return resolve
+
+    def measure(self, client, name, role, url, options):
+        for _ in range(options['warmup']):
+            client.get(url)
+
+        latencies, query_counts, sizes, statuses = [], [], [], set()
+        for _ in range(options['iterations']):
+            if options['cold_cache']:
+                cache.clear()
+            with CaptureQueriesContext(connection) as queries:
+                start = time.perf_counter()
+                response = client.get(url)
+                latencies.append((time.perf_counter() - start) * 1000)
+            query_counts.append(len(queries))
+            sizes.append(len(response.content))
+            statuses.add(response.status_code)
+
+        result = {
+            'route': name,
+            'role': role,
+            'url': url,
+            'status': sorted(statuses),
+            'p50_ms': round(percentile(latencies, 50), 2),
+            'p90_ms': round(percentile(latencies, 90), 2),
+            'p99_ms': round(percentile(latencies, 99), 2),
+            'max_ms': round(max(latencies), 2),
+            'mean_ms': round(statistics.fmean(latencies), 2),
+            'queries': max(query_counts),
+            'bytes': max(sizes),
+        }
+        self.stdout.write(
+            f"{name:32} {role:8} {'/'.join(map(str, result['status'])):8} "
+            f"p50 {result['p50_ms']:8.2f}ms  p99 {result['p99_ms']:8.2f}ms  "
+            f"{result['queries']:4} queries  {result['bytes']:8} bytes"
+        )
+        return result
+
+    def compare(self, path, results):
+        with open(path) as baseline_file:
+            baseline = json.load(baseline_file)
+        previous = {(row['route'], row['role']): row for row in baseline['results']}
+
+        self.stdout.write(f"\nCompared with {path} ({baseline.get('commit') or 'unknown commit'})")
+        for row in results:
+            before = previous.get((row['route'], row['role']))
+            if before is None:
+                continue
+            change = (row['p50_ms'] - before['p50_ms']) / before['p50_ms'] * 100 if before['p50_ms'] else 0.0
+            line = (
+                f"{row['route']:32} {row['role']:8} p50 {before['p50_ms']:8.2f} -> {row['p50_ms']:8.2f}ms "
+                f"({change:+6.1f}%)  queries {before['queries']:4} -> {row['queries']:4}"
+            )
+            if change > 10 or row['queries'] > before['queries']:
+                line = self.style.WARNING(line)
+            self.stdout.write(line)
+
+    def current_commit(self):
+        try:
+            return subprocess.run(
+                ['git', 'rev-parse', '--short', 'HEAD'],
+                cwd=settings.BASE_DIR, capture_output=True, text=True, check=True,
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
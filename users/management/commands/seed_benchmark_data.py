@@ -0,0 +1,286 @@
+"""
+Seed a deterministic, realistically sized organisation for benchmarking
+"""
+
+import random
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from itertools import islice
+
+from django.contrib.auth.hashers import make_password
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from users.business_day_utils import count_working_days, is_working_day
+from users.models import (
+    Employee, Project, ProjectCollaborator, Task, LeaveType, LeaveBalance, LeaveApplication, Attendance,
+)
+
+BENCH_ID_PREFIX = 'BENCH'
+BENCH_ADMIN_USERNAME = 'bench_admin'
+BENCH_PASSWORD = 'benchmark'
+
+FIRST_NAMES = ['Aarav', 'Diya', 'Ishaan', 'Meera', 'Kabir', 'Anaya', 'Rohan', 'Saanvi', 'Vihaan', 'Kiara',
+               'Arjun', 'Myra', 'Reyansh', 'Aadhya', 'Vivaan', 'Tara']
+LAST_NAMES = ['Patel', 'Shah', 'Mehta', 'Desai', 'Joshi', 'Iyer', 'Nair', 'Rao', 'Kapoor', 'Gupta', 'Reddy',
+              'Bose']
+DEFAULT_LEAVE_TYPES = [('Annual Leave', 18), ('Sick Leave', 10), ('Casual Leave', 8)]
+
+
+def batched(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+class Command(BaseCommand):
+    help = (
+        'Create a deterministic benchmark organisation (employees, projects, tasks, leave history and '
+        'attendance) using bulk inserts. Intended for benchmark databases only.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--employees', type=int, default=200, help='Number of employees')
+        parser.add_argument('--projects', type=int, default=40, help='Number of projects')
+        parser.add_argument('--collaborators', type=int, default=8, help='Collaborators per project')
+        parser.add_argument('--tasks', type=int, default=60, help='Tasks per employee')
+        parser.add_argument('--years', type=int, default=2, help='Years of attendance and leave history')
+        parser.add_argument('--leaves', type=int, default=6, help='Leave applications per employee per year')
+        parser.add_argument('--seed', type=int, default=42, help='Random seed; equal seeds produce equal data')
+        parser.add_argument('--batch-size', type=int, default=5000, help='Rows per bulk insert')
+        parser.add_argument('--flush', action='store_true', help='Delete previously seeded benchmark data first')
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(options['seed'])
+        self.batch_size = options['batch_size']
+        self.today = date.today()
+        self.history_start = date(self.today.year - options['years'] + 1, 1, 1)
+        self.tz = timezone.get_current_timezone()
+
+        if options['flush']:
+            self.flush()
+        elif Employee.objects.filter(employee_id__startswith=BENCH_ID_PREFIX).exists():
+            raise CommandError('Benchmark data already exists; pass --flush to recreate it.')
+
+        with transaction.atomic():
+            admin = self.create_admin()
+            leave_types = self.ensure_leave_types()
+            employees = self.create_employees(options['employees'])
+            projects = self.create_projects(admin, options['projects'], employees, options['collaborators'])
+            self.create_tasks(admin, employees, projects, options['tasks'])
+            self.create_leave_balances(employees, leave_types)
+            approved = self.create_leave_applications(admin, employees, leave_types, options['leaves'])
+        # Attendance is the bulk of the data; commit it batch by batch
+        self.create_attendance(employees, approved)
+
+        # Bulk inserts bypass the signals that bump cache versions
+        cache.clear()
+        self.stdout.write(self.style.SUCCESS(
+            f'Benchmark data ready. Log in as {BENCH_ADMIN_USERNAME} or {employees[0].username} '
+            f'with password "{BENCH_PASSWORD}".'
+        ))
+
+    def flush(self):
+        deleted, _ = Employee.objects.filter(employee_id__startswith=BENCH_ID_PREFIX).delete()
+        Employee.objects.filter(username=BENCH_ADMIN_USERNAME).delete()
+        self.stdout.write(f'Removed {deleted} existing benchmark rows')
+
+    def create_admin(self):
+        admin, _ = Employee.objects.get_or_create(
+            username=BENCH_ADMIN_USERNAME,
+            defaults={
+                'employee_id': f'{BENCH_ID_PREFIX}ADMIN',
+                'first_name': 'Benchmark',
+                'last_name': 'Admin',
+                'email': 'bench-admin@example.com',
+                'is_staff': True,
+                'is_superuser': True,
+                'password': make_password(BENCH_PASSWORD),
+            },
+        )
+        return admin
+
+    def ensure_leave_types(self):
+        for name, default_days in DEFAULT_LEAVE_TYPES:
+            LeaveType.objects.get_or_create(name=name, defaults={'default_days': default_days})
+        return list(LeaveType.objects.all())
+
+    def create_employees(self, count):
+        # Hash once; every benchmark account shares the same password
+        password = make_password(BENCH_PASSWORD)
+        departments = [code for code, _ in Employee.DEPARTMENT_CHOICES]
+        employees = []
+        for number in range(1, count + 1):
+            employee_id = f'{BENCH_ID_PREFIX}{number:06d}'
+            employees.append(Employee(
+                username=employee_id,
+                employee_id=employee_id,
+                first_name=self.rng.choice(FIRST_NAMES),
+                last_name=self.rng.choice(LAST_NAMES),
+                email=f'{employee_id.lower()}@example.com',
+                password=password,
+                department=self.rng.choice(departments),
+                position=self.rng.choice(['Engineer', 'Analyst', 'Associate', 'Lead', 'Manager']),
+                monthly_salary=Decimal(self.rng.randrange(30000, 200000, 500)),
+                date_of_birth=date(self.rng.randint(1970, 2002), self.rng.randint(1, 12), self.rng.randint(1, 28)),
+            ))
+        employees = Employee.objects.bulk_create(employees, batch_size=self.batch_size)
+        self.stdout.write(f'Created {len(employees)} employees')
+        return employees
+
+    def create_projects(self, admin, count, employees, collaborators_per_project):
+        statuses = [code for code, _ in Project.STATUS_CHOICES]
+        priorities = [code for code, _ in Project.PRIORITY_CHOICES]
+        projects = []
+        for number in range(1, count + 1):
+            start = self.history_start + timedelta(days=self.rng.randint(0, (self.today - self.history_start).days))
+            projects.append(Project(
+                name=f'Benchmark Project {number:04d}',
+                description='Seeded for benchmarking',
+                status=self.rng.choice(statuses),
+                priority=self.rng.choice(priorities),
+                start_date=start,
+                end_date=start + timedelta(days=self.rng.randint(30, 365)),
+                created_by=admin,
+            ))
+        projects = Project.objects.bulk_create(projects, batch_size=self.batch_size)
+
+        collaborators = []
+        for project in projects:
+            members = self.rng.sample(employees, min(collaborators_per_project, len(employees)))
+            for index, employee in enumerate(members):
+                collaborators.append(ProjectCollaborator(
+                    project=project, employee=employee, role='LEAD' if index == 0 else 'MEMBER',
+                ))
+        ProjectCollaborator.objects.bulk_create(collaborators, batch_size=self.batch_size)
+        self.stdout.write(f'Created {len(projects)} projects with {len(collaborators)} collaborators')
+        return projects
+
+    def create_tasks(self, admin, employees, projects, tasks_per_employee):
+        priorities = [code for code, _ in Task.PRIORITY_CHOICES]
+        span = (self.today - self.history_start).days + 60
+
+        def generate():
+            for employee in employees:
+                for number in range(tasks_per_employee):
+                    due = self.history_start + timedelta(days=self.rng.randint(0, span))
+                    completed = due < self.today and self.rng.random() < 0.8
+                    yield Task(
+                        name=f'Task {number + 1} for {employee.employee_id}',
+                        description='Seeded for benchmarking',
+                        employee=employee,
+                        project=self.rng.choice(projects) if projects and self.rng.random() < 0.7 else None,
+                        date=due,
+                        priority=self.rng.choice(priorities),
+                        status='COMPLETED' if completed else 'PENDING',
+                        created_by=admin,
+                        completed_at=datetime.combine(due, time(17, 0), tzinfo=self.tz) if completed else None,
+                    )
+
+        total = 0
+        for batch in batched(generate(), self.batch_size):
+            Task.objects.bulk_create(batch)
+            total += len(batch)
+        self.stdout.write(f'Created {total} tasks')
+
+    def create_leave_balances(self, employees, leave_types):
+        balances = [
+            LeaveBalance(
+                employee=employee,
+                leave_type=leave_type,
+                year=year,
+                total_days=leave_type.default_days,
+                used_days=0,
+                remaining_days=leave_type.default_days,
+            )
+            for employee in employees
+            for leave_type in leave_types
+            for year in range(self.history_start.year, self.today.year + 1)
+        ]
+        LeaveBalance.objects.bulk_create(balances, batch_size=self.batch_size, ignore_conflicts=True)
+        self.stdout.write(f'Created {len(balances)} leave balances')
+
+    def create_leave_applications(self, admin, employees, leave_types, per_year):
+        """Create leave history; returns {employee pk: set of approved leave dates}"""
+        approved_days = {}
+        applications = []
+        years = range(self.history_start.year, self.today.year + 1)
+        for employee in employees:
+            for year in years:
+                for _ in range(per_year):
+                    start = date(year, 1, 1) + timedelta(days=self.rng.randint(0, 360))
+                    end = start + timedelta(days=self.rng.randint(0, 3))
+                    total_days = count_working_days(start, end)
+                    if not total_days:
+                        continue
+                    status = 'PENDING' if start > self.today else self.rng.choice(
+                        ['APPROVED', 'APPROVED', 'APPROVED', 'REJECTED']
+                    )
+                    reviewed = status != 'PENDING'
+                    applications.append(LeaveApplication(
+                        employee=employee,
+                        leave_type=self.rng.choice(leave_types),
+                        start_date=start,
+                        end_date=end,
+                        total_days=total_days,
+                        reason='Seeded for benchmarking',
+                        status=status,
+                        reviewed_by=admin if reviewed else None,
+                        reviewed_at=datetime.combine(start, time(10, 0), tzinfo=self.tz) if reviewed else None,
+                    ))
+                    if status == 'APPROVED':
+                        days = approved_days.setdefault(employee.pk, set())
+                        days.update(start + timedelta(days=offset) for offset in range((end - start).days + 1))
+        LeaveApplication.objects.bulk_create(applications, batch_size=self.batch_size)
+        self.stdout.write(f'Created {len(applications)} leave applications')
+        return approved_days
+
+    def create_attendance(self, employees, approved_days):
+        working_days = []
+        day = self.history_start
+        while day < self.today:
+            if is_working_day(day):
+                working_days.append(day)
+            day += timedelta(days=1)
+
+        def generate():
+            for employee in employees:
+                on_leave = approved_days.get(employee.pk, ())
+                for day in working_days:
+                    if day in on_leave:
+                        yield Attendance(employee=employee, date=day, status='ON_LEAVE')
+                        continue
+                    roll = self.rng.random()
+                    if roll < 0.04:
+                        yield Attendance(employee=employee, date=day, status='ABSENT')
+                        continue
+                    check_in = datetime.combine(day, time(8, 30), tzinfo=self.tz) + timedelta(
+                        minutes=self.rng.randint(0, 75)
+                    )
+                    hours = self.rng.uniform(3.0, 9.5)
+                    check_out = check_in + timedelta(hours=hours)
+                    if hours < 4.0:
+                        status = 'HALF_DAY'
+                    elif check_in.time() > time(9, 15):
+                        status = 'LATE'
+                    else:
+                        status = 'PRESENT'
+                    yield Attendance(
+                        employee=employee,
+                        date=day,
+                        check_in_time=check_in,
+                        check_out_time=check_out,
+                        status=status,
+                        work_hours=Decimal(f'{hours:.2f}'),
+                    )
+
+        total = 0
+        for number, batch in enumerate(batched(generate(), self.batch_size), start=1):
+            with transaction.atomic():
+                Attendance.objects.bulk_create(batch)
+            total += len(batch)
+            if number % 20 == 0:
+                self.stdout.write(f'  ... {total} attendance rows')
+        self.stdout.write(f'Created {total} attendance rows')
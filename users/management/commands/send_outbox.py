@@ -0,0 +1,41 @@
+"""
+Deliver queued email from the EmailOutbox
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from users.email_utils import OUTBOX_BATCH_SIZE, send_outbox_batch
+
+
+class Command(BaseCommand):
+    help = (
+        'Send due EmailOutbox messages in batches, each batch over a single mail server connection. '
+        'Runs until interrupted, or drains the outbox and exits with --once (e.g. from cron).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=OUTBOX_BATCH_SIZE, help='Messages per connection')
+        parser.add_argument('--interval', type=float, default=5.0,
+                            help='Seconds to wait before polling again when nothing is due')
+        parser.add_argument('--once', action='store_true', help='Exit once no messages are due')
+
+    def handle(self, *args, **options):
+        total_sent = total_failed = 0
+        try:
+            while True:
+                close_old_connections()
+                sent, failed = send_outbox_batch(options['batch_size'])
+                total_sent += sent
+                total_failed += failed
+                if sent or failed:
+                    self.stdout.write(f'Batch: {sent} sent, {failed} failed')
+                    continue
+                if options['once']:
+                    break
+                time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            pass
+        self.stdout.write(self.style.SUCCESS(f'Outbox worker finished: {total_sent} sent, {total_failed} failed'))
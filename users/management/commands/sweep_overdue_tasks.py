@@ -0,0 +1,29 @@
+"""
+Flag newly overdue tasks and queue the overdue digests
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from users.overdue_utils import OVERDUE_SWEEP_BATCH_SIZE, sweep_overdue_tasks
+
+
+class Command(BaseCommand):
+    help = (
+        'Mark pending tasks whose due date has passed as overdue and queue one digest email per '
+        'assignee and per admin for the tasks that turned overdue. Schedule it once a day shortly '
+        'after midnight (e.g. from cron) with the send_outbox worker delivering the digests; it is '
+        'safe to re-run, and dashboards count unflagged past-due tasks until it has run.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=OVERDUE_SWEEP_BATCH_SIZE, help='Rows per UPDATE')
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        flagged, cleared, digests = sweep_overdue_tasks(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Flagged {flagged} overdue tasks, cleared {cleared} and queued {digests} digests '
+            f'in {time.perf_counter() - start:.2f}s'
+        ))
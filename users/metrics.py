@@ -0,0 +1,120 @@
+"""
+Prometheus metrics for portal internals
+
+Metrics live in the prometheus_client default registry, which is thread-safe.
+When PROMETHEUS_MULTIPROC_DIR is set (before the workers start), every worker
+process writes its samples there and ``render_metrics`` aggregates them, so
+a scrape sees the whole server rather than whichever worker answered.
+"""
+
+import os
+import time
+import logging
+from functools import wraps
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Histogram, generate_latest, multiprocess,
+)
+from prometheus_client.core import GaugeMetricFamily
+
+logger = logging.getLogger(__name__)
+
+VIEW_LATENCY = Histogram(
+    'sterp_view_latency_seconds', 'Time spent handling a request, by view',
+    ['view', 'method'],
+)
+VIEW_QUERIES = Histogram(
+    'sterp_view_db_queries', 'Database queries run while handling a request, by view',
+    ['view'], buckets=(0, 1, 2, 5, 10, 20, 50, 100, 250, 500),
+)
+VIEW_RESPONSES = Counter(
+    'sterp_view_responses_total', 'Responses by view and status class',
+    ['view', 'status'],
+)
+GOOGLE_CALENDAR_LATENCY = Histogram(
+    'sterp_google_calendar_call_seconds', 'GoogleCalendarService call latency, by operation',
+    ['operation'],
+)
+GOOGLE_CALENDAR_ERRORS = Counter(
+    'sterp_google_calendar_errors_total', 'Failed GoogleCalendarService calls, by operation',
+    ['operation'],
+)
+EMAILS_SENT = Counter(
+    'sterp_emails_total', 'Outbox delivery attempts, by outcome (sent, retry or failed)',
+    ['outcome'],
+)
+CACHE_LOOKUPS = Counter(
+    'sterp_cache_lookups_total', 'Application cache lookups, by cache and result (hit or miss)',
+    ['cache', 'result'],
+)
+
+
+def record_cache_lookup(name, hit):
+    CACHE_LOOKUPS.labels(cache=name, result='hit' if hit else 'miss').inc()
+
+
+def observe_google_call(operation):
+    """
+    Time a GoogleCalendarService call. The service reports failures as
+    ``(False, message)`` rather than raising, so those count as errors too.
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            failed = True
+            try:
+                result = func(*args, **kwargs)
+                failed = isinstance(result, tuple) and bool(result) and result[0] is False
+                return result
+            finally:
+                GOOGLE_CALENDAR_LATENCY.labels(operation=operation).observe(time.perf_counter() - start)
+                if failed:
+                    GOOGLE_CALENDAR_ERRORS.labels(operation=operation).inc()
+        return wrapper
+    return decorator
+
+
+class OutboxCollector:
+    """
+    Email outbox depth, read from the database at scrape time so every
+    worker process reports the same value
+    """
+
+    def describe(self):
+        # Lets the registry check metric names without querying the database
+        return self._families()
+
+    def collect(self):
+        from django.db.models import Count, Min
+        from django.utils import timezone
+        from .models import EmailOutbox
+
+        messages, oldest = self._families()
+        counts = dict(EmailOutbox.objects.values_list('status').annotate(Count('id')).order_by())
+        for status, _ in EmailOutbox.STATUS_CHOICES:
+            messages.add_metric([status], counts.get(status, 0))
+        first_pending = EmailOutbox.objects.filter(status='PENDING').aggregate(Min('created_at'))['created_at__min']
+        oldest.add_metric([], (timezone.now() - first_pending).total_seconds() if first_pending else 0)
+        return [messages, oldest]
+
+    def _families(self):
+        return [
+            GaugeMetricFamily('sterp_email_outbox_messages', 'Email outbox messages, by status', labels=['status']),
+            GaugeMetricFamily('sterp_email_outbox_oldest_pending_seconds', 'Age of the oldest undelivered message'),
+        ]
+
+
+OUTBOX_COLLECTOR = OutboxCollector()
+REGISTRY.register(OUTBOX_COLLECTOR)
+
+
+def render_metrics():
+    """Return (body, content type) in the Prometheus text exposition format"""
+    if 'PROMETHEUS_MULTIPROC_DIR' in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        registry.register(OUTBOX_COLLECTOR)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
@@ -0,0 +1,241 @@
+"""
+Request middleware
+"""
+
+import os
+import sys
+import time
+import logging
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import partial
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+from .db_routers import pin_to_primary, replica_available
+from .metrics import VIEW_LATENCY, VIEW_QUERIES, VIEW_RESPONSES
+
+logger = logging.getLogger(__name__)
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS', 'TRACE')
+
+
+# Query hooks of the request being served. sync_to_async and run_outbound copy
+# the context into their worker threads, so queries an async view runs there
+# reach the same hooks as queries on the request thread.
+_query_hooks = ContextVar('query_hooks', default=())
+
+
+class QueryBudgetExceeded(Exception):
+    """Raised in strict mode when a request runs more queries than its budget"""
+
+
+def _dispatch_query(execute, sql, params, many, context):
+    call = execute
+    for hook in _query_hooks.get():
+        call = partial(hook, call)
+    return call(sql, params, many, context)
+
+
+def install_query_dispatch(sender, connection, **kwargs):
+    """
+    ``connection_created`` receiver: route the queries of every connection,
+    in whichever thread it lives, through the current context's query hooks
+    """
+    if _dispatch_query not in connection.execute_wrappers:
+        # First, so execute_wrapper() blocks that pop their own hook on exit leave it in place
+        connection.execute_wrappers.insert(0, _dispatch_query)
+
+
+@contextmanager
+def recording_queries(hook):
+    """Pass every query run in this context, in any thread, to ``hook``"""
+    token = _query_hooks.set(_query_hooks.get() + (hook,))
+    try:
+        yield hook
+    finally:
+        _query_hooks.reset(token)
+
+
+class AsyncCapableMiddleware:
+    """
+    Base for middleware that runs natively in both modes: under ASGI the
+    chain stays async, so async views are not adapted back onto a thread.
+    Subclasses implement ``__call__`` for WSGI and ``__acall__`` for ASGI.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return self.handle(request)
+
+
+class PrimaryPinMiddleware(AsyncCapableMiddleware):
+    """
+    Pin users to the primary database for a short window after any request
+    that may have written, so replica-routed views show their own changes.
+    """
+
+    @staticmethod
+    def _may_have_written(request):
+        return hasattr(request, 'user') and request.method not in SAFE_METHODS and replica_available()
+
+    def handle(self, request):
+        response = self.get_response(request)
+        if self._may_have_written(request):
+            pin_to_primary(request.user)
+        return response
+
+    async def __acall__(self, request):
+        response = await self.get_response(request)
+        if self._may_have_written(request):
+            # request.user is lazy and would load the user synchronously
+            await sync_to_async(pin_to_primary)(await request.auser())
+        return response
+
+
+class QueryRecorder:
+    """
+    Query hook that records every query with its duration and the innermost
+    project frame that issued it. Thread-safe, as the queries of one async
+    request can run in several worker threads at once.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.by_call_site = defaultdict(int)
+        self._base_dir = str(settings.BASE_DIR)
+        self._lock = threading.Lock()
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = time.perf_counter() - start
+            call_site = self._call_site()
+            with self._lock:
+                self.duration += duration
+                self.count += 1
+                # SQL still holds placeholders, so repeats differing only in
+                # parameters from one call site collapse onto the same key
+                self.by_call_site[(call_site, sql)] += 1
+
+    def _call_site(self):
+        # Walking frame objects costs a few attribute reads per frame, where
+        # traceback.extract_stack() would build and format the whole stack
+        frame = sys._getframe(1)
+        while frame is not None:
+            filename = frame.f_code.co_filename
+            if (filename.startswith(self._base_dir) and filename != __file__
+                    and f'{os.sep}site-packages{os.sep}' not in filename):
+                return filename, frame.f_lineno
+            frame = frame.f_back
+        return None
+
+    def repeated_queries(self, threshold):
+        """(call site, sql, count) for statements run ``threshold`` or more times"""
+        return [
+            (f'{os.path.relpath(call_site[0], self._base_dir)}:{call_site[1]}' if call_site else 'unknown', sql, count)
+            for (call_site, sql), count in self.by_call_site.items()
+            if count >= threshold
+        ]
+
+
+class QueryBudgetMiddleware(AsyncCapableMiddleware):
+    """
+    Development and CI aid: counts queries and database time per request,
+    reports repeated statements from one call site (N+1 patterns) and flags
+    requests over the budget set for their URL name in ``QUERY_BUDGETS``.
+    Results are added as ``X-DB-Queries`` / ``Server-Timing`` headers.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'QUERY_BUDGET_ENABLED', False):
+            raise MiddlewareNotUsed
+        super().__init__(get_response)
+
+    def handle(self, request):
+        with recording_queries(QueryRecorder()) as recorder:
+            response = self.get_response(request)
+        return self._report(request, response, recorder)
+
+    async def __acall__(self, request):
+        with recording_queries(QueryRecorder()) as recorder:
+            response = await self.get_response(request)
+        return self._report(request, response, recorder)
+
+    def _report(self, request, response, recorder):
+        match = getattr(request, 'resolver_match', None)
+        url_name = match.url_name if match else None
+        budget = settings.QUERY_BUDGETS.get(url_name, settings.QUERY_BUDGET_DEFAULT)
+        repeated = recorder.repeated_queries(settings.QUERY_BUDGET_N_PLUS_ONE_THRESHOLD)
+        duration_ms = recorder.duration * 1000
+
+        response['X-DB-Queries'] = str(recorder.count)
+        response['X-DB-Time-Ms'] = f'{duration_ms:.1f}'
+        response['X-DB-Repeated-Queries'] = str(len(repeated))
+        response['Server-Timing'] = f'db;dur={duration_ms:.1f};desc="{recorder.count} queries"'
+
+        for call_site, sql, count in repeated:
+            logger.warning(f"Possible N+1 in {request.path} ({url_name}): {count}x from {call_site}: {sql[:200]}")
+
+        if recorder.count > budget:
+            message = f"{request.path} ({url_name}) ran {recorder.count} queries, budget is {budget}"
+            if settings.QUERY_BUDGET_RAISE:
+                raise QueryBudgetExceeded(message)
+            logger.warning(message)
+
+        return response
+
+
+class _QueryCounter:
+    """Minimal query hook that only counts queries, from any thread"""
+
+    def __init__(self):
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, execute, sql, params, many, context):
+        with self._lock:
+            self.count += 1
+        return execute(sql, params, many, context)
+
+
+class MetricsMiddleware(AsyncCapableMiddleware):
+    """
+    Record per-view latency, query counts and response status classes for
+    the Prometheus ``/metrics`` endpoint
+    """
+
+    def handle(self, request):
+        start = time.perf_counter()
+        with recording_queries(_QueryCounter()) as counter:
+            response = self.get_response(request)
+        return self._observe(request, response, counter, time.perf_counter() - start)
+
+    async def __acall__(self, request):
+        start = time.perf_counter()
+        with recording_queries(_QueryCounter()) as counter:
+            response = await self.get_response(request)
+        return self._observe(request, response, counter, time.perf_counter() - start)
+
+    @staticmethod
+    def _observe(request, response, counter, duration):
+        match = getattr(request, 'resolver_match', None)
+        view = match.view_name if match else 'unresolved'
+        VIEW_LATENCY.labels(view=view, method=request.method).observe(duration)
+        VIEW_QUERIES.labels(view=view).observe(counter.count)
+        VIEW_RESPONSES.labels(view=view, status=f'{response.status_code // 100}xx').inc()
+        return response
@@ -1,10 +1,22 @@
-from django.contrib.auth.models import AbstractUser
-from django.db import models
+from django.contrib.auth.models import AbstractUser, UserManager
+from django.contrib.postgres.search import SearchVectorField
+from django.db import models, transaction, IntegrityError
+from django.db.models import Count, Exists, F, Max, OuterRef, Q, Subquery
+from django.db.models.functions import Cast, Substr, Upper
 from django.utils import timezone
-from datetime import datetime, time
+from calendar import monthrange
+from datetime import date, datetime, time, timedelta
 import random
 import string
 
+class NotDeletedManager(models.Manager):
+    """Default manager that hides soft-deleted rows waiting for the purge worker"""
+    def get_queryset(self):
+        return super().get_queryset().filter(deleted_at__isnull=True)
+
+class EmployeeManager(NotDeletedManager, UserManager):
+    pass
+
 class Employee(AbstractUser):
     DEPARTMENT_CHOICES = [
         ('IT', 'Information Technology'),
@@ -13,6 +25,9 @@ class Employee(AbstractUser):
         ('OPS', 'Operations'),
         ('SALES', 'Sales'),
     ]
+
+    EMPLOYEE_ID_PREFIX = 'STERPEMP'
+    EMPLOYEE_ID_SEQUENCE = 'employee_id'
     
     employee_id = models.CharField(max_length=20, unique=True, null=True, blank=True)  # Increased to 20 to accommodate STERPEMP001 format
     date_of_birth = models.DateField(null=True, blank=True)
@@ -22,6 +37,22 @@ class Employee(AbstractUser):
     position = models.CharField(max_length=100, blank=True)  # Changed to text field
     monthly_salary = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
     joining_date = models.DateField(auto_now_add=True)
+    # Set when the employee is deleted; users.purge_utils removes the row and its data later
+    deleted_at = models.DateTimeField(null=True, blank=True, db_index=True)
+
+    objects = EmployeeManager()
+    all_objects = UserManager()
+
+    # (session auth hash, fallback hashes) of an Employee served from users.backends' cache
+    _cached_session_auth = None
+    
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            # Prefix search on databases without trigram indexes (see employee_search_utils)
+            models.Index(Upper('first_name'), name='employee_first_name_upper'),
+            models.Index(Upper('last_name'), name='employee_last_name_upper'),
+            models.Index(Upper('email'), name='employee_email_upper'),
+        ]
     
     def save(self, *args, **kwargs):
         if not self.employee_id:
@@ -29,27 +60,99 @@ class Employee(AbstractUser):
         super().save(*args, **kwargs)
     
     def generate_employee_id(self):
-        """Generate a sequential employee ID in format STERPEMPxxx"""
-        # Get the last employee ID
-        last_employee = Employee.objects.filter(
-            employee_id__startswith='STERPEMP'
-        ).order_by('employee_id').last()
-        
-        if last_employee and last_employee.employee_id:
-            # Extract the number part and increment it
-            last_number = int(last_employee.employee_id[8:])  # Remove 'STERPEMP' prefix
-            new_number = last_number + 1
-        else:
-            # First employee
-            new_number = 1
-        
-        # Format with leading zeros (001, 002, etc.)
-        return f'STERPEMP{new_number:03d}'
+        """Allocate the next sequential employee ID in format STERPEMPxxx"""
+        return self.reserve_employee_ids(1)[0]
+
+    @classmethod
+    def reserve_employee_ids(cls, count):
+        """Atomically reserve a block of ``count`` consecutive employee IDs (e.g. for bulk imports)"""
+        numbers = IdSequence.reserve(cls.EMPLOYEE_ID_SEQUENCE, count, seed=cls.highest_employee_number)
+        # Format with leading zeros (001, 002, etc.); numbers past 999 simply grow wider
+        return [f'{cls.EMPLOYEE_ID_PREFIX}{number:03d}' for number in numbers]
+
+    @classmethod
+    def highest_employee_number(cls):
+        """Largest number used in an existing STERPEMPxxx ID, compared numerically rather than as text"""
+        prefix = cls.EMPLOYEE_ID_PREFIX
+        # Deleted employees' IDs are never reused
+        highest = cls.all_objects.filter(employee_id__regex=rf'^{prefix}[0-9]+$').aggregate(
+            highest=Max(Cast(Substr('employee_id', len(prefix) + 1), models.BigIntegerField()))
+        )['highest']
+        return highest or 0
+
+    @classmethod
+    def directory(cls, department=None, on_date=None):
+        """
+        Non-admin employees for the admin directory, annotated in the same query
+        with ``calendar_connected``, ``attendance_status`` (on ``on_date``, default
+        today; None if unmarked) and ``open_task_count``.
+        """
+        on_date = on_date or date.today()
+        employees = cls.objects.filter(is_superuser=False)
+        if department:
+            employees = employees.filter(department=department)
+        return employees.annotate(
+            calendar_connected=Exists(GoogleCalendarCredentials.objects.filter(employee=OuterRef('pk'))),
+            attendance_status=Subquery(
+                Attendance.objects.filter(employee=OuterRef('pk'), date=on_date).values('status')[:1]
+            ),
+            open_task_count=Count('assigned_tasks', filter=Q(assigned_tasks__status='PENDING')),
+        ).order_by('employee_id', 'pk')
+    
+    def get_session_auth_hash(self):
+        # Users rebuilt by CachedModelBackend carry the hash instead of the password
+        if self._cached_session_auth is not None and 'password' in self.get_deferred_fields():
+            return self._cached_session_auth[0]
+        return super().get_session_auth_hash()
+
+    def get_session_auth_fallback_hash(self):
+        if self._cached_session_auth is not None and 'password' in self.get_deferred_fields():
+            yield from self._cached_session_auth[1]
+            return
+        yield from super().get_session_auth_fallback_hash()
+
+    def soft_delete(self):
+        """Hide the employee and block their login; the purge worker deletes the data"""
+        self.deleted_at = timezone.now()
+        self.is_active = False
+        self.save(update_fields=['deleted_at', 'is_active'])
 
-    
     def __str__(self):
         return f"{self.employee_id} - {self.get_full_name()}"
 
+class IdSequence(models.Model):
+    """Named counters for identifiers that must be allocated without collisions"""
+    name = models.CharField(max_length=50, primary_key=True)
+    last_value = models.BigIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.name} = {self.last_value}"
+
+    @classmethod
+    def reserve(cls, name, count=1, seed=None):
+        """
+        Reserve ``count`` consecutive values from the named counter and return
+        them as a range. The increment is a single-row UPDATE that holds the row
+        lock until the transaction ends, so concurrent callers queue instead of
+        receiving the same values. A counter that does not exist yet starts
+        from ``seed()`` (or 0).
+        """
+        if count < 1:
+            raise ValueError("count must be at least 1")
+        counter = cls.objects.filter(name=name)
+        with transaction.atomic():
+            if not counter.update(last_value=F('last_value') + count):
+                try:
+                    with transaction.atomic():
+                        cls.objects.create(name=name, last_value=seed() if seed else 0)
+                except IntegrityError:
+                    # Another process created the counter first
+                    pass
+                counter.update(last_value=F('last_value') + count)
+            last_value = counter.values_list('last_value', flat=True).get()
+        return range(last_value - count + 1, last_value + 1)
+
+
 class Project(models.Model):
     STATUS_CHOICES = [
         ('PLANNING', 'Planning'),
@@ -75,22 +178,30 @@ class Project(models.Model):
     created_by = models.ForeignKey(Employee, on_delete=models.CASCADE, related_name='created_projects')
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # Set when the project is deleted; users.purge_utils removes the row and its data later
+    deleted_at = models.DateTimeField(null=True, blank=True, db_index=True)
+
+    objects = NotDeletedManager()
+    all_objects = models.Manager()
     
     def __str__(self):
         return self.name
+
+    def soft_delete(self):
+        """Hide the project; the purge worker removes its calendar events and data"""
+        self.deleted_at = timezone.now()
+        self.save(update_fields=['deleted_at'])
     
     def get_completion_percentage(self):
         """Calculate project completion based on task completion"""
-        # Get all tasks related to this project
-        project_tasks = self.project_tasks.all()
-        total_tasks = project_tasks.count()
-        
-        if total_tasks == 0:
+        # Tasks of soft-deleted employees no longer count
+        counts = self.project_tasks.filter(employee__deleted_at__isnull=True).aggregate(
+            total=Count('id'),
+            completed=Count('id', filter=Q(status='COMPLETED')),
+        )
+        if counts['total'] == 0:
             return 0
-        
-        # Calculate based on completed tasks
-        completed_tasks = project_tasks.filter(status='COMPLETED').count()
-        return round((completed_tasks / total_tasks) * 100, 1)
+        return round((counts['completed'] / counts['total']) * 100, 1)
     
     class Meta:
         ordering = ['-created_at']
@@ -112,6 +223,11 @@ class ProjectCollaborator(models.Model):
     
     def __str__(self):
         return f"{self.employee.get_full_name()} - {self.project.name}"
+    
+    @classmethod
+    def visible(cls):
+        """Collaborations whose employee and project are not soft-deleted"""
+        return cls.objects.filter(employee__deleted_at__isnull=True, project__deleted_at__isnull=True)
 
 
 class GoogleCalendarCredentials(models.Model):
@@ -206,6 +322,19 @@ class Task(models.Model):
         blank=True,
         help_text="Actual hours spent on this task"
     )
+    recurring_template = models.ForeignKey(
+        'RecurringTaskTemplate',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='generated_tasks',
+        help_text="Recurring template this task was generated from"
+    )
+    overdue_since = models.DateField(
+        null=True,
+        blank=True,
+        help_text="Day the overdue sweep found this task past due; cleared when completed or rescheduled"
+    )
     
     class Meta:
         ordering = ['-created_at']
@@ -216,11 +345,56 @@ class Task(models.Model):
             models.Index(fields=['status', 'date']),
             models.Index(fields=['created_by', 'created_at']),
             models.Index(fields=['project']),
+            # Only the open tasks, so "My Tasks" stays an indexed read however much history an employee has
+            models.Index(
+                fields=['employee', '-created_at'],
+                condition=Q(status='PENDING'),
+                name='task_pending_by_employee',
+            ),
+            # The overdue sweep's scan: pending tasks it has not flagged yet
+            models.Index(
+                fields=['date'],
+                condition=Q(status='PENDING', overdue_since__isnull=True),
+                name='task_pending_unflagged_date',
+            ),
+            # Overdue counts and the sweep's check for flags to clear
+            models.Index(
+                fields=['employee'],
+                condition=Q(overdue_since__isnull=False),
+                name='task_overdue_by_employee',
+            ),
+        ]
+        constraints = [
+            # Lets the materializer insert with ignore_conflicts and never duplicate an occurrence
+            models.UniqueConstraint(
+                fields=['recurring_template', 'date'],
+                condition=Q(recurring_template__isnull=False),
+                name='unique_recurring_task_occurrence',
+            ),
         ]
     
     def __str__(self):
         return f"{self.name} - {self.employee.get_full_name()} ({self.get_status_display()})"
     
+    def save(self, *args, **kwargs):
+        # Completing or rescheduling a task ends the overdue state the sweep recorded
+        if self.overdue_since and (self.status != 'PENDING' or self.date >= date.today()):
+            self.overdue_since = None
+            if kwargs.get('update_fields') is not None:
+                kwargs['update_fields'] = {*kwargs['update_fields'], 'overdue_since'}
+        super().save(*args, **kwargs)
+    
+    @classmethod
+    def visible(cls):
+        """
+        Tasks whose assignee and project are not soft-deleted. The default
+        manager cannot hide these, since the deleted row is a related one.
+        """
+        return cls.objects.filter(
+            Q(project__isnull=True) | Q(project__deleted_at__isnull=True),
+            employee__deleted_at__isnull=True,
+        )
+    
     def is_overdue(self):
         """Check if the task is overdue"""
         from django.utils import timezone
@@ -254,6 +428,132 @@ class Task(models.Model):
         self.save()
 
 
+
+class RecurringTaskTemplate(models.Model):
+    """
+    A task that repeats on an RRULE-style schedule (FREQ, INTERVAL, BYDAY,
+    BYMONTHDAY). The materialize_recurring_tasks command turns upcoming
+    occurrences into Task rows.
+    """
+    FREQUENCY_CHOICES = [
+        ('DAILY', 'Daily'),
+        ('WEEKLY', 'Weekly'),
+        ('MONTHLY', 'Monthly'),
+    ]
+    WEEKDAY_CODES = ['MO', 'TU', 'WE', 'TH', 'FR', 'SA', 'SU']
+
+    name = models.CharField(max_length=200, help_text="Title of every generated task")
+    description = models.TextField(help_text="Description of every generated task")
+    employee = models.ForeignKey(Employee, on_delete=models.CASCADE, related_name='recurring_task_templates')
+    project = models.ForeignKey(
+        Project, on_delete=models.SET_NULL, null=True, blank=True, related_name='recurring_task_templates'
+    )
+    priority = models.CharField(max_length=10, choices=Task.PRIORITY_CHOICES, default='MEDIUM')
+    created_by = models.ForeignKey(Employee, on_delete=models.CASCADE, related_name='created_recurring_task_templates')
+
+    frequency = models.CharField(max_length=10, choices=FREQUENCY_CHOICES, default='WEEKLY')
+    interval = models.PositiveSmallIntegerField(default=1, help_text="Repeat every N days/weeks/months")
+    by_weekday = models.CharField(
+        max_length=20, blank=True,
+        help_text="Weekly only: comma-separated days such as MO,WE,FR (default: the start date's weekday)"
+    )
+    by_month_day = models.PositiveSmallIntegerField(
+        null=True, blank=True,
+        help_text="Monthly only: day of the month (default: the start date's day); clamped to short months"
+    )
+    starts_on = models.DateField()
+    ends_on = models.DateField(null=True, blank=True)
+    is_active = models.BooleanField(default=True)
+    # Last date already turned into tasks; the next run starts after it
+    materialized_through = models.DateField(null=True, blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['name']
+        indexes = [
+            models.Index(fields=['is_active', 'materialized_through']),
+        ]
+
+    def __str__(self):
+        return f"{self.name} ({self.rrule}) - {self.employee.get_full_name()}"
+
+    @property
+    def rrule(self):
+        parts = [f'FREQ={self.frequency}', f'INTERVAL={self.interval}']
+        if self.frequency == 'WEEKLY':
+            parts.append(f"BYDAY={','.join(self.WEEKDAY_CODES[day] for day in sorted(self.weekdays()))}")
+        elif self.frequency == 'MONTHLY':
+            parts.append(f'BYMONTHDAY={self.by_month_day or self.starts_on.day}')
+        return ';'.join(parts)
+
+    def weekdays(self):
+        """Weekday numbers (Monday = 0) a weekly template repeats on"""
+        codes = [code.strip().upper() for code in self.by_weekday.split(',') if code.strip()]
+        return {self.WEEKDAY_CODES.index(code) for code in codes} or {self.starts_on.weekday()}
+
+    def clean(self):
+        from django.core.exceptions import ValidationError
+        codes = [code.strip().upper() for code in self.by_weekday.split(',') if code.strip()]
+        invalid = [code for code in codes if code not in self.WEEKDAY_CODES]
+        if invalid:
+            raise ValidationError({'by_weekday': f"Unknown day code(s): {', '.join(invalid)}"})
+        if self.by_month_day is not None and not 1 <= self.by_month_day <= 31:
+            raise ValidationError({'by_month_day': "Day of the month must be between 1 and 31."})
+        if self.interval < 1:
+            raise ValidationError({'interval': "Interval must be at least 1."})
+        if self.ends_on and self.starts_on and self.ends_on < self.starts_on:
+            raise ValidationError({'ends_on': "End date cannot be before the start date."})
+
+    def occurrences(self, start, end):
+        """Dates in [start, end] the schedule falls on, before any working-day filtering"""
+        start = max(start, self.starts_on)
+        if self.ends_on:
+            end = min(end, self.ends_on)
+        if self.frequency == 'MONTHLY':
+            return self._monthly_occurrences(start, end)
+
+        weekdays = self.weekdays() if self.frequency == 'WEEKLY' else None
+        week_zero = self.starts_on - timedelta(days=self.starts_on.weekday())
+        dates = []
+        day = start
+        while day <= end:
+            if weekdays is None:
+                if (day - self.starts_on).days % self.interval == 0:
+                    dates.append(day)
+            elif day.weekday() in weekdays and ((day - week_zero).days // 7) % self.interval == 0:
+                dates.append(day)
+            day += timedelta(days=1)
+        return dates
+
+    def _monthly_occurrences(self, start, end):
+        month_day = self.by_month_day or self.starts_on.day
+        dates = []
+        year, month = start.year, start.month
+        while date(year, month, 1) <= end:
+            months_since_start = (year - self.starts_on.year) * 12 + month - self.starts_on.month
+            if months_since_start % self.interval == 0:
+                day = date(year, month, min(month_day, monthrange(year, month)[1]))
+                if start <= day <= end:
+                    dates.append(day)
+            year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+        return dates
+
+class Holiday(models.Model):
+    """Company-wide public holidays excluded from working-day calculations"""
+    name = models.CharField(max_length=100)
+    date = models.DateField(unique=True)
+    description = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        ordering = ['date']
+    
+    def __str__(self):
+        return f"{self.name} ({self.date})"
+
+
 # Leave Management Models
 class LeaveType(models.Model):
     """Types of leaves available"""
@@ -343,9 +643,11 @@ class LeaveApplication(models.Model):
             if self.end_date < self.start_date:
                 raise ValidationError("End date cannot be before start date")
             
-            # Calculate total days (including weekends)
-            delta = self.end_date - self.start_date
-            self.total_days = delta.days + 1  # +1 to include both start and end dates
+            # Calculate total working days (weekends and holidays excluded)
+            from .business_day_utils import count_working_days
+            self.total_days = count_working_days(self.start_date, self.end_date)
+            if self.total_days == 0:
+                raise ValidationError("The selected dates do not include any working days.")
             
             # Check if employee has sufficient balance
             if self.employee and self.leave_type:
@@ -362,12 +664,26 @@ class LeaveApplication(models.Model):
                 except LeaveBalance.DoesNotExist:
                     raise ValidationError("Leave balance not found for this year.")
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_dates = (instance.__dict__.get('start_date'), instance.__dict__.get('end_date'))
+        return instance
+    
     def save(self, *args, **kwargs):
-        # Calculate total days before saving
-        if self.start_date and self.end_date:
-            delta = self.end_date - self.start_date
-            self.total_days = delta.days + 1
+        # Count working days when the dates are set or changed. Approving or
+        # rejecting keeps the days applied for, even if a holiday was added since.
+        dates = (self.start_date, self.end_date)
+        if self.start_date and self.end_date and (self._state.adding or dates != getattr(self, '_loaded_dates', None)):
+            from .business_day_utils import count_working_days
+            self.total_days = count_working_days(self.start_date, self.end_date)
         super().save(*args, **kwargs)
+        self._loaded_dates = dates
+    
+    @classmethod
+    def visible(cls):
+        """Applications of employees who are not soft-deleted"""
+        return cls.objects.filter(employee__deleted_at__isnull=True)
     
     def approve(self, admin, remarks=''):
         """Approve the leave application"""
@@ -375,6 +691,9 @@ class LeaveApplication(models.Model):
         
         if self.status != 'PENDING':
             raise ValueError("Only pending applications can be approved")
+        if self.employee.deleted_at:
+            # The balance it would debit is purged along with the employee
+            raise ValueError("Applications of deleted employees cannot be approved")
         
         self.status = 'APPROVED'
         self.reviewed_by = admin
@@ -397,6 +716,8 @@ class LeaveApplication(models.Model):
         
         if self.status != 'PENDING':
             raise ValueError("Only pending applications can be rejected")
+        if self.employee.deleted_at:
+            raise ValueError("Applications of deleted employees cannot be rejected")
         
         self.status = 'REJECTED'
         self.reviewed_by = admin
@@ -510,3 +831,105 @@ class Attendance(models.Model):
         hours = int(delta.total_seconds() // 3600)
         minutes = int((delta.total_seconds() % 3600) // 60)
         return f"{hours}h {minutes}m"
+
+
+class EmailOutbox(models.Model):
+    """Outgoing email, rendered at queue time and delivered by the send_outbox worker"""
+    STATUS_CHOICES = [
+        ('PENDING', 'Pending'),
+        ('SENDING', 'Sending'),
+        ('SENT', 'Sent'),
+        ('FAILED', 'Failed'),
+    ]
+
+    to_email = models.EmailField()
+    from_email = models.CharField(max_length=254)
+    subject = models.CharField(max_length=255)
+    body = models.TextField(blank=True)
+    html_body = models.TextField(blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='PENDING')
+    attempts = models.PositiveSmallIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    claimed_at = models.DateTimeField(null=True, blank=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            # The worker's "due messages" scan
+            models.Index(fields=['status', 'next_attempt_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.subject} -> {self.to_email} ({self.get_status_display()})"
+
+
+class EmployeeImport(models.Model):
+    """CSV uploaded from the admin import page, imported by the import_employees worker"""
+    STATUS_CHOICES = [
+        ('PENDING', 'Pending'),
+        ('RUNNING', 'Running'),
+        ('DONE', 'Done'),
+        ('FAILED', 'Failed'),
+    ]
+
+    csv_text = models.TextField(blank=True)
+    row_count = models.PositiveIntegerField()
+    uploaded_by = models.ForeignKey(
+        Employee, on_delete=models.SET_NULL, null=True, blank=True, related_name='employee_imports'
+    )
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='PENDING')
+    imported_count = models.PositiveIntegerField(default=0)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    claimed_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            # The worker's "next upload" scan
+            models.Index(fields=['status', 'created_at']),
+        ]
+
+    def __str__(self):
+        return f"Import of {self.row_count} employees ({self.get_status_display()})"
+
+
+class SearchEntry(models.Model):
+    """
+    Full-text search document for one task, project or leave application.
+    Kept in sync on save by users.search_utils; deleted with its source row.
+    """
+    KIND_CHOICES = [
+        ('TASK', 'Task'),
+        ('PROJECT', 'Project'),
+        ('LEAVE', 'Leave Application'),
+    ]
+
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    task = models.OneToOneField(Task, on_delete=models.CASCADE, null=True, blank=True, related_name='search_entry')
+    project = models.OneToOneField(Project, on_delete=models.CASCADE, null=True, blank=True, related_name='search_entry')
+    leave_application = models.OneToOneField(
+        LeaveApplication, on_delete=models.CASCADE, null=True, blank=True, related_name='search_entry'
+    )
+    # Who may see a task or leave entry besides admins; project entries go by collaborators
+    employee = models.ForeignKey(
+        Employee, on_delete=models.CASCADE, null=True, blank=True, related_name='search_entries'
+    )
+    title = models.CharField(max_length=200)
+    body = models.TextField(blank=True)
+    # PostgreSQL only (GIN-indexed by search_utils); SQLite searches an FTS5 table instead
+    search_vector = SearchVectorField(null=True, editable=False)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name_plural = 'Search Entries'
+        indexes = [
+            models.Index(fields=['employee', 'kind']),
+        ]
+
+    def __str__(self):
+        return f"{self.get_kind_display()}: {self.title}"
@@ -0,0 +1,242 @@
+"""
+Bulk employee onboarding from CSV
+
+The import_employees command imports a file directly. Uploads from the admin
+import page are only validated in the request and queued as EmployeeImport
+rows, because hashing a generated password costs hundreds of milliseconds;
+``import_employees --queued`` (run from cron) imports them with the same
+process pool.
+"""
+
+import csv
+import io
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, timedelta
+
+import django
+from django import forms
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.db.models.functions import Lower
+from django.utils import timezone
+
+from .availability_utils import AVAILABILITY_CACHE_NAMESPACE
+from .cache_utils import bump_cache_version, entity_cache_namespace
+from .forms import EmployeeCreationForm
+from .models import Employee, EmployeeImport, LeaveType, LeaveBalance, EmailOutbox
+
+logger = logging.getLogger(__name__)
+
+IMPORT_COLUMNS = [
+    'first_name', 'last_name', 'email', 'date_of_birth', 'phone_number', 'address', 'department', 'position',
+    'monthly_salary',
+]
+REQUIRED_COLUMNS = ['first_name', 'last_name', 'email', 'date_of_birth']
+# Passwords handed to each hashing worker at a time
+HASH_CHUNK_SIZE = 16
+# Largest file accepted from the web form; it is validated in the request and
+# imported in the background, bigger files go through the import_employees command
+WEB_IMPORT_MAX_ROWS = 1000
+# Errors kept on a queued import that failed re-validation
+QUEUED_IMPORT_ERRORS_KEPT = 20
+# Imports claimed longer ago than this belong to a dead worker; their
+# transaction never committed, so they are safe to run again
+IMPORT_CLAIM_TIMEOUT_SECONDS = 30 * 60
+
+
+class EmployeeImportRowForm(forms.ModelForm):
+    """Validates one CSV row with the same field rules as the single-employee form"""
+
+    class Meta:
+        model = Employee
+        fields = IMPORT_COLUMNS
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        for name in REQUIRED_COLUMNS:
+            self.fields[name].required = True
+
+
+def read_employee_csv(stream):
+    """
+    Validate a CSV of new employees in a single streaming pass.
+    ``stream`` is any iterable of text lines (an open file or a decoded upload).
+    Returns ``(employees, errors)``: unsaved Employee instances and
+    ``(line number, message)`` pairs. Nothing is imported when errors is non-empty.
+    """
+    reader = csv.DictReader(stream)
+    missing = [column for column in REQUIRED_COLUMNS if column not in (reader.fieldnames or [])]
+    if missing:
+        return [], [(1, f"Missing required column(s): {', '.join(missing)}")]
+
+    employees, errors, seen_emails = [], [], {}
+    for row in reader:
+        line = reader.line_num
+        form = EmployeeImportRowForm({column: (row.get(column) or '').strip() for column in IMPORT_COLUMNS})
+        if not form.is_valid():
+            for field, field_errors in form.errors.items():
+                errors.append((line, f"{field}: {' '.join(field_errors)}"))
+            continue
+        email = form.cleaned_data['email'].lower()
+        if email in seen_emails:
+            errors.append((line, f"email: {email} already appears on line {seen_emails[email]}"))
+            continue
+        seen_emails[email] = line
+        employees.append(form.save(commit=False))
+
+    # Addresses are matched case-insensitively, as within the file
+    existing = (
+        Employee.objects.annotate(email_lower=Lower('email'))
+        .filter(email_lower__in=list(seen_emails))
+        .values_list('email', flat=True)
+    )
+    for email in existing:
+        errors.append((seen_emails[email.lower()], f"email: an employee with {email} already exists"))
+    errors.sort()
+    return employees, errors
+
+
+def decode_upload(uploaded_file):
+    """Stream an uploaded CSV as text lines without reading it into memory"""
+    return io.TextIOWrapper(uploaded_file.file, encoding='utf-8-sig', newline='')
+
+
+def _init_hash_worker():
+    # Spawned workers start with a bare interpreter; forked ones already have the settings
+    django.setup()
+
+
+def hash_passwords(passwords, workers=None):
+    """Hash passwords across a process pool; each hash is hundreds of milliseconds of CPU"""
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(passwords) <= HASH_CHUNK_SIZE:
+        return [make_password(password) for password in passwords]
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_hash_worker) as executor:
+        return list(executor.map(make_password, passwords, chunksize=HASH_CHUNK_SIZE))
+
+
+def import_employees(employees, workers=None, batch_size=500, send_emails=True):
+    """
+    Create validated employees in bulk. IDs are reserved as one block from the
+    employee ID counter, passwords are hashed in a process pool, and employees
+    and their current-year leave balances are inserted with bulk_create in a
+    single transaction. Returns the created employees.
+    """
+    if not employees:
+        return []
+
+    passwords = [EmployeeCreationForm.generate_random_password() for _ in employees]
+    hashes = hash_passwords(passwords, workers)
+
+    with transaction.atomic():
+        employee_ids = Employee.reserve_employee_ids(len(employees))
+        for employee, employee_id, password_hash in zip(employees, employee_ids, hashes):
+            employee.employee_id = employee_id
+            employee.username = employee_id
+            employee.password = password_hash
+            employee.is_active = True
+        created = Employee.objects.bulk_create(employees, batch_size=batch_size)
+        if created[0].pk is None:
+            # Backends that cannot return ids from a bulk insert
+            pks = dict(Employee.objects.filter(employee_id__in=employee_ids).values_list('employee_id', 'pk'))
+            for employee in created:
+                employee.pk = pks[employee.employee_id]
+
+        # bulk_create skips the post_save signal that provisions balances one row at a time
+        current_year = date.today().year
+        leave_types = list(LeaveType.objects.all())
+        LeaveBalance.objects.bulk_create(
+            [
+                LeaveBalance(
+                    employee=employee,
+                    leave_type=leave_type,
+                    year=current_year,
+                    total_days=leave_type.default_days,
+                    used_days=0,
+                    remaining_days=leave_type.default_days,
+                )
+                for employee in created
+                for leave_type in leave_types
+            ],
+            batch_size=batch_size,
+        )
+
+        # ... and the ones that bump the cache versions
+        bump_cache_version(entity_cache_namespace(Employee))
+        bump_cache_version(AVAILABILITY_CACHE_NAMESPACE)
+
+        if send_emails:
+            # Queued in the same transaction, so only imported employees are emailed
+            EmailOutbox.objects.bulk_create(
+                [
+                    EmployeeCreationForm.build_password_email(employee, password)
+                    for employee, password in zip(created, passwords)
+                ],
+                batch_size=batch_size,
+            )
+
+    logger.info(f"Imported {len(created)} employees ({employee_ids[0]} to {employee_ids[-1]})")
+    return created
+
+
+
+def queue_import(csv_text, row_count, uploaded_by):
+    """Queue a validated upload for the import_employees worker"""
+    return EmployeeImport.objects.create(csv_text=csv_text, row_count=row_count, uploaded_by=uploaded_by)
+
+
+def claim_next_import():
+    """
+    Mark the oldest pending upload as RUNNING and return it, or None.
+    Rows locked by another worker are skipped, so several workers can run.
+    """
+    now = timezone.now()
+    EmployeeImport.objects.filter(
+        status='RUNNING', claimed_at__lt=now - timedelta(seconds=IMPORT_CLAIM_TIMEOUT_SECONDS)
+    ).update(status='PENDING')
+
+    with transaction.atomic():
+        job = (
+            EmployeeImport.objects.select_for_update(skip_locked=True)
+            .filter(status='PENDING')
+            .order_by('created_at')
+            .first()
+        )
+        if job is None:
+            return None
+        job.status = 'RUNNING'
+        job.claimed_at = now
+        job.save(update_fields=['status', 'claimed_at'])
+    return job
+
+
+def run_queued_import(job, workers=None, batch_size=500):
+    """
+    Import one claimed upload. The file is validated again, since employees
+    may have been added since it was queued. The CSV holds personal data, so
+    it is cleared once the upload is done or has failed. Returns the created
+    employees.
+    """
+    employees, errors = read_employee_csv(io.StringIO(job.csv_text))
+    if errors:
+        job.status = 'FAILED'
+        job.error = '\n'.join(f"Line {line}: {message}" for line, message in errors[:QUEUED_IMPORT_ERRORS_KEPT])
+        if len(errors) > QUEUED_IMPORT_ERRORS_KEPT:
+            job.error += f"\n... and {len(errors) - QUEUED_IMPORT_ERRORS_KEPT} more"
+        job.csv_text = ''
+        job.finished_at = timezone.now()
+        job.save(update_fields=['status', 'error', 'csv_text', 'finished_at'])
+        logger.warning(f"Queued import {job.pk} failed validation with {len(errors)} errors")
+        return []
+
+    # Marked done in the import's transaction, so a crash leaves it to be retried, never repeated
+    with transaction.atomic():
+        created = import_employees(employees, workers=workers, batch_size=batch_size)
+        job.status = 'DONE'
+        job.imported_count = len(created)
+        job.csv_text = ''
+        job.finished_at = timezone.now()
+        job.save(update_fields=['status', 'imported_count', 'csv_text', 'finished_at'])
+    return created
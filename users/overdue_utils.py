@@ -0,0 +1,154 @@
+"""
+Overdue-task sweep and digests
+
+Tasks turn overdue because the calendar moves on, not because anything is
+saved, so a daily sweep stamps ``overdue_since`` on the pending tasks whose due
+date has passed and queues one digest per assignee, and one per admin, listing
+the tasks that turned overdue in that pass. Completing or rescheduling a task
+clears the flag on save; the sweep also clears flags left behind by queryset
+updates. Digests go through the EmailOutbox, so the send_outbox worker
+delivers them in batches over one mail server connection.
+
+The sweep is meant to run once a day shortly after midnight (see the
+sweep_overdue_tasks command). Until it has run, tasks that fell due that day
+are not flagged yet, so dashboards count with ``overdue_filter()``: the flag,
+plus the pending past-due tasks still waiting for it, which the
+task_pending_unflagged_date partial index keeps cheap.
+"""
+
+import logging
+from collections import defaultdict
+from datetime import date
+
+from django.db import transaction
+from django.db.models import Q
+
+from .cache_utils import bump_cache_version, entity_cache_namespace
+from .email_utils import build_email
+from .models import EmailOutbox, Employee, Task
+
+logger = logging.getLogger(__name__)
+
+OVERDUE_SWEEP_BATCH_SIZE = 1000
+# Tasks listed in one digest; the rest are only counted
+DIGEST_MAX_TASKS = 50
+
+
+def overdue_filter(today=None):
+    """Q matching overdue tasks, whether or not the sweep has flagged them yet"""
+    today = today or date.today()
+    return Q(overdue_since__isnull=False) | Q(status='PENDING', date__lt=today)
+
+
+def _clear_stale_flags(today):
+    """Unflag tasks completed or rescheduled without going through Task.save"""
+    return (
+        Task.objects.filter(overdue_since__isnull=False)
+        .exclude(status='PENDING', date__lt=today)
+        .update(overdue_since=None)
+    )
+
+
+def _flag_newly_overdue(today, batch_size):
+    """Stamp overdue_since on pending tasks past due and return their ids"""
+    flagged = []
+    while True:
+        # Rows locked by a concurrent sweep are skipped, so no task is reported twice
+        ids = list(
+            Task.objects.select_for_update(skip_locked=True)
+            .filter(status='PENDING', date__lt=today, overdue_since__isnull=True)
+            .values_list('pk', flat=True)[:batch_size]
+        )
+        if not ids:
+            return flagged
+        Task.objects.filter(pk__in=ids).update(overdue_since=today)
+        flagged.extend(ids)
+
+
+def _digest_lines(tasks, with_assignee=False):
+    lines = []
+    for task in tasks[:DIGEST_MAX_TASKS]:
+        assignee = f" - {task.employee.get_full_name()}" if with_assignee else ''
+        project = f" [{task.project.name}]" if task.project else ''
+        lines.append(f"  * {task.name}{project}{assignee} (due {task.date:%b %d, %Y}, {task.get_priority_display()} priority)")
+    if len(tasks) > DIGEST_MAX_TASKS:
+        lines.append(f"  ... and {len(tasks) - DIGEST_MAX_TASKS} more")
+    return '\n'.join(lines)
+
+
+def _employee_digest(employee, tasks):
+    count = len(tasks)
+    subject = f"{count} of your task{'s are' if count != 1 else ' is'} now overdue"
+    body = f"""
+Hello {employee.get_full_name() or employee.username},
+
+These tasks passed their due date and are still pending:
+
+{_digest_lines(tasks)}
+
+Please complete them from the My Tasks page, or ask your manager for a new date.
+
+Best regards,
+STERP Softwares Team
+    """
+    return build_email(employee.email, subject, body)
+
+
+def _admin_digest(admin, tasks):
+    count = len(tasks)
+    employees = len({task.employee_id for task in tasks})
+    subject = f"Overdue digest: {count} task{'s' if count != 1 else ''} turned overdue"
+    body = f"""
+Hello {admin.get_full_name() or admin.username},
+
+{count} task{'s' if count != 1 else ''} assigned to {employees} employee{'s' if employees != 1 else ''} are newly overdue:
+
+{_digest_lines(tasks, with_assignee=True)}
+
+Best regards,
+STERP Softwares Portal
+    """
+    return build_email(admin.email, subject, body)
+
+
+def _build_digests(task_ids):
+    # Tasks of soft-deleted employees stay flagged but are not reported until purged
+    tasks = list(
+        Task.visible().filter(pk__in=task_ids)
+        .select_related('employee', 'project')
+        .order_by('date', 'pk')
+    )
+    by_employee = defaultdict(list)
+    for task in tasks:
+        by_employee[task.employee].append(task)
+
+    digests = [
+        _employee_digest(employee, employee_tasks)
+        for employee, employee_tasks in by_employee.items()
+        if employee.email and employee.is_active
+    ]
+    if not tasks:
+        return digests
+    admins = Employee.objects.filter(is_superuser=True, is_active=True).exclude(email='')
+    digests.extend(_admin_digest(admin, tasks) for admin in admins)
+    return digests
+
+
+def sweep_overdue_tasks(today=None, batch_size=OVERDUE_SWEEP_BATCH_SIZE):
+    """
+    Flag the tasks that turned overdue since the last sweep and queue their
+    digests. Returns ``(flagged, cleared, digests)`` counts.
+    """
+    today = today or date.today()
+    # Flags and digests commit together: a failed sweep neither loses nor repeats a digest
+    with transaction.atomic():
+        cleared = _clear_stale_flags(today)
+        flagged = _flag_newly_overdue(today, batch_size)
+        digests = _build_digests(flagged) if flagged else []
+        EmailOutbox.objects.bulk_create(digests, batch_size=batch_size)
+
+    if flagged or cleared:
+        # Queryset updates send no post_save, which is what normally does this
+        bump_cache_version(entity_cache_namespace(Task))
+    logger.info(f"Overdue sweep: {len(flagged)} tasks flagged, {cleared} cleared, {len(digests)} digests queued")
+    return len(flagged), cleared, len(digests)
@@ -0,0 +1,138 @@
+"""
+Background purge of soft-deleted employees and projects
+
+Deleting an employee or project in the portal only sets ``deleted_at``,
+which hides it at once. The purge_deleted worker then does the Google
+Calendar cleanup and removes the dependent rows in bounded batches with raw
+DELETEs, children before parents, so no request waits on the cascade and no
+transaction spans more than one batch. A purge that fails part way leaves the
+entity soft-deleted and is resumed on the next run.
+"""
+
+import logging
+from django.db import models, router, transaction
+from django.db.models import ProtectedError
+
+from .availability_utils import AVAILABILITY_CACHE_NAMESPACE
+from .backends import invalidate_cached_user
+from .cache_utils import bump_cache_version, entity_cache_namespace
+from .calendar_service import GoogleCalendarService
+from .leave_utils import leave_cache_namespace
+from .models import Employee, Project, GoogleCalendarCredentials
+
+logger = logging.getLogger(__name__)
+
+PURGE_BATCH_SIZE = 1000
+
+
+def _purge_rows(model, queryset, batch_size, touched):
+    """Delete every row of ``queryset``, dependents first, one batch per transaction"""
+    using = router.db_for_write(model)
+    deleted = 0
+    while True:
+        pks = list(queryset.values_list('pk', flat=True)[:batch_size])
+        if not pks:
+            return deleted
+        _purge_dependents(model, pks, batch_size, touched)
+        with transaction.atomic(using=using):
+            # A single DELETE without Django's in-memory collector or signals;
+            # the dependents it would have collected are already gone
+            deleted += model._base_manager.filter(pk__in=pks)._raw_delete(using)
+        touched.add(model)
+
+
+def _clear_foreign_key(model, field_name, queryset, batch_size, touched):
+    while True:
+        pks = list(queryset.values_list('pk', flat=True)[:batch_size])
+        if not pks:
+            return
+        model._base_manager.filter(pk__in=pks).update(**{field_name: None})
+        touched.add(model)
+
+
+def _purge_dependents(model, pks, batch_size, touched):
+    """Apply each relation's on_delete rule to the rows pointing at ``pks``"""
+    for field in model._meta.many_to_many:
+        through = field.remote_field.through
+        rows = through._base_manager.filter(**{f'{field.m2m_field_name()}__in': pks})
+        _purge_rows(through, rows, batch_size, touched)
+
+    for relation in model._meta.related_objects:
+        if relation.many_to_many:
+            through = relation.through
+            rows = through._base_manager.filter(**{f'{relation.field.m2m_reverse_field_name()}__in': pks})
+            _purge_rows(through, rows, batch_size, touched)
+            continue
+
+        related_model, field = relation.related_model, relation.field
+        rows = related_model._base_manager.filter(**{f'{field.name}__in': pks})
+        on_delete = field.remote_field.on_delete
+        if on_delete is models.CASCADE:
+            _purge_rows(related_model, rows, batch_size, touched)
+        elif on_delete is models.SET_NULL:
+            _clear_foreign_key(related_model, field.name, rows, batch_size, touched)
+        elif on_delete is models.DO_NOTHING:
+            continue
+        elif rows.exists():
+            raise ProtectedError(
+                f'{related_model.__name__}.{field.name} ({on_delete.__name__}) blocks purging {model.__name__}',
+                rows,
+            )
+
+
+def _invalidate_caches(touched):
+    # Raw deletes and updates skip the signals that normally do this
+    for model in touched:
+        bump_cache_version(entity_cache_namespace(model))
+    bump_cache_version(AVAILABILITY_CACHE_NAMESPACE)
+
+
+def purge_project(project, batch_size=PURGE_BATCH_SIZE):
+    """Remove a soft-deleted project's calendar events, then the project and its dependents"""
+    collaborators = Employee.objects.filter(
+        project_collaborations__project=project,
+        google_calendar_credentials__isnull=False,
+    )
+    for employee in collaborators:
+        # Events are found by searching the calendar, so repeating this after a failed purge is safe
+        success, message = GoogleCalendarService.delete_project_events(employee, project)
+        if not success:
+            logger.warning(f"Calendar cleanup for {employee.get_full_name()} on deleted project {project.name}: {message}")
+
+    touched = set()
+    _purge_rows(Project, Project.all_objects.filter(pk=project.pk), batch_size, touched)
+    _invalidate_caches(touched)
+    logger.info(f"Purged project {project.pk} ({project.name})")
+
+
+def purge_employee(employee, batch_size=PURGE_BATCH_SIZE):
+    """Revoke a soft-deleted employee's calendar access, then remove them and their data"""
+    if GoogleCalendarCredentials.objects.filter(employee=employee).exists():
+        success, message = GoogleCalendarService.revoke_credentials(employee)
+        if not success:
+            logger.warning(f"Could not revoke calendar access for deleted employee {employee.pk}: {message}")
+
+    touched = set()
+    _purge_rows(Employee, Employee.all_objects.filter(pk=employee.pk), batch_size, touched)
+    _invalidate_caches(touched)
+    bump_cache_version(leave_cache_namespace(employee.pk))
+    invalidate_cached_user(employee.pk)
+    logger.info(f"Purged employee {employee.pk} ({employee.employee_id})")
+
+
+def purge_deleted(batch_size=PURGE_BATCH_SIZE):
+    """
+    Purge every soft-deleted project and employee. Returns ``(purged, failed)``;
+    failed entities stay soft-deleted and are retried on the next call.
+    """
+    purged = failed = 0
+    for model, purge in ((Project, purge_project), (Employee, purge_employee)):
+        for entity in model.all_objects.filter(deleted_at__isnull=False).order_by('deleted_at'):
+            try:
+                purge(entity, batch_size)
+            except Exception as error:
+                logger.error(f"Could not purge {model.__name__} {entity.pk}: {error}")
+                failed += 1
+            else:
+                purged += 1
+    return purged, failed
@@ -0,0 +1,116 @@
+"""
+Materialize recurring task templates into Task rows
+
+Each run generates the occurrences from the day after a template's
+``materialized_through`` up to a rolling horizon, skipping weekends,
+holidays and the assignee's approved leave. Templates of soft-deleted
+employees or projects are left alone until they are purged. Inserts go through the
+(recurring_template, date) unique constraint with ignore_conflicts, so
+overlapping or repeated runs never create duplicates. The working-day
+calendar is computed once per run and leave is fetched once per chunk of
+templates, so a pass costs a few queries per chunk however many templates
+there are.
+"""
+
+import logging
+from collections import defaultdict
+from datetime import date, timedelta
+
+from django.db import transaction
+from django.db.models import Q
+
+from .business_day_utils import is_working_day
+from .cache_utils import bump_cache_version, entity_cache_namespace
+from .models import LeaveApplication, RecurringTaskTemplate, Task
+from .search_utils import index_objects
+
+logger = logging.getLogger(__name__)
+
+MATERIALIZE_HORIZON_DAYS = 14
+MATERIALIZE_TEMPLATE_CHUNK = 500
+
+
+def _approved_leave_days(employee_ids, start, end):
+    """employee_id -> dates in [start, end] covered by approved leave"""
+    leave_days = defaultdict(set)
+    leaves = LeaveApplication.objects.filter(
+        employee_id__in=employee_ids, status='APPROVED', start_date__lte=end, end_date__gte=start,
+    ).values_list('employee_id', 'start_date', 'end_date')
+    for employee_id, leave_start, leave_end in leaves:
+        day = max(leave_start, start)
+        while day <= min(leave_end, end):
+            leave_days[employee_id].add(day)
+            day += timedelta(days=1)
+    return leave_days
+
+
+def _materialize_chunk(templates, today, horizon_end, working_days, batch_size):
+    leave_days = _approved_leave_days({template.employee_id for template in templates}, today, horizon_end)
+    tasks = []
+    for template in templates:
+        start = today
+        if template.materialized_through:
+            start = max(start, template.materialized_through + timedelta(days=1))
+        for day in template.occurrences(start, horizon_end):
+            if day not in working_days or day in leave_days[template.employee_id]:
+                continue
+            tasks.append(Task(
+                name=template.name,
+                description=template.description,
+                employee_id=template.employee_id,
+                project_id=template.project_id,
+                date=day,
+                priority=template.priority,
+                created_by_id=template.created_by_id,
+                recurring_template_id=template.pk,
+            ))
+
+    template_ids = [template.pk for template in templates]
+    generated = Task.objects.filter(recurring_template_id__in=template_ids)
+    with transaction.atomic():
+        # Rows skipped by ignore_conflicts are not reported, so count around the insert
+        existing = generated.count()
+        Task.objects.bulk_create(tasks, batch_size=batch_size, ignore_conflicts=True)
+        created = generated.count() - existing
+        RecurringTaskTemplate.objects.filter(pk__in=template_ids).update(materialized_through=horizon_end)
+        # ignore_conflicts returns no primary keys, so look the new rows up
+        index_objects(generated.filter(search_entry__isnull=True))
+    return created
+
+
+def materialize_recurring_tasks(horizon_days=MATERIALIZE_HORIZON_DAYS, today=None, batch_size=1000):
+    """
+    Generate tasks for every active template up to ``horizon_days`` ahead.
+    Returns ``(templates, tasks)``: templates advanced and tasks created.
+    """
+    today = today or date.today()
+    horizon_end = today + timedelta(days=horizon_days)
+    working_days = {
+        today + timedelta(days=offset)
+        for offset in range(horizon_days + 1)
+        if is_working_day(today + timedelta(days=offset))
+    }
+
+    templates = list(
+        RecurringTaskTemplate.objects.filter(
+            is_active=True,
+            starts_on__lte=horizon_end,
+            employee__deleted_at__isnull=True,
+            employee__is_active=True,
+        )
+        .filter(Q(project__isnull=True) | Q(project__deleted_at__isnull=True))
+        .filter(Q(ends_on__isnull=True) | Q(ends_on__gte=today))
+        .filter(Q(materialized_through__isnull=True) | Q(materialized_through__lt=horizon_end))
+        .order_by('pk')
+    )
+
+    task_count = 0
+    for start in range(0, len(templates), MATERIALIZE_TEMPLATE_CHUNK):
+        chunk = templates[start:start + MATERIALIZE_TEMPLATE_CHUNK]
+        task_count += _materialize_chunk(chunk, today, horizon_end, working_days, batch_size)
+
+    if task_count:
+        # bulk_create sends no post_save, which is what normally does this
+        bump_cache_version(entity_cache_namespace(Task))
+    logger.info(f"Materialized {task_count} tasks from {len(templates)} recurring templates through {horizon_end}")
+    return len(templates), task_count
@@ -0,0 +1,188 @@
+"""
+Full-text search over tasks, projects and leave reasons
+
+Every searchable row has one SearchEntry, refreshed from the save signals and
+explicitly after bulk inserts (which send no signals); entries are deleted with
+their source row. On PostgreSQL each entry carries a weighted tsvector (title A,
+body B) behind a GIN index and results are ranked with ts_rank. On SQLite an
+external-content FTS5 table mirrors the entries through triggers and results
+are ranked with bm25. Other databases fall back to unranked substring matching.
+"""
+
+import logging
+import re
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db import connections, router
+from django.db.models import F, Q
+
+from .models import LeaveApplication, Project, ProjectCollaborator, SearchEntry, Task
+
+logger = logging.getLogger(__name__)
+
+SEARCH_PAGE_SIZE = 20
+SEARCH_MAX_WORDS = 8
+SEARCH_CONFIG = 'english'
+GIN_INDEX_NAME = 'users_searchentry_vector_gin'
+FTS_TABLE = 'users_searchentry_fts'
+# bm25 column weights: a title match counts ten times a body match
+FTS_WEIGHTS = (10.0, 1.0)
+
+# Saves that touch none of these fields leave the entry unchanged
+INDEXED_FIELDS = {
+    Task: {'name', 'description', 'completion_notes', 'employee'},
+    Project: {'name', 'description'},
+    LeaveApplication: {'reason', 'leave_type', 'start_date', 'end_date', 'employee'},
+}
+
+SQLITE_FTS_STATEMENTS = [
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+    f"title, body, content='{{table}}', content_rowid='id', tokenize='porter unicode61')",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_insert AFTER INSERT ON {{table}} BEGIN "
+    f"INSERT INTO {FTS_TABLE}(rowid, title, body) VALUES (new.id, new.title, new.body); END",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_delete AFTER DELETE ON {{table}} BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, body) VALUES ('delete', old.id, old.title, old.body); END",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_update AFTER UPDATE OF title, body ON {{table}} BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, body) VALUES ('delete', old.id, old.title, old.body); "
+    f"INSERT INTO {FTS_TABLE}(rowid, title, body) VALUES (new.id, new.title, new.body); END",
+    # Index whatever entries already exist (or were changed while a trigger was missing)
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')",
+]
+
+
+def _vendor():
+    return connections[router.db_for_write(SearchEntry)].vendor
+
+
+def ensure_full_text_index(using='default', **kwargs):
+    """
+    post_migrate hook: create the GIN index on PostgreSQL, or the FTS5 table
+    and its sync triggers on SQLite builds that include FTS5. Runs on every
+    migrate because rebuilding the entries table for a schema change drops
+    its triggers.
+    """
+    connection = connections[using]
+    table = SearchEntry._meta.db_table
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'CREATE INDEX IF NOT EXISTS {GIN_INDEX_NAME} ON {connection.ops.quote_name(table)} '
+                f'USING gin (search_vector)'
+            )
+    elif connection.vendor == 'sqlite':
+        try:
+            with connection.cursor() as cursor:
+                for statement in SQLITE_FTS_STATEMENTS:
+                    cursor.execute(statement.format(table=table))
+        except Exception as e:
+            logger.warning(f"SQLite FTS5 unavailable, search falls back to substring matching: {e}")
+
+
+def _document(instance):
+    """Lookup and field values of the SearchEntry for a task, project or leave application"""
+    if isinstance(instance, Task):
+        return {'task': instance}, {
+            'kind': 'TASK',
+            'title': instance.name,
+            'body': '\n'.join(part for part in (instance.description, instance.completion_notes) if part),
+            'employee_id': instance.employee_id,
+        }
+    if isinstance(instance, Project):
+        return {'project': instance}, {
+            'kind': 'PROJECT',
+            'title': instance.name,
+            'body': instance.description,
+            'employee_id': None,
+        }
+    return {'leave_application': instance}, {
+        'kind': 'LEAVE',
+        'title': f'{instance.leave_type.name} ({instance.start_date:%b %d} - {instance.end_date:%b %d, %Y})'[:200],
+        'body': instance.reason,
+        'employee_id': instance.employee_id,
+    }
+
+
+def _refresh_vectors(entries):
+    if _vendor() == 'postgresql':
+        entries.update(search_vector=(
+            SearchVector('title', weight='A', config=SEARCH_CONFIG)
+            + SearchVector('body', weight='B', config=SEARCH_CONFIG)
+        ))
+
+
+def index_object(instance):
+    """Create or refresh the search entry for one task, project or leave application"""
+    lookup, document = _document(instance)
+    entry, _ = SearchEntry.objects.update_or_create(**lookup, defaults=document)
+    _refresh_vectors(SearchEntry.objects.filter(pk=entry.pk))
+
+
+def index_objects(instances, batch_size=500):
+    """Create entries for rows that have none yet, e.g. after a bulk_create"""
+    entries = []
+    for instance in instances:
+        lookup, document = _document(instance)
+        entries.append(SearchEntry(**lookup, **document))
+    SearchEntry.objects.bulk_create(entries, batch_size=batch_size)
+    _refresh_vectors(SearchEntry.objects.filter(search_vector__isnull=True))
+    return len(entries)
+
+
+def visible_entries(user):
+    """Entries ``user`` may see: everything for admins, otherwise their own tasks
+    and leave plus the projects they collaborate on"""
+    entries = SearchEntry.objects.filter(
+        Q(project__isnull=True) | Q(project__deleted_at__isnull=True),
+        # Task entries carry no project; hide tasks of deleted projects as Task.visible() does
+        Q(task__isnull=True) | Q(task__project__isnull=True) | Q(task__project__deleted_at__isnull=True),
+        Q(employee__isnull=True) | Q(employee__deleted_at__isnull=True),
+    )
+    if user.is_superuser:
+        return entries
+    return entries.filter(
+        Q(employee=user)
+        | Q(kind='PROJECT', project__in=ProjectCollaborator.objects.filter(employee=user).values('project_id'))
+    )
+
+
+def _fts_match(query):
+    """FTS5 MATCH expression requiring every word, the last one as a prefix"""
+    words = re.findall(r'\w+', query)[:SEARCH_MAX_WORDS]
+    if not words:
+        return ''
+    terms = [f'"{word}"' for word in words]
+    terms[-1] += '*'
+    return ' '.join(terms)
+
+
+def search_entries(user, query, kind=None):
+    """Entries visible to ``user`` matching ``query``, best match first"""
+    entries = visible_entries(user)
+    if kind:
+        entries = entries.filter(kind=kind)
+
+    connection = connections[router.db_for_read(SearchEntry)]
+    if connection.vendor == 'postgresql':
+        search_query = SearchQuery(query, search_type='websearch', config=SEARCH_CONFIG)
+        return (
+            entries.filter(search_vector=search_query)
+            .annotate(rank=SearchRank(F('search_vector'), search_query))
+            .order_by('-rank', '-updated_at')
+        )
+
+    if connection.vendor == 'sqlite' and FTS_TABLE in connection.introspection.table_names():
+        match = _fts_match(query)
+        if not match:
+            return entries.none()
+        table = SearchEntry._meta.db_table
+        # Joining the FTS table lets bm25() see the MATCH and rank in the same query
+        return entries.extra(
+            tables=[FTS_TABLE],
+            where=[f'{FTS_TABLE}.rowid = {table}.id', f'{FTS_TABLE} MATCH %s'],
+            params=[match],
+            select={'rank': f'-bm25({FTS_TABLE}, %s, %s)'},
+            select_params=FTS_WEIGHTS,
+        ).order_by('-rank', '-updated_at')
+
+    for word in query.split()[:SEARCH_MAX_WORDS]:
+        entries = entries.filter(Q(title__icontains=word) | Q(body__icontains=word))
+    return entries.order_by('-updated_at')
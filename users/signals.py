@@ -1,6 +1,15 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
-from .models import Employee, LeaveType, LeaveBalance
+from .models import (
+    Employee, LeaveType, LeaveBalance, LeaveApplication, Attendance, Project, ProjectCollaborator,
+    Task, Holiday, GoogleCalendarCredentials,
+)
+from .cache_utils import bump_cache_version, entity_cache_namespace
+from .backends import invalidate_cached_user
+from .availability_utils import AVAILABILITY_CACHE_NAMESPACE
+from .business_day_utils import HOLIDAY_CACHE_NAMESPACE
+from .leave_utils import LEAVE_TYPE_CACHE_NAMESPACE, leave_cache_namespace
+from .search_utils import INDEXED_FIELDS, index_object
 from datetime import date
 import logging
 
@@ -33,3 +42,94 @@ def create_leave_balances_for_new_employee(sender, instance, created, **kwargs):
             logger.info(f"Successfully created all leave balances for {instance.get_full_name()}")
         except Exception as e:
             logger.error(f"Error creating leave balances for {instance.get_full_name()}: {str(e)}")
+
+
+@receiver([post_save, post_delete], sender=LeaveApplication)
+@receiver([post_save, post_delete], sender=Attendance)
+@receiver([post_save, post_delete], sender=ProjectCollaborator)
+def invalidate_availability_matrix(sender, instance, **kwargs):
+    """
+    Drop cached availability matrices whenever leaves, attendance or project teams change
+    """
+    bump_cache_version(AVAILABILITY_CACHE_NAMESPACE)
+
+
+@receiver([post_save, post_delete], sender=Employee)
+def invalidate_availability_matrix_for_employee(sender, instance, update_fields=None, **kwargs):
+    """
+    Matrix rows are the active employees with their names and departments, so
+    hires, edits and soft deletes change them; logins do not
+    """
+    if update_fields is not None and set(update_fields) == {'last_login'}:
+        return
+    bump_cache_version(AVAILABILITY_CACHE_NAMESPACE)
+
+
+@receiver([post_save, post_delete], sender=Holiday)
+def invalidate_working_day_calendar(sender, instance, **kwargs):
+    """
+    Force every process to rebuild its working-day tables after a holiday change
+    """
+    bump_cache_version(HOLIDAY_CACHE_NAMESPACE)
+
+
+@receiver([post_save, post_delete], sender=LeaveApplication)
+@receiver([post_save, post_delete], sender=LeaveBalance)
+def invalidate_leave_snapshot(sender, instance, **kwargs):
+    """
+    Drop the cached leave snapshot of the employee whose leave data changed
+    """
+    bump_cache_version(leave_cache_namespace(instance.employee_id))
+
+
+@receiver([post_save, post_delete], sender=LeaveType)
+def invalidate_leave_type_snapshots(sender, instance, **kwargs):
+    """
+    Leave type names and descriptions are embedded in every cached snapshot
+    """
+    bump_cache_version(LEAVE_TYPE_CACHE_NAMESPACE)
+
+
+@receiver([post_save, post_delete], sender=Task)
+@receiver([post_save, post_delete], sender=Project)
+@receiver([post_save, post_delete], sender=ProjectCollaborator)
+@receiver([post_save, post_delete], sender=Attendance)
+@receiver([post_save, post_delete], sender=LeaveApplication)
+def invalidate_entity_fragments(sender, instance, **kwargs):
+    """
+    Bump the entity version that cached dashboard fragments are keyed on
+    """
+    bump_cache_version(entity_cache_namespace(sender))
+
+
+@receiver([post_save, post_delete], sender=Employee)
+@receiver([post_save, post_delete], sender=GoogleCalendarCredentials)
+def invalidate_employee_fragments(sender, instance, update_fields=None, **kwargs):
+    """
+    Employee directory fragments also show calendar connection status.
+    Login only touches last_login, which no fragment renders.
+    """
+    if update_fields is not None and set(update_fields) == {'last_login'}:
+        return
+    bump_cache_version(entity_cache_namespace(Employee))
+
+
+@receiver(post_save, sender=Task)
+@receiver(post_save, sender=Project)
+@receiver(post_save, sender=LeaveApplication)
+def update_search_entry(sender, instance, update_fields=None, **kwargs):
+    """
+    Keep the full-text search entry in step with the row; entries are
+    deleted along with it. Status-only saves change nothing searchable.
+    """
+    if update_fields is not None and not set(update_fields) & INDEXED_FIELDS[sender]:
+        return
+    index_object(instance)
+
+
+@receiver([post_save, post_delete], sender=Employee)
+def invalidate_session_user(sender, instance, **kwargs):
+    """
+    Drop the cached Employee used by CachedModelBackend
+    """
+    invalidate_cached_user(instance.pk)
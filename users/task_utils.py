@@ -0,0 +1,76 @@
+"""
+Assigning one task to many employees
+"""
+
+import asyncio
+import logging
+
+from asgiref.sync import sync_to_async
+
+from .async_utils import run_outbound
+from .cache_utils import bump_cache_version, entity_cache_namespace
+from .calendar_service import GoogleCalendarService
+from .models import GoogleCalendarCredentials, Task
+from .search_utils import index_objects
+
+logger = logging.getLogger(__name__)
+
+# Calendar API calls made concurrently; each assignee has their own credentials,
+# so the calls cannot share one Google batch request
+CALENDAR_SYNC_BATCH_SIZE = 8
+
+
+def assign_task(task, employees):
+    """
+    Save a copy of the unsaved ``task`` for each employee with one bulk_create.
+    The returned tasks keep ``project`` and ``created_by`` loaded from ``task``.
+    """
+    tasks = [
+        Task(
+            name=task.name,
+            description=task.description,
+            project=task.project,
+            date=task.date,
+            priority=task.priority,
+            created_by=task.created_by,
+            employee=employee,
+        )
+        for employee in employees
+    ]
+    Task.objects.bulk_create(tasks)
+    # bulk_create sends no post_save, which is what normally does this
+    bump_cache_version(entity_cache_namespace(Task))
+    index_objects(tasks)
+    logger.info(f"Task '{task.name}' assigned to {len(tasks)} employees")
+    return tasks
+
+
+def _sync_deadline_event(task):
+    try:
+        return GoogleCalendarService.create_task_deadline_event(task.employee, task)
+    except Exception as e:
+        return False, str(e)
+
+
+async def sync_task_deadline_events(tasks):
+    """
+    Create the deadline event for every task whose assignee has connected
+    Google Calendar, CALENDAR_SYNC_BATCH_SIZE calls at a time. Returns a
+    ``{employee_id: (synced, message)}`` map; ``synced`` is None when the
+    assignee has no calendar connected.
+    """
+    connected = set(await sync_to_async(list)(
+        GoogleCalendarCredentials.objects.filter(employee__in=[task.employee_id for task in tasks])
+        .values_list('employee_id', flat=True)
+    ))
+    results = {task.employee_id: (None, 'Calendar not connected') for task in tasks if task.employee_id not in connected}
+
+    pending = [task for task in tasks if task.employee_id in connected]
+    for start in range(0, len(pending), CALENDAR_SYNC_BATCH_SIZE):
+        batch = pending[start:start + CALENDAR_SYNC_BATCH_SIZE]
+        outcomes = await asyncio.gather(*(run_outbound(_sync_deadline_event, task) for task in batch))
+        for task, (success, message) in zip(batch, outcomes):
+            results[task.employee_id] = (success, message)
+            if not success:
+                logger.warning(f"Failed to sync task to {task.employee.get_full_name()}'s calendar: {message}")
+    return results
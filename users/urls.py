@@ -6,6 +6,7 @@ urlpatterns = [
     path('', views.home, name='home'),
     path('admin-dashboard/', views.admin_dashboard, name='admin_dashboard'),
     path('create-employee/', views.create_employee, name='create_employee'),
+    path('import-employees/', views.import_employees_csv, name='import_employees'),
     path('employee/<int:pk>/', views.employee_detail, name='employee_detail'),
     path('profile/', views.employee_profile, name='employee_profile'),
     path('login/', views.CustomLoginView.as_view(), name='login'),
@@ -25,16 +26,20 @@ urlpatterns = [
     path('google-calendar/disconnect/', views.google_calendar_disconnect, name='google_calendar_disconnect'),
     path('add-calendar-event/<int:employee_id>/', views.admin_add_calendar_event, name='admin_add_calendar_event'),
     # Task Management URLs
+    path('search/', views.search, name='search'),
     path('tasks/', views.task_list, name='task_list'),
     path('tasks/create/', views.create_task, name='create_task'),
+    path('tasks/bulk-create/', views.bulk_create_task, name='bulk_create_task'),
+    path('tasks/bulk-create/results/', views.bulk_create_task_results, name='bulk_create_task_results'),
     path('tasks/<int:pk>/', views.task_detail, name='task_detail'),
     path('tasks/<int:pk>/edit/', views.update_task, name='update_task'),
     path('tasks/<int:pk>/delete/', views.delete_task, name='delete_task'),
     path('my-tasks/', views.employee_tasks, name='employee_tasks'),
     path('my-tasks/<int:pk>/', views.employee_task_detail, name='employee_task_detail'),
     path('my-tasks/<int:pk>/complete/', views.mark_task_completed, name='mark_task_completed'),
-    # AJAX endpoint for getting project employees
+    # AJAX endpoints for employee lookups
     path('api/project/<str:project_id>/employees/', views.get_project_employees, name='get_project_employees'),
+    path('api/employees/search/', views.employee_search_api, name='employee_search_api'),
     # Leave Management URLs - Employee
     path('leaves/', views.employee_leave_dashboard, name='employee_leave_dashboard'),
     path('leaves/apply/', views.apply_leave, name='apply_leave'),
@@ -55,4 +60,11 @@ urlpatterns = [
     path('admin-attendance/today/', views.admin_attendance_today, name='admin_attendance_today'),
     path('admin-attendance/employee/<int:employee_id>/', views.admin_employee_attendance, name='admin_employee_attendance'),
     path('admin-attendance/mark/<int:employee_id>/', views.admin_mark_attendance, name='admin_mark_attendance'),
+    # Team Availability URLs - Admin
+    path('admin-availability/', views.team_availability, name='team_availability'),
+    path('api/availability/', views.team_availability_api, name='team_availability_api'),
+    # Database Pool URLs - Admin
+    path('api/db-pool/', views.db_pool_stats_api, name='db_pool_stats_api'),
+    # Prometheus metrics - token or admin
+    path('metrics', views.metrics, name='metrics'),
 ]
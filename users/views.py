@@ -1,23 +1,56 @@
-from django.shortcuts import render, redirect, get_object_or_404
+from django.shortcuts import render, redirect, get_object_or_404, aget_object_or_404
 from django.contrib.auth.decorators import login_required, user_passes_test
 from django.contrib import messages
-from .forms import EmployeeCreationForm, ProjectCreationForm, ProjectUpdateForm, TaskCreationForm, TaskUpdateForm, TaskCompletionForm, LeaveApplicationForm
-from .models import Employee, Project, ProjectCollaborator, GoogleCalendarCredentials, Task, LeaveType, LeaveBalance, LeaveApplication, Attendance
+from .forms import EmployeeCreationForm, ProjectCreationForm, ProjectUpdateForm, TaskCreationForm, BulkTaskCreationForm, TaskUpdateForm, TaskCompletionForm, LeaveApplicationForm, EmployeeFilterForm
+from .models import Employee, Project, ProjectCollaborator, GoogleCalendarCredentials, Task, LeaveType, LeaveBalance, LeaveApplication, Attendance, SearchEntry, EmployeeImport
 from django.contrib.auth.views import LoginView, PasswordChangeView
 from django.urls import reverse_lazy
+from django.template.loader import render_to_string
+from django.core.paginator import Paginator
 from django.contrib.auth import update_session_auth_hash
 from django.views.decorators.csrf import csrf_exempt
-from django.http import JsonResponse
-from django.db.models import Sum
+from django.http import JsonResponse, HttpResponse, HttpResponseForbidden
+from django.conf import settings
+from django.utils.crypto import constant_time_compare
+from django.db.models import Count, Prefetch, Q, Sum
 from django.utils import timezone
-from datetime import date, datetime
-import time
+from django.utils.functional import SimpleLazyObject
+from datetime import date, datetime, timedelta
+import asyncio
+import csv
+import io
 import logging
-
-from .google_calendar_utils import GoogleCalendarService
+from asgiref.sync import sync_to_async
+
+from .calendar_service import GoogleCalendarService
+from .availability_utils import parse_window, get_availability_matrix, day_state, away_counts
+from .business_day_utils import is_working_day, working_days_in_month
+from .leave_utils import get_leave_snapshot
+from .cache_utils import fragment_cache_context
+from .db_pool_utils import get_pool_stats
+from .db_routers import read_from_replica
+from .async_utils import run_outbound
+from .attendance_utils import check_in, check_out
+from .metrics import render_metrics
+from .employee_search_utils import EMPLOYEE_SEARCH_PAGE_SIZE, EMPLOYEE_SEARCH_MAX_PAGE_SIZE, search_employees, employee_search_result
+from .task_utils import sync_task_deadline_events
+from .overdue_utils import overdue_filter
+from .search_utils import SEARCH_PAGE_SIZE, search_entries
+from .onboarding_utils import IMPORT_COLUMNS, REQUIRED_COLUMNS, WEB_IMPORT_MAX_ROWS, read_employee_csv, decode_upload, queue_import
 
 logger = logging.getLogger(__name__)
 
+# Validation errors listed on the CSV import page
+IMPORT_ERRORS_SHOWN = 50
+# Queued uploads listed on the CSV import page
+RECENT_IMPORTS_SHOWN = 10
+# Rows per page of the admin employee directory
+EMPLOYEE_DIRECTORY_PAGE_SIZE = 25
+# Tasks per infinite-scroll page of "My Tasks"
+EMPLOYEE_TASKS_PAGE_SIZE = 20
+# Session entry holding [task id, calendar synced, message] rows of the last bulk assignment
+BULK_TASK_RESULTS_SESSION_KEY = 'bulk_task_results'
+
 def add_project_calendar_events(project, collaborators_list=None):
     """
     Add calendar events for project start and deadline for all collaborators
@@ -25,7 +58,7 @@ def add_project_calendar_events(project, collaborators_list=None):
     """
     if collaborators_list is None:
         # Get all collaborators for the project
-        collaborators = ProjectCollaborator.objects.filter(project=project).select_related('employee')
+        collaborators = ProjectCollaborator.visible().filter(project=project).select_related('employee')
         collaborators_list = [collab.employee for collab in collaborators]
     
     events_added = []
@@ -68,53 +101,100 @@ def is_admin(user):
 @login_required
 @user_passes_test(is_admin)
 def admin_dashboard(request):
-    employees = Employee.objects.all()
-    return render(request, 'users/admin_dashboard.html', {'employees': employees})
+    department = request.GET.get('department', '')
+    if department not in dict(Employee.DEPARTMENT_CHOICES):
+        department = ''
+    paginator = Paginator(Employee.directory(department=department), EMPLOYEE_DIRECTORY_PAGE_SIZE)
+    return render(request, 'users/admin_dashboard.html', {
+        # Lazy, so a cached table fragment never runs the COUNT or page query
+        'page_obj': SimpleLazyObject(lambda: paginator.get_page(request.GET.get('page'))),
+        'department_choices': Employee.DEPARTMENT_CHOICES,
+        'selected_department': department,
+        **fragment_cache_context(request, Employee, Attendance, Task),
+    })
 
 @login_required
 @user_passes_test(is_admin)
-def create_employee(request):
+async def create_employee(request):
     if request.method == 'POST':
         form = EmployeeCreationForm(request.POST)
-        if form.is_valid():
-            employee = form.save()
-            messages.success(request, f'Employee {employee.get_full_name()} created successfully! Login credentials have been sent to {employee.email}.')
+        if await sync_to_async(form.is_valid)():
+            employee = await sync_to_async(form.save)()
+            messages.success(request, f'Employee {employee.get_full_name()} created successfully! Login credentials will be emailed to {employee.email}.')
             return redirect('admin_dashboard')
         else:
             messages.error(request, 'Please correct the errors below.')
     else:
         form = EmployeeCreationForm()
-    return render(request, 'users/create_employee.html', {'form': form})
+    return await sync_to_async(render)(request, 'users/create_employee.html', {'form': form})
+
+@login_required
+@user_passes_test(is_admin)
+def import_employees_csv(request):
+    """Admin upload for onboarding employees in bulk from a CSV file"""
+    context = {'columns': IMPORT_COLUMNS, 'required_columns': REQUIRED_COLUMNS, 'max_rows': WEB_IMPORT_MAX_ROWS}
+    if request.method == 'POST':
+        uploaded_file = request.FILES.get('csv_file')
+        if uploaded_file is None:
+            messages.error(request, 'Please choose a CSV file to import.')
+        else:
+            try:
+                csv_text = decode_upload(uploaded_file).read()
+                employees, errors = read_employee_csv(io.StringIO(csv_text))
+            except (UnicodeDecodeError, csv.Error) as e:
+                employees, errors = [], [(1, f'Could not read the file as UTF-8 CSV: {e}')]
+            if errors:
+                context.update({'errors': errors[:IMPORT_ERRORS_SHOWN], 'error_count': len(errors)})
+            elif not employees:
+                messages.error(request, 'The file does not contain any employees.')
+            elif len(employees) > WEB_IMPORT_MAX_ROWS:
+                messages.error(
+                    request,
+                    f'The file has {len(employees)} employees; up to {WEB_IMPORT_MAX_ROWS} can be imported here. '
+                    f'Import larger files with "python manage.py import_employees".',
+                )
+            else:
+                # Password hashing takes too long for a request; the import_employees worker does it
+                queue_import(csv_text, len(employees), request.user)
+                messages.success(
+                    request,
+                    f'{len(employees)} employees validated and queued for import. '
+                    'Login credentials will be emailed to them once they are created.',
+                )
+                return redirect('import_employees')
+    context['recent_imports'] = EmployeeImport.objects.select_related('uploaded_by')[:RECENT_IMPORTS_SHOWN]
+    return render(request, 'users/import_employees.html', context)
 
 @login_required
 @user_passes_test(is_admin)
 def delete_employee(request, pk):
     if request.method == 'POST':
-        employee = Employee.objects.get(pk=pk)
-        employee_name = employee.get_full_name()
-        employee.delete()
-        messages.success(request, f'Employee "{employee_name}" deleted successfully!')
+        employee = get_object_or_404(Employee, pk=pk)
+        # Hidden and signed out now; the purge_deleted worker removes their data
+        employee.soft_delete()
+        messages.success(request, f'Employee "{employee.get_full_name()}" deleted successfully!')
         return redirect('admin_dashboard')
 
 @login_required
 @user_passes_test(is_admin)
+@read_from_replica
 def employee_detail(request, pk):
     """Admin view to see detailed employee information and task contributions"""
     employee = get_object_or_404(Employee, pk=pk)
     
     # Get all projects where employee is a collaborator
-    project_collaborations = ProjectCollaborator.objects.filter(employee=employee).select_related('project')
+    project_collaborations = ProjectCollaborator.objects.filter(employee=employee, project__deleted_at__isnull=True).select_related('project')
     projects = [collab.project for collab in project_collaborations]
     
     # Get all tasks assigned to this employee
-    tasks = Task.objects.filter(employee=employee).select_related('project').order_by('-date')
+    tasks = Task.visible().filter(employee=employee).select_related('project').order_by('-date')
     
     # Calculate task statistics
     total_tasks = tasks.count()
     completed_tasks = tasks.filter(status='COMPLETED').count()
     pending_tasks = tasks.filter(status='PENDING').count()
     in_progress_tasks = tasks.filter(status='IN_PROGRESS').count()
-    overdue_tasks = tasks.filter(status__in=['PENDING', 'IN_PROGRESS'], date__lt=date.today()).count()
+    overdue_tasks = tasks.filter(overdue_filter()).count()
     
     # Calculate completion percentage
     completion_percentage = (completed_tasks / total_tasks * 100) if total_tasks > 0 else 0
@@ -190,19 +270,25 @@ def home(request):
 @login_required
 @user_passes_test(is_admin)
 def project_list(request):
-    projects = Project.objects.all().prefetch_related('collaborators__employee', 'project_tasks')
+    # Soft-deleted collaborators stay hidden until they are purged
+    projects = Project.objects.all().prefetch_related(
+        Prefetch('collaborators', queryset=ProjectCollaborator.visible().select_related('employee')),
+    )
     
     # Calculate completion percentage for each project
-    projects_with_completion = []
-    for project in projects:
-        projects_with_completion.append({
+    # (lazily, so a cached fragment never evaluates it)
+    projects_with_completion = SimpleLazyObject(lambda: [
+        {
             'project': project,
             'completion_percentage': project.get_completion_percentage()
-        })
+        }
+        for project in projects
+    ])
     
     return render(request, 'users/project_list.html', {
         'projects': projects,
-        'projects_with_completion': projects_with_completion
+        'projects_with_completion': projects_with_completion,
+        **fragment_cache_context(request, Project, ProjectCollaborator, Task, Employee),
     })
 
 @login_required
@@ -251,19 +337,20 @@ def create_project(request):
 
 @login_required
 @user_passes_test(is_admin)
+@read_from_replica
 def project_detail(request, pk):
     project = Project.objects.get(pk=pk)
-    collaborators = ProjectCollaborator.objects.filter(project=project).select_related('employee')
+    collaborators = ProjectCollaborator.visible().filter(project=project).select_related('employee')
     
     # Get all tasks associated with this project
-    tasks = Task.objects.filter(project=project).select_related('employee').order_by('-date')
+    tasks = Task.visible().filter(project=project).select_related('employee').order_by('-date')
     
     # Calculate task statistics
     total_tasks = tasks.count()
     completed_tasks = tasks.filter(status='COMPLETED').count()
     pending_tasks = tasks.filter(status='PENDING').count()
     in_progress_tasks = tasks.filter(status='IN_PROGRESS').count()
-    overdue_tasks = tasks.filter(status__in=['PENDING', 'IN_PROGRESS'], date__lt=date.today()).count()
+    overdue_tasks = tasks.filter(overdue_filter()).count()
     
     # Calculate completion percentage
     completion_percentage = (completed_tasks / total_tasks * 100) if total_tasks > 0 else 0
@@ -301,7 +388,7 @@ def update_project(request, pk):
         # Store original project data before form save
         original_start_date = project.start_date
         original_end_date = project.end_date
-        current_collaborators = set(ProjectCollaborator.objects.filter(project=project).values_list('employee_id', flat=True))
+        current_collaborators = set(ProjectCollaborator.visible().filter(project=project).values_list('employee_id', flat=True))
         
         form = ProjectUpdateForm(request.POST, instance=project)
         if form.is_valid():
@@ -413,7 +500,7 @@ def sync_all_existing_projects_for_employee(employee):
     """
     try:
         # Get all projects where this employee is a collaborator
-        collaborations = ProjectCollaborator.objects.filter(employee=employee).select_related('project')
+        collaborations = ProjectCollaborator.objects.filter(employee=employee, project__deleted_at__isnull=True).select_related('project')
         projects = [collab.project for collab in collaborations]
         
         total_events_added = 0
@@ -436,39 +523,9 @@ def sync_all_existing_projects_for_employee(employee):
 def delete_project(request, pk):
     if request.method == 'POST':
         project = get_object_or_404(Project, pk=pk)
-        project_name = project.name
-        
-        # Automatically remove calendar events for all collaborators before deleting
-        try:
-            collaborators = ProjectCollaborator.objects.filter(project=project).select_related('employee')
-            events_removed_count = 0
-            
-            for collab in collaborators:
-                try:
-                    calendar_creds = GoogleCalendarCredentials.objects.get(employee=collab.employee)
-                    success, message = GoogleCalendarService.delete_project_events(collab.employee, project)
-                    if success:
-                        events_removed_count += 1
-                        logger.info(f"Removed calendar events for {collab.employee.get_full_name()} from deleted project {project_name}")
-                except GoogleCalendarCredentials.DoesNotExist:
-                    logger.info(f"No calendar credentials for {collab.employee.get_full_name()}")
-                    continue
-                except Exception as e:
-                    logger.error(f"Error removing calendar events for {collab.employee.get_full_name()}: {str(e)}")
-            
-            project.delete()
-            
-            if events_removed_count > 0:
-                messages.success(request, f'Project "{project_name}" deleted successfully! Calendar events removed for {events_removed_count} team member{"s" if events_removed_count != 1 else ""}.')
-            else:
-                messages.success(request, f'Project "{project_name}" deleted successfully!')
-                
-        except Exception as e:
-            logger.error(f"Error during project deletion: {str(e)}")
-            project.delete()  # Still delete the project even if calendar cleanup fails
-            messages.success(request, f'Project "{project_name}" deleted successfully!')
-            messages.warning(request, "Some calendar events might not have been removed.")
-        
+        # Hidden now; the purge_deleted worker removes its calendar events and data
+        project.soft_delete()
+        messages.success(request, f'Project "{project.name}" deleted successfully! Team calendar events will be removed shortly.')
         return redirect('project_list')
 
 @login_required
@@ -478,23 +535,28 @@ def employee_projects(request):
         return redirect('project_list')  # Admins should use the main project list
     
     collaborations = ProjectCollaborator.objects.filter(
-        employee=request.user
-    ).select_related('project').prefetch_related('project__project_tasks').order_by('-project__created_at')
+        employee=request.user, project__deleted_at__isnull=True
+    ).select_related('project').prefetch_related(
+        Prefetch('project__collaborators', queryset=ProjectCollaborator.visible())
+    ).order_by('-project__created_at')
     
-    projects = [collaboration.project for collaboration in collaborations]
+    projects = SimpleLazyObject(lambda: [collaboration.project for collaboration in collaborations])
     
     # Calculate completion percentage for each project
-    projects_with_completion = []
-    for project in projects:
-        projects_with_completion.append({
+    # (lazily, so a cached fragment never evaluates it)
+    projects_with_completion = SimpleLazyObject(lambda: [
+        {
             'project': project,
             'completion_percentage': project.get_completion_percentage()
-        })
+        }
+        for project in projects
+    ])
     
     return render(request, 'users/employee_projects.html', {
         'projects': projects,
         'collaborations': collaborations,
-        'projects_with_completion': projects_with_completion
+        'projects_with_completion': projects_with_completion,
+        **fragment_cache_context(request, Project, ProjectCollaborator, Task, Employee),
     })
 
 @login_required
@@ -512,7 +574,7 @@ def employee_project_detail(request, pk):
             messages.error(request, "You don't have access to this project.")
             return redirect('employee_projects')
     
-    collaborators = ProjectCollaborator.objects.filter(project=project).select_related('employee')
+    collaborators = ProjectCollaborator.visible().filter(project=project).select_related('employee')
     user_role = None
     
     if not request.user.is_superuser:
@@ -547,11 +609,12 @@ def google_calendar_connect(request):
 
 
 @csrf_exempt
-def google_calendar_callback(request):
+async def google_calendar_callback(request):
     """Handle Google Calendar OAuth2 callback with session validation"""
     
+    user = await request.auser()
     logger.info(f"OAuth callback received. Session key: {request.session.session_key}")
-    logger.info(f"User authenticated: {request.user.is_authenticated}")
+    logger.info(f"User authenticated: {user.is_authenticated}")
     logger.info(f"Request method: {request.method}")
     logger.info(f"Request URL: {request.build_absolute_uri()}")
     
@@ -568,8 +631,8 @@ def google_calendar_callback(request):
             
             if session_key:
                 # Try to access session data that should exist
-                auth_state = request.session.get('google_auth_state')
-                employee_id = request.session.get('google_auth_employee_id')
+                auth_state = await request.session.aget('google_auth_state')
+                employee_id = await request.session.aget('google_auth_employee_id')
                 
                 logger.info(f"Session data - Auth state exists: {bool(auth_state)}, Employee ID: {employee_id}")
                 
@@ -585,7 +648,7 @@ def google_calendar_callback(request):
             
             if not session_loaded:
                 logger.info(f"Session not ready, waiting... (attempt {retry_count + 1})")
-                time.sleep(0.5)  # Wait 500ms before retry
+                await asyncio.sleep(0.5)  # Wait 500ms before retry
                 retry_count += 1
                 
         except Exception as e:
@@ -594,23 +657,23 @@ def google_calendar_callback(request):
             if retry_count >= max_retries:
                 messages.error(request, "Session loading failed. Please try connecting again.")
                 return redirect('employee_profile')
-            time.sleep(0.5)
+            await asyncio.sleep(0.5)
     
     # # Check if user is logged in after session is loaded
-    if not request.user.is_authenticated:
+    if not user.is_authenticated:
         logger.warning("User not authenticated after session loading")
         messages.error(request, "You must be logged in to connect Google Calendar.")
         return redirect('login')
     
     # Process the OAuth callback
     logger.info("Processing OAuth callback with GoogleCalendarService")
-    success, message = GoogleCalendarService.handle_callback(request)
+    success, message = await run_outbound(GoogleCalendarService.handle_callback, request)
     if success:
         logger.info(f"OAuth callback successful: {message}")
         
         # Automatically sync calendar events for existing projects
         try:
-            total_events_added, synced_projects = sync_all_existing_projects_for_employee(request.user)
+            total_events_added, synced_projects = await run_outbound(sync_all_existing_projects_for_employee, user)
             
             if total_events_added > 0:
                 if len(synced_projects) == 1:
@@ -651,16 +714,14 @@ def google_calendar_disconnect(request):
 
 @login_required
 @user_passes_test(is_admin)
-def admin_add_calendar_event(request, employee_id):
+async def admin_add_calendar_event(request, employee_id):
     """Admin view to add events to employee's Google Calendar for testing"""
     from datetime import datetime, timedelta
     
-    employee = get_object_or_404(Employee, pk=employee_id)
+    employee = await aget_object_or_404(Employee, pk=employee_id)
     
     # Check if employee has Google Calendar connected
-    try:
-        credentials = GoogleCalendarCredentials.objects.get(employee=employee)
-    except GoogleCalendarCredentials.DoesNotExist:
+    if not await GoogleCalendarCredentials.objects.filter(employee=employee).aexists():
         messages.error(request, f'{employee.get_full_name()} has not connected their Google Calendar.')
         return redirect('admin_dashboard')
     
@@ -697,7 +758,7 @@ def admin_add_calendar_event(request, employee_id):
                 },
             }
             
-            success, result = GoogleCalendarService.create_event(employee, event_data)
+            success, result = await run_outbound(GoogleCalendarService.create_event, employee, event_data)
             
             if success:
                 messages.success(request, f'Event "{title}" added to {employee.get_full_name()}\'s calendar successfully!')
@@ -708,7 +769,7 @@ def admin_add_calendar_event(request, employee_id):
         except Exception as e:
             messages.error(request, f'Error creating event: {str(e)}')
     
-    return render(request, 'users/admin_add_calendar_event.html', {
+    return await sync_to_async(render)(request, 'users/admin_add_calendar_event.html', {
         'employee': employee
     })
 
@@ -717,11 +778,32 @@ def admin_add_calendar_event(request, employee_id):
 # TASK MANAGEMENT VIEWS
 # ============================================
 
+@login_required
+def search(request):
+    """Ranked full-text search over the tasks, projects and leave the user may see"""
+    query = request.GET.get('q', '').strip()
+    kind = request.GET.get('kind', '')
+    if kind not in dict(SearchEntry.KIND_CHOICES):
+        kind = ''
+
+    page_obj = None
+    if query:
+        paginator = Paginator(search_entries(request.user, query, kind), SEARCH_PAGE_SIZE)
+        page_obj = paginator.get_page(request.GET.get('page'))
+
+    return render(request, 'users/search.html', {
+        'query': query,
+        'selected_kind': kind,
+        'kind_choices': SearchEntry.KIND_CHOICES,
+        'page_obj': page_obj,
+    })
+
+
 @login_required
 @user_passes_test(is_admin)
 def task_list(request):
     """Admin view to list all tasks with filtering options"""
-    tasks = Task.objects.all().select_related('employee', 'created_by')
+    tasks = Task.visible().select_related('employee', 'created_by')
     
     # Filter by employee
     employee_id = request.GET.get('employee')
@@ -741,26 +823,23 @@ def task_list(request):
     if date_to:
         tasks = tasks.filter(date__lte=date_to)
     
-    # Get employees for filter dropdown
-    employees = Employee.objects.filter(is_superuser=False).order_by('first_name', 'last_name')
-    
-    # Get task statistics
-    total_tasks = tasks.count()
-    pending_tasks = tasks.filter(status='PENDING').count()
-    completed_tasks = tasks.filter(status='COMPLETED').count()
-    overdue_tasks = tasks.filter(status='PENDING', date__lt=date.today()).count()
+    # Get task statistics (lazily, so a cached fragment never evaluates them)
+    task_stats = SimpleLazyObject(lambda: tasks.aggregate(
+        total=Count('id'),
+        pending=Count('id', filter=Q(status='PENDING')),
+        completed=Count('id', filter=Q(status='COMPLETED')),
+        overdue=Count('id', filter=overdue_filter()),
+    ))
     
     context = {
         'tasks': tasks,
-        'employees': employees,
-        'total_tasks': total_tasks,
-        'pending_tasks': pending_tasks,
-        'completed_tasks': completed_tasks,
-        'overdue_tasks': overdue_tasks,
+        'employee_filter': EmployeeFilterForm(request.GET),
+        'task_stats': task_stats,
         'selected_employee': employee_id,
         'selected_status': status,
         'selected_date_from': date_from,
         'selected_date_to': date_to,
+        **fragment_cache_context(request, Task, Employee, Project),
     }
     
     return render(request, 'users/task_list.html', context)
@@ -805,11 +884,57 @@ def create_task(request):
     })
 
 
+@login_required
+@user_passes_test(is_admin)
+async def bulk_create_task(request):
+    """Admin view to assign one task to several employees or a whole project team"""
+    if request.method == 'POST':
+        form = BulkTaskCreationForm(request.POST)
+        if await sync_to_async(form.is_valid)():
+            tasks = await sync_to_async(form.save)(created_by=await request.auser())
+            calendar_results = await sync_task_deadline_events(tasks)
+            messages.success(request, f'Task "{tasks[0].name}" assigned to {len(tasks)} employee{"s" if len(tasks) != 1 else ""}!')
+            # Post/Redirect/Get: refreshing the results page must not assign the task again
+            await request.session.aset(BULK_TASK_RESULTS_SESSION_KEY, [
+                [task.pk, *calendar_results[task.employee_id]] for task in tasks
+            ])
+            return redirect('bulk_create_task_results')
+        else:
+            messages.error(request, 'Please correct the errors below.')
+    else:
+        form = BulkTaskCreationForm(initial={'date': date.today()})
+
+    return await sync_to_async(render)(request, 'users/bulk_create_task.html', {'form': form})
+
+
+@login_required
+@user_passes_test(is_admin)
+def bulk_create_task_results(request):
+    """Admin view showing the tasks and calendar events of the last bulk assignment"""
+    stashed = request.session.get(BULK_TASK_RESULTS_SESSION_KEY)
+    if not stashed:
+        return redirect('bulk_create_task')
+
+    tasks = Task.visible().filter(pk__in=[task_id for task_id, *_ in stashed]).select_related('employee').in_bulk()
+    results = [
+        {'task': tasks[task_id], 'calendar_synced': synced, 'calendar_message': message}
+        for task_id, synced, message in stashed
+        if task_id in tasks
+    ]
+    if not results:
+        return redirect('task_list')
+    return render(request, 'users/bulk_create_task_results.html', {
+        'results': results,
+        'synced_count': sum(1 for result in results if result['calendar_synced']),
+        'failed_count': sum(1 for result in results if result['calendar_synced'] is False),
+    })
+
+
 @login_required
 @user_passes_test(is_admin)
 def task_detail(request, pk):
     """Admin view to see task details"""
-    task = get_object_or_404(Task, pk=pk)
+    task = get_object_or_404(Task.visible(), pk=pk)
     
     context = {
         'task': task,
@@ -822,7 +947,7 @@ def task_detail(request, pk):
 @user_passes_test(is_admin)
 def update_task(request, pk):
     """Admin view to update a task"""
-    task = get_object_or_404(Task, pk=pk)
+    task = get_object_or_404(Task.visible(), pk=pk)
     
     if request.method == 'POST':
         form = TaskUpdateForm(request.POST, instance=task)
@@ -846,7 +971,7 @@ def update_task(request, pk):
 def delete_task(request, pk):
     """Admin view to delete a task"""
     if request.method == 'POST':
-        task = get_object_or_404(Task, pk=pk)
+        task = get_object_or_404(Task.visible(), pk=pk)
         task_name = task.name
         employee_name = task.employee.get_full_name()
         task.delete()
@@ -861,26 +986,50 @@ def employee_tasks(request):
         return redirect('task_list')  # Admins should use the main task list
     
     # Get tasks assigned to the current employee
-    tasks = Task.objects.filter(employee=request.user).order_by('-created_at')
+    all_tasks = Task.visible().filter(employee=request.user).order_by('-created_at', '-pk')
     
-    # Filter by status if requested
+    # Filter by status if requested; the summary cards always cover every task
     status = request.GET.get('status')
-    if status:
-        tasks = tasks.filter(status=status)
+    tasks = all_tasks.filter(status=status) if status else all_tasks
+    
+    if request.GET.get('format') == 'json':
+        # Infinite-scroll page: one LIMIT query, the extra row tells whether more follow
+        try:
+            page = max(int(request.GET.get('page', 1)), 1)
+        except ValueError:
+            return JsonResponse({'error': 'page must be an integer'}, status=400)
+        offset = (page - 1) * EMPLOYEE_TASKS_PAGE_SIZE
+        rows = list(tasks[offset:offset + EMPLOYEE_TASKS_PAGE_SIZE + 1])
+        return JsonResponse({
+            'html': render_to_string(
+                'users/partials/employee_task_cards.html',
+                {'tasks': rows[:EMPLOYEE_TASKS_PAGE_SIZE]},
+                request=request,
+            ),
+            'page': page,
+            'has_next': len(rows) > EMPLOYEE_TASKS_PAGE_SIZE,
+        })
     
-    # Get task statistics for the employee
-    total_tasks = Task.objects.filter(employee=request.user).count()
-    pending_tasks = Task.objects.filter(employee=request.user, status='PENDING').count()
-    completed_tasks = Task.objects.filter(employee=request.user, status='COMPLETED').count()
-    overdue_tasks = Task.objects.filter(employee=request.user, status='PENDING', date__lt=date.today()).count()
+    # Get task statistics in one aggregate (lazily, so a cached fragment never evaluates them)
+    task_stats = SimpleLazyObject(lambda: all_tasks.aggregate(
+        total=Count('id'),
+        pending=Count('id', filter=Q(status='PENDING')),
+        completed=Count('id', filter=Q(status='COMPLETED')),
+        overdue=Count('id', filter=overdue_filter()),
+        listed=Count('id', filter=Q(status=status)) if status else Count('id'),
+    ))
+    
+    def first_page():
+        paginator = Paginator(tasks, EMPLOYEE_TASKS_PAGE_SIZE)
+        # The aggregate already counted the list, so skip the paginator's own COUNT
+        paginator.count = task_stats['listed']
+        return paginator.get_page(request.GET.get('page'))
     
     context = {
-        'tasks': tasks,
-        'total_tasks': total_tasks,
-        'pending_tasks': pending_tasks,
-        'completed_tasks': completed_tasks,
-        'overdue_tasks': overdue_tasks,
+        'page_obj': SimpleLazyObject(first_page),
+        'task_stats': task_stats,
         'selected_status': status,
+        **fragment_cache_context(request, Task, Project),
     }
     
     return render(request, 'users/employee_tasks.html', context)
@@ -889,7 +1038,7 @@ def employee_tasks(request):
 @login_required
 def employee_task_detail(request, pk):
     """Employee view to see task details and mark as completed"""
-    task = get_object_or_404(Task, pk=pk, employee=request.user)
+    task = get_object_or_404(Task.visible(), pk=pk, employee=request.user)
     
     if request.method == 'POST' and task.status == 'PENDING':
         form = TaskCompletionForm(request.POST, instance=task)
@@ -913,7 +1062,7 @@ def employee_task_detail(request, pk):
 @login_required
 def mark_task_completed(request, pk):
     """Quick action to mark a task as completed without form"""
-    task = get_object_or_404(Task, pk=pk, employee=request.user)
+    task = get_object_or_404(Task.visible(), pk=pk, employee=request.user)
     
     if request.method == 'POST' and task.status == 'PENDING':
         task.mark_completed()
@@ -922,6 +1071,37 @@ def mark_task_completed(request, pk):
     return redirect('employee_tasks')
 
 
+@login_required
+@user_passes_test(is_admin)
+def employee_search_api(request):
+    """
+    One page of employees matching ``q`` for autocomplete widgets.
+    Optional ``department`` and ``project`` narrow the results; ``offset``
+    and ``limit`` page through them.
+    """
+    try:
+        offset = max(int(request.GET.get('offset', 0)), 0)
+        limit = min(max(int(request.GET.get('limit', EMPLOYEE_SEARCH_PAGE_SIZE)), 1), EMPLOYEE_SEARCH_MAX_PAGE_SIZE)
+    except ValueError:
+        return JsonResponse({'error': 'offset and limit must be integers'}, status=400)
+    project_id = request.GET.get('project')
+    if project_id and not project_id.isdigit():
+        return JsonResponse({'error': 'project must be a project id'}, status=400)
+
+    employees, has_next = search_employees(
+        request.GET.get('q', ''),
+        department=request.GET.get('department') or None,
+        project_id=project_id or None,
+        offset=offset,
+        limit=limit,
+    )
+    return JsonResponse({
+        'results': [employee_search_result(employee) for employee in employees],
+        'offset': offset,
+        'has_next': has_next,
+    })
+
+
 @login_required
 @user_passes_test(is_admin)
 def get_project_employees(request, project_id):
@@ -932,7 +1112,7 @@ def get_project_employees(request, project_id):
             employees = Employee.objects.filter(is_superuser=False).values('id', 'first_name', 'last_name', 'username')
         else:
             # Get employees who are collaborators on this project
-            collaborators = ProjectCollaborator.objects.filter(project_id=project_id).select_related('employee')
+            collaborators = ProjectCollaborator.visible().filter(project_id=project_id).select_related('employee')
             employees = [
                 {
                     'id': collab.employee.id,
@@ -961,35 +1141,14 @@ def employee_leave_dashboard(request):
     
     current_year = date.today().year
     
-    # Get leave balances for current year
-    leave_balances = LeaveBalance.objects.filter(
-        employee=request.user,
-        year=current_year
-    ).select_related('leave_type')
-    
-    # Get recent leave applications (last 10)
-    recent_applications = LeaveApplication.objects.filter(
-        employee=request.user
-    ).select_related('leave_type', 'reviewed_by').order_by('-applied_at')[:10]
-    
-    # Get pending applications count
-    pending_count = LeaveApplication.objects.filter(
-        employee=request.user,
-        status='PENDING'
-    ).count()
-    
-    # Calculate total leaves stats
-    total_leaves = leave_balances.aggregate(
-        total=Sum('total_days'),
-        used=Sum('used_days'),
-        remaining=Sum('remaining_days')
-    )
+    # Balances, totals, recent applications and counts come from the cached snapshot
+    snapshot = get_leave_snapshot(request.user.id, current_year)
     
     context = {
-        'leave_balances': leave_balances,
-        'recent_applications': recent_applications,
-        'pending_count': pending_count,
-        'total_leaves': total_leaves,
+        'leave_balances': snapshot['leave_balances'],
+        'recent_applications': snapshot['recent_applications'],
+        'pending_count': snapshot['status_counts']['pending'],
+        'total_leaves': snapshot['total_leaves'],
         'current_year': current_year,
     }
     
@@ -1021,14 +1180,11 @@ def apply_leave(request):
     
     # Get current balances for display
     current_year = date.today().year
-    leave_balances = LeaveBalance.objects.filter(
-        employee=request.user,
-        year=current_year
-    ).select_related('leave_type')
+    snapshot = get_leave_snapshot(request.user.id, current_year)
     
     context = {
         'form': form,
-        'leave_balances': leave_balances,
+        'leave_balances': snapshot['leave_balances'],
     }
     
     return render(request, 'users/apply_leave.html', context)
@@ -1073,7 +1229,7 @@ def cancel_leave_application(request, pk):
 @user_passes_test(is_admin)
 def admin_leave_requests(request):
     """Admin view to see all leave requests with filtering"""
-    applications = LeaveApplication.objects.all().select_related(
+    applications = LeaveApplication.visible().select_related(
         'employee',
         'leave_type',
         'reviewed_by'
@@ -1100,18 +1256,17 @@ def admin_leave_requests(request):
     if leave_type_id:
         applications = applications.filter(leave_type_id=leave_type_id)
     
-    # Get employees and leave types for filters
-    employees = Employee.objects.filter(is_superuser=False).order_by('first_name', 'last_name')
+    # Leave types for the filter; employees are searched by the autocomplete
     leave_types = LeaveType.objects.all()
     
     # Get statistics
-    pending_count = LeaveApplication.objects.filter(status='PENDING').count()
-    approved_count = LeaveApplication.objects.filter(status='APPROVED').count()
-    rejected_count = LeaveApplication.objects.filter(status='REJECTED').count()
+    pending_count = LeaveApplication.visible().filter(status='PENDING').count()
+    approved_count = LeaveApplication.visible().filter(status='APPROVED').count()
+    rejected_count = LeaveApplication.visible().filter(status='REJECTED').count()
     
     context = {
         'applications': applications,
-        'employees': employees,
+        'employee_filter': EmployeeFilterForm(request.GET),
         'leave_types': leave_types,
         'pending_count': pending_count,
         'approved_count': approved_count,
@@ -1128,7 +1283,7 @@ def admin_leave_requests(request):
 @user_passes_test(is_admin)
 def admin_leave_detail(request, pk):
     """Admin view to see leave application details"""
-    application = get_object_or_404(LeaveApplication, pk=pk)
+    application = get_object_or_404(LeaveApplication.visible(), pk=pk)
     
     # Get employee's leave balance for the application year
     leave_balance = LeaveBalance.objects.filter(
@@ -1147,20 +1302,23 @@ def admin_leave_detail(request, pk):
 
 @login_required
 @user_passes_test(is_admin)
-def approve_leave(request, pk):
+async def approve_leave(request, pk):
     """Admin action to approve a leave application"""
-    application = get_object_or_404(LeaveApplication, pk=pk, status='PENDING')
+    application = await aget_object_or_404(
+        LeaveApplication.visible().select_related('employee', 'leave_type'), pk=pk, status='PENDING'
+    )
     
     if request.method == 'POST':
         remarks = request.POST.get('admin_remarks', '')
         
         try:
             # Use the model's approve method which handles balance deduction
-            application.approve(admin=request.user, remarks=remarks)
+            await sync_to_async(application.approve)(admin=await request.auser(), remarks=remarks)
             
             # Sync with Google Calendar if employee has it connected
             try:
-                calendar_success, calendar_message = GoogleCalendarService.create_leave_event(
+                calendar_success, calendar_message = await run_outbound(
+                    GoogleCalendarService.create_leave_event,
                     application.employee, 
                     application
                 )
@@ -1190,7 +1348,7 @@ def approve_leave(request, pk):
 @user_passes_test(is_admin)
 def reject_leave(request, pk):
     """Admin action to reject a leave application"""
-    application = get_object_or_404(LeaveApplication, pk=pk, status='PENDING')
+    application = get_object_or_404(LeaveApplication.visible(), pk=pk, status='PENDING')
     
     if request.method == 'POST':
         remarks = request.POST.get('admin_remarks', '')
@@ -1213,44 +1371,31 @@ def reject_leave(request, pk):
 
 @login_required
 @user_passes_test(is_admin)
+@read_from_replica
 def employee_leave_summary(request, employee_id):
     """Admin view to see an employee's complete leave summary"""
     employee = get_object_or_404(Employee, pk=employee_id)
     current_year = date.today().year
     
-    # Get leave balances for current year
-    leave_balances = LeaveBalance.objects.filter(
-        employee=employee,
-        year=current_year
-    ).select_related('leave_type')
+    # Balances and statistics come from the cached snapshot
+    snapshot = get_leave_snapshot(employee.id, current_year)
+    status_counts = snapshot['status_counts']
     
     # Get all leave applications for the employee
     applications = LeaveApplication.objects.filter(
         employee=employee
     ).select_related('leave_type', 'reviewed_by').order_by('-applied_at')
     
-    # Get statistics
-    total_applications = applications.count()
-    pending_applications = applications.filter(status='PENDING').count()
-    approved_applications = applications.filter(status='APPROVED').count()
-    rejected_applications = applications.filter(status='REJECTED').count()
-    
-    # Calculate total leaves used this year
-    approved_this_year = applications.filter(
-        status='APPROVED',
-        start_date__year=current_year
-    ).aggregate(total=Sum('total_days'))['total'] or 0
-    
     context = {
         'employee': employee,
-        'leave_balances': leave_balances,
+        'leave_balances': snapshot['leave_balances'],
         'applications': applications,
         'current_year': current_year,
-        'total_applications': total_applications,
-        'pending_applications': pending_applications,
-        'approved_applications': approved_applications,
-        'rejected_applications': rejected_applications,
-        'approved_this_year': approved_this_year,
+        'total_applications': status_counts['total'],
+        'pending_applications': status_counts['pending'],
+        'approved_applications': status_counts['approved'],
+        'rejected_applications': status_counts['rejected'],
+        'approved_this_year': status_counts['approved_this_year'],
     }
     
     return render(request, 'users/employee_leave_summary.html', context)
@@ -1268,13 +1413,17 @@ def employee_attendance_dashboard(request):
         return redirect('admin_attendance_today')
     
     today = date.today()
+    working_day = is_working_day(today)
     
-    # Get or create today's attendance record
-    attendance_today, created = Attendance.objects.get_or_create(
-        employee=request.user,
-        date=today,
-        defaults={'status': 'ABSENT'}
-    )
+    # Get or create today's attendance record; non-working days get no ABSENT row
+    if working_day:
+        attendance_today, created = Attendance.objects.get_or_create(
+            employee=request.user,
+            date=today,
+            defaults={'status': 'ABSENT'}
+        )
+    else:
+        attendance_today = Attendance.objects.filter(employee=request.user, date=today).first()
     
     # Get this month's attendance records
     from datetime import datetime
@@ -1294,12 +1443,16 @@ def employee_attendance_dashboard(request):
     late_days = monthly_records.filter(status='LATE').count()
     on_leave_days = monthly_records.filter(status='ON_LEAVE').count()
     
-    attendance_rate = (present_days / total_days * 100) if total_days > 0 else 0
+    # Attendance rate is measured against working days elapsed this month
+    working_days = working_days_in_month(current_year, current_month, through=today)
+    attendance_rate = min(present_days / working_days * 100, 100) if working_days > 0 else 0
     
     context = {
         'attendance_today': attendance_today,
         'monthly_records': monthly_records,
         'total_days': total_days,
+        'working_days': working_days,
+        'is_working_day': working_day,
         'present_days': present_days,
         'absent_days': absent_days,
         'late_days': late_days,
@@ -1315,33 +1468,16 @@ def employee_attendance_dashboard(request):
 def mark_attendance(request):
     """Employee action to mark attendance (check-in)"""
     if request.method == 'POST':
-        today = date.today()
-        
-        # Check if already marked
-        attendance = Attendance.objects.filter(
-            employee=request.user,
-            date=today
-        ).first()
+        status = check_in(request.user, date.today())
         
-        if attendance and attendance.check_in_time:
+        if status is None:
             messages.warning(request, 'You have already marked attendance today!')
             return redirect('employee_attendance_dashboard')
         
-        # Mark attendance
-        if attendance:
-            attendance.check_in_time = timezone.now()
-            attendance.save()
-        else:
-            attendance = Attendance.objects.create(
-                employee=request.user,
-                date=today,
-                check_in_time=timezone.now()
-            )
-        
         status_message = {
             'PRESENT': 'Attendance marked successfully! You are on time. ✓',
             'LATE': 'Attendance marked. You arrived late today. ⚠️',
-        }.get(attendance.status, 'Attendance marked!')
+        }.get(status, 'Attendance marked!')
         
         messages.success(request, status_message)
         return redirect('employee_attendance_dashboard')
@@ -1353,25 +1489,16 @@ def mark_attendance(request):
 def checkout_attendance(request):
     """Employee action to checkout (end of day)"""
     if request.method == 'POST':
-        today = date.today()
+        attendance, recorded = check_out(request.user, date.today())
         
-        attendance = Attendance.objects.filter(
-            employee=request.user,
-            date=today
-        ).first()
-        
-        if not attendance or not attendance.check_in_time:
+        if attendance is None:
             messages.error(request, 'Please mark attendance first before checking out.')
             return redirect('employee_attendance_dashboard')
         
-        if attendance.check_out_time:
+        if not recorded:
             messages.warning(request, 'You have already checked out today!')
             return redirect('employee_attendance_dashboard')
         
-        # Mark checkout
-        attendance.check_out_time = timezone.now()
-        attendance.save()
-        
         messages.success(
             request,
             f'Checked out successfully! Total work hours: {attendance.work_hours} hours. 👋'
@@ -1382,6 +1509,7 @@ def checkout_attendance(request):
 
 
 @login_required
+@read_from_replica
 def attendance_history(request):
     """Employee view to see their attendance history"""
     if request.user.is_superuser:
@@ -1415,12 +1543,15 @@ def attendance_history(request):
     
     total_work_hours = records.aggregate(total=Sum('work_hours'))['total'] or 0
     avg_work_hours = (total_work_hours / present_days) if present_days > 0 else 0
+    working_days = working_days_in_month(year, month, through=date.today())
+    attendance_rate = min(present_days / working_days * 100, 100) if working_days > 0 else 0
     
     context = {
         'records': records,
         'selected_month': month,
         'selected_year': year,
         'total_days': total_days,
+        'working_days': working_days,
         'present_days': present_days,
         'absent_days': absent_days,
         'late_days': late_days,
@@ -1428,6 +1559,7 @@ def attendance_history(request):
         'on_leave_days': on_leave_days,
         'total_work_hours': round(total_work_hours, 2),
         'avg_work_hours': round(avg_work_hours, 2),
+        'attendance_rate': round(attendance_rate, 1),
     }
     
     return render(request, 'users/attendance_history.html', context)
@@ -1447,16 +1579,21 @@ def admin_attendance_today(request):
     attendance_dict = {att.employee_id: att for att in attendance_records}
     
     # Build list with attendance status for each employee
+    working_day = is_working_day(today)
     employee_attendance = []
     for employee in employees:
         att = attendance_dict.get(employee.id)
         if not att:
-            # Create absent record for employees who haven't marked
-            att = Attendance.objects.create(
-                employee=employee,
-                date=today,
-                status='ABSENT'
-            )
+            if working_day:
+                # Create absent record for employees who haven't marked
+                att = Attendance.objects.create(
+                    employee=employee,
+                    date=today,
+                    status='ABSENT'
+                )
+            else:
+                # Weekends and holidays don't count as absences; the blank status renders as "Non-working day"
+                att = Attendance(employee=employee, date=today, status='')
         
         employee_attendance.append({
             'employee': employee,
@@ -1467,21 +1604,37 @@ def admin_attendance_today(request):
     total_employees = len(employee_attendance)
     checked_in = sum(1 for item in employee_attendance if item['attendance'].check_in_time)
     not_checked_in = total_employees - checked_in
-    late_arrivals = sum(1 for item in employee_attendance if item['attendance'].status == 'LATE')
-    on_leave = sum(1 for item in employee_attendance if item['attendance'].status == 'ON_LEAVE')
+    status_counts = {}
+    for item in employee_attendance:
+        status_counts[item['attendance'].status] = status_counts.get(item['attendance'].status, 0) + 1
+    late_arrivals = status_counts.get('LATE', 0)
+    on_leave = status_counts.get('ON_LEAVE', 0)
+    
+    def percentage(count):
+        return round(count / total_employees * 100, 1) if total_employees > 0 else 0
     
     # Sort: checked in first, then by status
     employee_attendance.sort(key=lambda x: (not x['attendance'].check_in_time, x['attendance'].status))
     
     context = {
         'employee_attendance': employee_attendance,
+        'attendance_records': [item['attendance'] for item in employee_attendance],
         'today': today,
+        'is_working_day': working_day,
         'total_employees': total_employees,
         'checked_in': checked_in,
         'not_checked_in': not_checked_in,
         'late_arrivals': late_arrivals,
         'on_leave': on_leave,
-        'attendance_rate': round((checked_in / total_employees * 100), 1) if total_employees > 0 else 0,
+        'attendance_rate': percentage(checked_in),
+        'present_count': status_counts.get('PRESENT', 0),
+        'present_percentage': percentage(status_counts.get('PRESENT', 0)),
+        'absent_count': status_counts.get('ABSENT', 0),
+        'absent_percentage': percentage(status_counts.get('ABSENT', 0)),
+        'late_count': late_arrivals,
+        'late_percentage': percentage(late_arrivals),
+        'on_leave_count': on_leave,
+        'on_leave_percentage': percentage(on_leave),
     }
     
     return render(request, 'users/admin_attendance_today.html', context)
@@ -1489,6 +1642,7 @@ def admin_attendance_today(request):
 
 @login_required
 @user_passes_test(is_admin)
+@read_from_replica
 def admin_employee_attendance(request, employee_id):
     """Admin view to see detailed attendance for a specific employee"""
     employee = get_object_or_404(Employee, pk=employee_id)
@@ -1521,7 +1675,8 @@ def admin_employee_attendance(request, employee_id):
     
     total_work_hours = records.aggregate(total=Sum('work_hours'))['total'] or 0
     avg_work_hours = (total_work_hours / present_days) if present_days > 0 else 0
-    attendance_rate = (present_days / total_days * 100) if total_days > 0 else 0
+    working_days = working_days_in_month(year, month, through=date.today())
+    attendance_rate = min(present_days / working_days * 100, 100) if working_days > 0 else 0
     
     context = {
         'employee': employee,
@@ -1529,6 +1684,7 @@ def admin_employee_attendance(request, employee_id):
         'selected_month': month,
         'selected_year': year,
         'total_days': total_days,
+        'working_days': working_days,
         'present_days': present_days,
         'absent_days': absent_days,
         'late_days': late_days,
@@ -1599,3 +1755,91 @@ def admin_mark_attendance(request, employee_id):
         return redirect('admin_attendance_today')
     
     return redirect('admin_attendance_today')
+
+
+# ============================================
+# TEAM AVAILABILITY VIEWS
+# ============================================
+
+def _availability_request_matrix(request):
+    """Resolve window and filters from the query string and load the matrix"""
+    start_date, end_date = parse_window(request.GET.get('start'), request.GET.get('days'))
+    department = request.GET.get('department') or None
+    project_id = request.GET.get('project') or None
+    if project_id and not project_id.isdigit():
+        project_id = None
+    
+    matrix = get_availability_matrix(start_date, end_date, department, project_id)
+    return matrix, department, project_id
+
+
+@login_required
+@user_passes_test(is_admin)
+def team_availability(request):
+    """Admin view showing who is present or away for each day of a window"""
+    matrix, department, project_id = _availability_request_matrix(request)
+    
+    days = [date.fromisoformat(day) for day in matrix['days']]
+    rows = [
+        {
+            'employee': row,
+            'cells': [day_state(row, index) for index in range(len(days))],
+        }
+        for row in matrix['employees']
+    ]
+    
+    start_date = days[0]
+    context = {
+        'rows': rows,
+        'days': days,
+        'away_counts': away_counts(matrix),
+        'start_date': start_date,
+        'window_days': len(days),
+        'previous_start': start_date - timedelta(days=len(days)),
+        'next_start': start_date + timedelta(days=len(days)),
+        'today': date.today(),
+        'departments': Employee.DEPARTMENT_CHOICES,
+        'projects': Project.objects.only('id', 'name').order_by('name'),
+        'selected_department': department,
+        'selected_project': project_id,
+    }
+    
+    return render(request, 'users/team_availability.html', context)
+
+
+@login_required
+@user_passes_test(is_admin)
+def team_availability_api(request):
+    """
+    JSON endpoint for the availability matrix.
+    Per-employee states are integer bitsets where bit i refers to days[i].
+    """
+    matrix, department, project_id = _availability_request_matrix(request)
+    return JsonResponse({
+        **matrix,
+        'away_counts': away_counts(matrix),
+    })
+
+
+@login_required
+@user_passes_test(is_admin)
+def db_pool_stats_api(request):
+    """
+    Connection pool utilization and wait-time statistics for this worker process.
+    Empty when pooling is disabled or the database is not PostgreSQL.
+    """
+    return JsonResponse({'pools': get_pool_stats()})
+
+
+def metrics(request):
+    """
+    Prometheus scrape endpoint. Scrapers authenticate with
+    ``Authorization: Bearer <METRICS_TOKEN>``; logged-in admins may also view it.
+    """
+    token = settings.METRICS_TOKEN
+    header = request.headers.get('Authorization', '')
+    authorized = bool(token) and constant_time_compare(header, f'Bearer {token}')
+    if not authorized and not (request.user.is_authenticated and is_admin(request.user)):
+        return HttpResponseForbidden('Metrics require a valid token or an admin session')
+    body, content_type = render_metrics()
+    return HttpResponse(body, content_type=content_type)
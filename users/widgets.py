@@ -0,0 +1,63 @@
+"""
+Custom form widgets
+"""
+
+import json
+
+from django import forms
+from django.urls import reverse
+
+from .employee_search_utils import employee_search_result
+from .models import Employee
+
+
+class EmployeeAutocomplete(forms.Widget):
+    """
+    Search-as-you-type employee picker backed by employee_search_api.
+    Only the selected employees are rendered into the page, never the whole
+    choice list. ``project_field`` names the id of a project <select> whose
+    value restricts the results to that project's collaborators.
+    """
+    template_name = 'users/widgets/employee_autocomplete.html'
+
+    def __init__(self, attrs=None, multiple=False, project_field=None,
+                 placeholder='Search by name, ID, email or department'):
+        super().__init__(attrs)
+        self.multiple = multiple
+        self.allow_multiple_selected = multiple
+        self.project_field = project_field
+        self.placeholder = placeholder
+
+    def format_value(self, value):
+        if value is None or value == '':
+            return []
+        if isinstance(value, (str, int)) or not hasattr(value, '__iter__'):
+            value = [value]
+        # Ignore anything that is not a primary key, e.g. a tampered filter query string
+        return [str(item) for item in value if str(item).isdigit()]
+
+    def get_context(self, name, value, attrs):
+        context = super().get_context(name, value, attrs)
+        pks = context['widget']['value']
+        selected = Employee.objects.filter(pk__in=pks).order_by('first_name', 'last_name') if pks else []
+        context['widget'].update({
+            'multiple': self.multiple,
+            'search_url': reverse('employee_search_api'),
+            'project_field': self.project_field,
+            'placeholder': self.placeholder,
+            'selected_json': json.dumps([employee_search_result(employee) for employee in selected]),
+        })
+        return context
+
+    def value_from_datadict(self, data, files, name):
+        if self.multiple and hasattr(data, 'getlist'):
+            return data.getlist(name)
+        return data.get(name)
+
+    def value_omitted_from_data(self, data, files, name):
+        # Like SelectMultiple, an empty multi-selection submits nothing at all
+        return False if self.multiple else name not in data
+
+    def use_required_attribute(self, initial):
+        # The visible input only holds the search text
+        return False